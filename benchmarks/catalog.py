@@ -0,0 +1,58 @@
+"""
+Synthetic catalogs for benchmarking beyond the shipped five products.
+
+    with scaled_catalog(200, 50):
+        state = GameState.new_game()
+
+Products cycle through the shipped demand curves and get a random sparse
+bill of materials. The catalog is the current Config for the duration of
+the block only; engine caches are keyed by Config, so they never mix
+catalogs.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from itertools import cycle
+
+import numpy as np
+
+from engine import config
+from engine.compiled import compile_config, use_config
+
+
+def make_catalog(n_products: int, n_components: int, seed: int = 0, parts_per_product: int = 3) -> dict:
+    """Config overrides for an n_products x n_components catalog."""
+    rng = np.random.default_rng(seed)
+    base = list(config.PRODUCT_DEMAND)
+    pids = [f"P{i:04d}" for i in range(n_products)]
+    cids = list(range(1, n_components + 1))
+    templates = cycle(base)
+
+    bom = {}
+    for pid in pids:
+        used = set(rng.choice(cids, size=min(parts_per_product, n_components), replace=False).tolist())
+        bom[pid] = {cid: round(float(rng.uniform(1.0, 3.0)), 1) if cid in used else None for cid in cids}
+
+    demand, prices, quality = {}, {}, {}
+    for pid in pids:
+        template = next(templates)
+        demand[pid] = config.PRODUCT_DEMAND[template]
+        prices[pid] = config.PRODUCT_STARTING_PRICES[template]
+        quality[pid] = config.PRODUCT_STARTING_QUALITY[template]
+
+    return {
+        "COMPONENT_PRICES": {cid: 1.0 for cid in cids},
+        "BILL_OF_MATERIALS": bom,
+        "PRODUCT_DEMAND": demand,
+        "PRODUCT_STARTING_PRICES": prices,
+        "PRODUCT_STARTING_QUALITY": quality,
+    }
+
+
+@contextmanager
+def scaled_catalog(n_products: int, n_components: int | None = None, seed: int = 0):
+    """Make a synthetic catalog the current Config inside the block."""
+    overrides = make_catalog(n_products, n_components or max(5, n_products // 4), seed)
+    with use_config(compile_config(overrides, source="benchmarks.catalog")) as cfg:
+        yield cfg
@@ -0,0 +1,74 @@
+"""
+Memory and tick cost per hosted game, object vs array storage.
+
+    python -m benchmarks.memory_per_session [n_games]
+
+Builds n_games states with each GameState storage backend, runs a month
+of ticks on each, and reports traced bytes per game (demand calendars are
+shared per seed and excluded by warming them up first) and mean tick time,
+for the shipped catalog and a larger synthetic one.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from engine.game_state import GameState, STORAGE_BACKENDS
+from engine.tick import run_tick
+from engine import config
+from benchmarks.catalog import scaled_catalog
+
+TICKS = config.DAYS_PER_MONTH
+CATALOG_SIZES = (None, 100)  # None: the shipped catalog
+
+
+def _new_game(storage: str) -> GameState:
+    state = GameState.new_game(storage=storage)
+    first = next(iter(state.factories))
+    state.factories[first].throughput_level = 1
+    for comp in state.components.values():
+        comp.inventory = 10_000.0
+    return state
+
+
+def measure(storage: str, n_games: int) -> dict:
+    """Bytes per game and microseconds per tick for one backend."""
+    _new_game(storage)  # warm the shared calendar and catalog caches
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    games = [_new_game(storage) for _ in range(n_games)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for state in games:
+        for _ in range(TICKS):
+            run_tick(state)
+    elapsed = time.perf_counter() - start
+    return {
+        "storage": storage,
+        "products": len(games[0].products),
+        "bytes_per_game": (after - before) / n_games,
+        "us_per_tick": elapsed / (n_games * TICKS) * 1e6,
+    }
+
+
+def main(n_games: int = 2000) -> list[dict]:
+    rows = []
+    for size in CATALOG_SIZES:
+        for storage in STORAGE_BACKENDS:
+            if size is None:
+                rows.append(measure(storage, n_games))
+            else:
+                with scaled_catalog(size):
+                    rows.append(measure(storage, max(1, n_games // 10)))
+    print(f"{'products':>8}  {'storage':<10}{'bytes/game':>12}{'us/tick':>10}")
+    for row in rows:
+        print(f"{row['products']:>8}  {row['storage']:<10}{row['bytes_per_game']:>12.0f}{row['us_per_tick']:>10.1f}")
+    return rows
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,304 @@
+"""
+Benchmark suite for engine and server hot paths, with stored baselines.
+
+    python -m benchmarks.suite                          # run and print
+    python -m benchmarks.suite --save baseline.json     # record a baseline
+    python -m benchmarks.suite --compare baseline.json  # exit 1 on regression
+
+A metric regresses when it is worse than the baseline by more than
+--threshold (a fraction; default 0.25). Baselines are machine-specific:
+record and compare on the same host. --quick shrinks every workload for
+smoke runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable
+
+import numpy as np
+
+from engine.demand import calculate_demand, evaluate_grid, DemandCalendar
+from engine.game_state import GameState
+from engine.production import produce_all
+from engine.purchasing import auto_purchase_all
+from engine.tick import run_tick
+from engine import config
+from benchmarks.catalog import scaled_catalog
+
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class Metric:
+    name: str
+    value: float
+    unit: str
+    better: str  # "higher" or "lower"
+
+
+BENCHMARKS: dict[str, Callable[[float], list[Metric]]] = {}
+
+
+def benchmark(name: str):
+    """Register fn(scale) -> list[Metric]; scale < 1 shrinks the workload."""
+    def wrap(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return wrap
+
+
+def _timed(fn: Callable[[], object], repeat: int = 3) -> float:
+    """Best wall time of `repeat` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _busy_game() -> GameState:
+    """Every factory running, components plentiful and auto-purchased."""
+    state = GameState.new_game()
+    state.cash = 1e12
+    for factory in state.factories.values():
+        factory.throughput_level = 3
+    for comp in state.components.values():
+        comp.inventory = 1e6
+        comp.auto_purchase_unlocked = True
+    return state
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
+
+@benchmark("ticks")
+def bench_ticks(scale: float) -> list[Metric]:
+    n = max(10, int(2000 * scale))
+    state = _busy_game()
+    single = n / _timed(lambda: [run_tick(state) for _ in range(n)])
+
+    with scaled_catalog(200, 50):
+        big = _busy_game()
+        n_big = max(5, n // 20)
+        large = n_big / _timed(lambda: [run_tick(big) for _ in range(n_big)])
+        produce = n_big / _timed(lambda: [produce_all(big) for _ in range(n_big)])
+
+    return [
+        Metric("ticks_per_s", single, "ticks/s", "higher"),
+        Metric("ticks_per_s_200_products", large, "ticks/s", "higher"),
+        Metric("produce_all_per_s_200_products", produce, "calls/s", "higher"),
+    ]
+
+
+@benchmark("auto_purchase")
+def bench_auto_purchase(scale: float) -> list[Metric]:
+    """Purchase step on a 500-component catalog with stock well above reorder points."""
+    n = max(50, int(5000 * scale))
+    with scaled_catalog(200, 500):
+        state = _busy_game()
+
+        def purchase_steps():
+            for _ in range(n):
+                auto_purchase_all(state)
+                state.game_day += 1
+
+        rate = n / _timed(purchase_steps)
+    return [Metric("auto_purchase_per_s_500_components", rate, "calls/s", "higher")]
+
+
+@benchmark("fork")
+def bench_fork(scale: float) -> list[Metric]:
+    """GameState.fork vs copy.deepcopy on a 200-product catalog: time and
+    traced bytes per copy, before the copy diverges."""
+    import copy
+    import tracemalloc
+
+    n = max(10, int(500 * scale))
+    metrics = []
+    with scaled_catalog(200, 50):
+        for storage in ("objects", "arrays"):
+            state = GameState.new_game(storage=storage)
+            run_tick(state)  # warm caches so both copies carry them
+            for name, fn in (("fork", state.fork), ("deepcopy", lambda: copy.deepcopy(state))):
+                seconds = _timed(lambda: [fn() for _ in range(n)])
+                tracemalloc.start()
+                before, _ = tracemalloc.get_traced_memory()
+                copies = [fn() for _ in range(n)]
+                after, _ = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del copies
+                metrics += [
+                    Metric(f"{name}_us_{storage}_200_products", seconds / n * 1e6, "us", "lower"),
+                    Metric(f"{name}_bytes_{storage}_200_products", (after - before) / n, "bytes", "lower"),
+                ]
+    return metrics
+
+
+@benchmark("demand")
+def bench_demand(scale: float) -> list[Metric]:
+    n = max(100, int(50_000 * scale))
+    pids = tuple(config.PRODUCT_DEMAND)
+    calendar = DemandCalendar.for_seed(config.DEFAULT_SEED, pids)
+    prices = np.random.default_rng(0).uniform(1, 60, size=n).tolist()
+
+    def scalar():
+        for i, price in enumerate(prices):
+            calculate_demand("A", price, 1.0, i % 3600, None, calendar)
+
+    grid_prices = np.random.default_rng(1).uniform(1, 60, size=(n * 10, len(pids)))
+    grid_days = np.arange(n * 10) % 3600
+    grid = lambda: evaluate_grid(pids, grid_prices, 1.0, grid_days, calendar)
+    return [
+        Metric("calculate_demand_per_s", n / _timed(scalar), "evals/s", "higher"),
+        Metric("evaluate_grid_per_s", grid_prices.size / _timed(grid), "evals/s", "higher"),
+    ]
+
+
+@benchmark("full_game")
+def bench_full_game(scale: float) -> list[Metric]:
+    """Wall time for a whole game: via run_tick, via analytic fast-forward,
+    and via a fast-forwarding strategy."""
+    from engine import montecarlo
+    from engine.tick import simulate_until
+
+    days = max(30, int(3600 * scale))
+    strategy = montecarlo.STRATEGIES["expand_priced"]
+    fast_forward = _timed(lambda: montecarlo.play(strategy, config.DEFAULT_SEED, days), repeat=1)
+
+    def tick_loop():
+        state = _busy_game()
+        while state.game_day < days and not state.game_over:
+            run_tick(state)
+
+    def analytic():
+        simulate_until(_busy_game(), days, analytic=True)
+
+    return [
+        Metric("full_game_run_tick_s", _timed(tick_loop, repeat=1), "s", "lower"),
+        Metric("full_game_analytic_s", _timed(analytic, repeat=1), "s", "lower"),
+        Metric("full_game_strategy_s", fast_forward, "s", "lower"),
+    ]
+
+
+# ── Server ────────────────────────────────────────────────────────────────────
+
+@benchmark("api_state")
+def bench_api_state(scale: float, pollers: int = 8) -> list[Metric]:
+    """/api/state latency with concurrent pollers while a game ticks."""
+    from server.app import app, sessions, publish_tick
+
+    client_game = app.test_client().post("/api/games").get_json()["game_id"]
+    session = sessions.get(client_game)
+    requests_each = max(20, int(500 * scale))
+    latencies: list[float] = []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def ticker():
+        while not stop.is_set():
+            session.tick()
+            publish_tick(session)
+            time.sleep(0.001)
+
+    def poller():
+        client = app.test_client()
+        local = []
+        for _ in range(requests_each):
+            start = time.perf_counter()
+            client.get(f"/api/state?game_id={client_game}")
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    tick_thread = threading.Thread(target=ticker, daemon=True)
+    tick_thread.start()
+    threads = [threading.Thread(target=poller) for _ in range(pollers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    tick_thread.join()
+    sessions.remove(client_game)
+
+    ms = np.array(latencies) * 1000
+    return [
+        Metric("api_state_p50_ms", float(np.percentile(ms, 50)), "ms", "lower"),
+        Metric("api_state_p99_ms", float(np.percentile(ms, 99)), "ms", "lower"),
+    ]
+
+
+# ── Baselines ─────────────────────────────────────────────────────────────────
+
+def run_all(names: list[str] | None = None, scale: float = 1.0) -> list[Metric]:
+    metrics = []
+    for name in names or BENCHMARKS:
+        metrics.extend(BENCHMARKS[name](scale))
+    return metrics
+
+
+def to_baseline(metrics: list[Metric]) -> dict:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "metrics": {m.name: asdict(m) for m in metrics},
+    }
+
+
+def compare(metrics: list[Metric], baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Descriptions of metrics worse than baseline by more than threshold."""
+    regressions = []
+    for m in metrics:
+        base = baseline["metrics"].get(m.name)
+        if base is None or base["value"] == 0:
+            continue
+        change = (m.value - base["value"]) / base["value"]
+        worse = -change if m.better == "higher" else change
+        if worse > threshold:
+            regressions.append(
+                f"{m.name}: {m.value:.4g} {m.unit} vs baseline {base['value']:.4g} ({worse:+.0%} worse)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmarks", nargs="*", help=f"subset to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--quick", action="store_true", help="run reduced workloads")
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    metrics = run_all(args.benchmarks or None, scale=0.1 if args.quick else 1.0)
+    for m in metrics:
+        print(f"{m.name:<36}{m.value:>14.4g} {m.unit}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(to_baseline(metrics), f, indent=2)
+        print(f"baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(metrics, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Player actions as plain commands.
+
+parse_command turns raw request data into a validated, immutable Command;
+apply_command executes one against a GameState. Keeping actions as data
+lets the server queue them and apply them at tick boundaries, and gives a
+single place to sequence (and later record) everything a player does.
+
+A Batch groups several commands to be applied back to back, either
+atomically (any failure rolls the whole batch back) or best-effort.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, asdict
+from typing import Mapping
+
+from engine.game_state import GameState
+from engine.history import History
+from engine.upgrades import upgrade_throughput, upgrade_efficiency, unlock_auto_purchase
+from engine.purchasing import purchase_component
+from engine.tick import simulate_until
+from engine.clock import total_game_days
+
+# Actions that replace the whole game are handled by the session, not here.
+SESSION_ACTIONS = ("new_game",)
+
+STATE_ACTIONS = (
+    "upgrade_throughput",
+    "upgrade_efficiency",
+    "set_price",
+    "purchase_component",
+    "unlock_auto_purchase",
+    "toggle_pause",
+    "set_auto_purchase",
+    "fast_forward",
+)
+
+ACTIONS = STATE_ACTIONS + SESSION_ACTIONS
+
+BATCH_MODES = ("atomic", "best_effort")
+MAX_BATCH_ACTIONS = 1000
+
+
+@dataclass(frozen=True)
+class Command:
+    """One validated player action. Unused fields stay None."""
+    action: str
+    product_id: str | None = None
+    component_id: int | None = None
+    price: float | None = None
+    quantity: int | None = None
+    max_inventory: int | None = None
+    days: int | None = None
+    period: str | None = None
+    seed: int | None = None
+
+
+def _product(data: Mapping, state: GameState) -> str:
+    pid = data.get("product_id")
+    if pid not in state.products:
+        raise ValueError(f"unknown product_id {pid!r}")
+    return pid
+
+
+def _component(data: Mapping, state: GameState) -> int:
+    try:
+        cid = int(data["component_id"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("component_id must be an integer") from None
+    if cid not in state.components:
+        raise ValueError(f"unknown component_id {cid}")
+    return cid
+
+
+# Widths of the integer fields in engine.journal's action records
+INT32_RANGE = (-2 ** 31, 2 ** 31 - 1)
+INT64_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+
+def _optional_int(data: Mapping, key: str, bounds: tuple[int, int] = INT64_RANGE) -> int | None:
+    value = data.get(key)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be an integer") from None
+    if not bounds[0] <= value <= bounds[1]:
+        raise ValueError(f"{key} is out of range")
+    return value
+
+
+def parse_command(action: str, data: Mapping, state: GameState) -> Command:
+    """Validate raw request data for `action`. Raises ValueError if invalid.
+
+    `state` is only read for id validation (product/component ids never
+    change during a game), so callers need not hold the game lock.
+    """
+    if action in ("upgrade_throughput", "upgrade_efficiency", "toggle_pause"):
+        return Command(action, product_id=_product(data, state))
+
+    if action == "set_price":
+        try:
+            price = float(data["price"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("price must be a number") from None
+        return Command(action, product_id=_product(data, state), price=price)
+
+    if action == "purchase_component":
+        quantity = _optional_int(data, "quantity")
+        if quantity is None or quantity < 0:
+            raise ValueError("quantity must be a non-negative integer")
+        return Command(action, component_id=_component(data, state), quantity=quantity)
+
+    if action == "unlock_auto_purchase":
+        return Command(action, component_id=_component(data, state))
+
+    if action == "set_auto_purchase":
+        return Command(
+            action,
+            component_id=_component(data, state),
+            quantity=_optional_int(data, "quantity"),
+            max_inventory=_optional_int(data, "max_inventory"),
+        )
+
+    if action == "fast_forward":
+        period = data.get("period", "month")
+        if period not in ("month", "year"):
+            raise ValueError("period must be 'month' or 'year'")
+        days = _optional_int(data, "days", INT32_RANGE)
+        return Command(action, days=None if days is None else max(0, days), period=period)
+
+    if action == "new_game":
+        return Command(action, seed=_optional_int(data, "seed"))
+
+    raise ValueError(f"unknown action {action!r}")
+
+
+@dataclass(frozen=True)
+class Batch:
+    """Commands applied in order in one go (see apply_batch)."""
+    commands: tuple[Command, ...]
+    atomic: bool = True
+
+    action = "batch"  # queued alongside Commands, which expose .action
+
+
+def parse_batch(data: Mapping, state: GameState) -> Batch:
+    """Validate {"actions": [{"action": ..., ...}, ...], "mode": ...}.
+
+    Raises ValueError (naming the offending entry) if anything is invalid;
+    nothing is applied in that case.
+    """
+    mode = data.get("mode", "atomic")
+    if mode not in BATCH_MODES:
+        raise ValueError(f"mode must be one of {', '.join(BATCH_MODES)}")
+    entries = data.get("actions")
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("actions must be a non-empty list")
+    if len(entries) > MAX_BATCH_ACTIONS:
+        raise ValueError(f"at most {MAX_BATCH_ACTIONS} actions per batch")
+
+    commands = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, Mapping):
+            raise ValueError(f"actions[{i}] must be an object")
+        action = entry.get("action")
+        if action not in STATE_ACTIONS:
+            raise ValueError(f"actions[{i}]: {action!r} cannot be batched")
+        try:
+            commands.append(parse_command(action, entry, state))
+        except ValueError as exc:
+            raise ValueError(f"actions[{i}]: {exc}") from None
+    return Batch(tuple(commands), atomic=mode == "atomic")
+
+
+def apply_batch(
+    state: GameState, batch: Batch, history: History | None = None,
+) -> tuple[GameState, dict, list[tuple[int, Command]]]:
+    """Apply a batch's commands in order. Mutates state.
+
+    Best-effort batches run every command whatever its outcome. Atomic
+    batches stop at the first command that fails or raises and return a
+    fork taken beforehand in place of the (partly changed) input state;
+    days a rolled-back fast_forward recorded in history are dropped again.
+
+    Returns (state to keep, JSON result, [(game_day, command)] that took
+    effect, for journaling).
+    """
+    backup = state.fork() if batch.atomic else None
+    results: list[dict] = []
+    applied: list[tuple[int, Command]] = []
+    failed = None
+    for i, cmd in enumerate(batch.commands):
+        day = state.game_day
+        try:
+            result = apply_command(state, cmd, history)
+        except Exception as exc:
+            result = {"success": False, "action": cmd.action, "reason": str(exc)}
+        else:
+            applied.append((day, cmd))
+        results.append(result)
+        if not result.get("success") and failed is None:
+            failed = i
+            if batch.atomic:
+                break
+
+    mode = "atomic" if batch.atomic else "best_effort"
+    summary = {"success": failed is None, "action": "batch", "mode": mode, "results": results}
+    if batch.atomic and failed is not None:
+        results.extend(
+            {"success": False, "action": cmd.action, "reason": "not_applied"}
+            for cmd in batch.commands[failed + 1:]
+        )
+        summary.update(applied=0, failed_index=failed, rolled_back=True)
+        if history is not None:
+            history.truncate(backup.game_day)
+        return backup, summary, []
+    summary["applied"] = sum(1 for r in results if r.get("success"))
+    return state, summary, applied
+
+
+# Queued actions that can observe prices: fast_forward runs sales steps, a
+# batch may hold one, and new_game starts over
+PRICE_BARRIERS = ("fast_forward", "batch", "new_game")
+
+
+def superseded(commands: list[Command | Batch]) -> dict[int, int]:
+    """Indexes of commands made redundant by a later one in the same batch.
+
+    Only set_price coalesces, and only with later set_price calls for the
+    same product before the next price barrier: nothing else in between
+    reads the price (the sales step does), so the last one wins. Returns
+    {superseded_index: winning_index}.
+    """
+    out: dict[int, int] = {}
+    pending: dict[str, list[int]] = {}  # product_id -> set_price indexes since the last barrier
+
+    def settle():
+        for run in pending.values():
+            out.update((i, run[-1]) for i in run[:-1])
+        pending.clear()
+
+    for i, cmd in enumerate(commands):
+        if cmd.action == "set_price":
+            pending.setdefault(cmd.product_id, []).append(i)
+        elif cmd.action in PRICE_BARRIERS:
+            settle()
+    settle()
+    return out
+
+
+def apply_command(state: GameState, cmd: Command, history: History | None = None) -> dict:
+    """Execute a state-level command. Mutates state. Returns the JSON result.
+
+    Days a fast_forward advances are recorded in history, if given.
+    """
+    action = cmd.action
+
+    if action == "upgrade_throughput":
+        success = upgrade_throughput(state, cmd.product_id)
+        return {"success": success, "action": action, "product_id": cmd.product_id}
+
+    if action == "upgrade_efficiency":
+        success = upgrade_efficiency(state, cmd.product_id)
+        return {"success": success, "action": action, "product_id": cmd.product_id}
+
+    if action == "set_price":
+        product = state.products[cmd.product_id]
+        old_price = product.price
+        product.price = max(0.0, round(cmd.price, 2))
+        state.elasticity_cache.invalidate(cmd.product_id)
+        state.touch("products", cmd.product_id)
+        return {
+            "success": True, "action": action, "product_id": cmd.product_id,
+            "old_price": old_price, "new_price": product.price,
+        }
+
+    if action == "purchase_component":
+        result = purchase_component(state, cmd.component_id, cmd.quantity)
+        state.reorder_index.invalidate(cmd.component_id)
+        return {
+            "success": result.success, "action": action, "component_id": cmd.component_id,
+            "quantity": cmd.quantity, "reason": result.reason,
+        }
+
+    if action == "unlock_auto_purchase":
+        success = unlock_auto_purchase(state, cmd.component_id)
+        return {"success": success, "action": action, "component_id": cmd.component_id}
+
+    if action == "toggle_pause":
+        factory = state.factories[cmd.product_id]
+        factory.paused = not factory.paused
+        state.touch("products", cmd.product_id)
+        state.reorder_index.invalidate()
+        return {"success": True, "action": action, "product_id": cmd.product_id, "paused": factory.paused}
+
+    if action == "set_auto_purchase":
+        comp = state.components[cmd.component_id]
+        if cmd.quantity is not None:
+            comp.auto_purchase_quantity = max(1, cmd.quantity)
+        if cmd.max_inventory is not None:
+            comp.auto_purchase_max_inventory = max(0, cmd.max_inventory)
+        state.touch("components", cmd.component_id)
+        state.reorder_index.invalidate(cmd.component_id)
+        return {
+            "success": True, "action": action, "component_id": cmd.component_id,
+            "auto_purchase_quantity": comp.auto_purchase_quantity,
+            "auto_purchase_max_inventory": comp.auto_purchase_max_inventory,
+        }
+
+    if action == "fast_forward":
+        target = total_game_days(state.config) if cmd.days is None else state.game_day + cmd.days
+        summary = simulate_until(state, target, period=cmd.period, history=history)
+        return {
+            "success": True, "action": action,
+            "start_day": summary.start_day, "end_day": summary.end_day, "ticks": summary.ticks,
+            "units_produced": summary.units_produced, "units_sold": summary.units_sold,
+            "revenue": summary.revenue, "auto_purchase_spend": summary.auto_purchase_spend,
+            "periods": [asdict(p) for p in summary.periods],
+            "limited_by": summary.limited_by,
+        }
+
+    raise ValueError(f"{action!r} is not a state-level action")
@@ -0,0 +1,145 @@
+"""
+Columnar on-disk archive of finished games' per-day histories.
+
+Each archived game is one chunk: a directory holding one .npy file per
+column of its engine.history.History (see History.columns), in day
+order. An append-only index.jsonl lists the chunks with their day range
+and whatever metadata the writer gave (game id, seed, config version):
+
+    archive/
+      index.jsonl
+      <chunk>/day.npy  cash.npy  throughput.D.npy  ...
+
+Readers memory-map only the columns they ask for, and locate days by
+binary search on the day column, so a scan over many games reads pages
+in proportion to the columns and days selected, not to the game size:
+
+    archive = Archive("archive")
+    rows = archive.at_day(["cash", "throughput.D"], day=3 * 360 - 1)
+    np.median(rows["cash"][rows["throughput.D"] >= 2])
+
+Chunks are written to a temporary directory and renamed into place
+before the index line is appended, so readers never see half a game.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from typing import Iterator
+
+import numpy as np
+
+from engine.history import History
+
+INDEX_FILE = "index.jsonl"
+
+
+class Archive:
+    """A directory of archived game histories."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()  # serializes index appends within a process
+        os.makedirs(root, exist_ok=True)
+
+    # ── Writing ───────────────────────────────────────────────────────────
+
+    def write(self, chunk: str, history: History, **meta) -> dict:
+        """Store a game's recorded days as a new chunk. Returns its index entry.
+
+        meta (e.g. game_id, seed, config_version) is kept in the index.
+        Raises KeyError if the chunk name is taken.
+        """
+        final = os.path.join(self.root, chunk)
+        if os.path.exists(final):
+            raise KeyError(chunk)
+        columns = history.columns()
+        days = columns["day"]
+
+        tmp = os.path.join(self.root, f".{chunk}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for name, values in columns.items():
+            np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(values))
+        os.replace(tmp, final)
+
+        entry = {
+            "chunk": chunk,
+            "days": len(days),
+            "first_day": int(days[0]) if len(days) else None,
+            "last_day": int(days[-1]) if len(days) else None,
+            "columns": sorted(columns),
+            **meta,
+        }
+        with self._lock, open(os.path.join(self.root, INDEX_FILE), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+    # ── Reading ───────────────────────────────────────────────────────────
+
+    def index(self) -> list[dict]:
+        """Index entries of every archived game, oldest first."""
+        path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _matching(self, where: dict | None) -> list[dict]:
+        entries = self.index()
+        if not where:
+            return entries
+        return [e for e in entries if all(e.get(k) == v for k, v in where.items())]
+
+    def column(self, chunk: str, name: str) -> np.ndarray:
+        """One column of one game, memory-mapped read-only."""
+        return np.load(os.path.join(self.root, chunk, f"{name}.npy"), mmap_mode="r")
+
+    def read(self, chunk: str, columns: list[str], start: int = 0, stop: int | None = None) -> dict[str, np.ndarray]:
+        """Recorded days in [start, stop) of one game: "day" plus the named
+        columns, as memory-mapped slices."""
+        days = self.column(chunk, "day")
+        lo = int(np.searchsorted(days, start))
+        hi = len(days) if stop is None else int(np.searchsorted(days, stop))
+        out = {"day": days[lo:hi]}
+        for name in columns:
+            out[name] = self.column(chunk, name)[lo:hi]
+        return out
+
+    def scan(
+        self, columns: list[str], start: int = 0, stop: int | None = None, where: dict | None = None,
+    ) -> Iterator[tuple[str, dict[str, np.ndarray]]]:
+        """(chunk, read(...)) for every archived game whose index entry
+        matches all of where's key/value pairs (e.g. {"seed": 42})."""
+        for entry in self._matching(where):
+            yield entry["chunk"], self.read(entry["chunk"], columns, start, stop)
+
+    def at_day(self, columns: list[str], day: int, where: dict | None = None) -> np.ndarray:
+        """One row per archived game that reached `day`: each column's value
+        on the last recorded day at or before it.
+
+        Returns a structured array with a "chunk" field and one field
+        per column; games with no recorded day at or before `day`, or
+        whose history ends before it, are left out.
+        """
+        chunks, rows = [], []
+        for entry in self._matching(where):
+            if entry["last_day"] is None or entry["last_day"] < day:
+                continue
+            chunk = entry["chunk"]
+            i = int(np.searchsorted(self.column(chunk, "day"), day, side="right")) - 1
+            if i < 0:
+                continue
+            chunks.append(chunk)
+            rows.append(tuple(self.column(chunk, name)[i] for name in columns))
+
+        dtype = [("chunk", f"U{max(map(len, chunks), default=1)}")]
+        dtype += [(name, np.float64) for name in columns]
+        out = np.empty(len(chunks), dtype=dtype)
+        out["chunk"] = chunks
+        for k, name in enumerate(columns):
+            out[name] = [row[k] for row in rows]
+        return out
@@ -0,0 +1,306 @@
+"""
+Vectorized batch simulator.
+
+Holds N independent games as NumPy arrays (one row per game) and advances
+all of them one tick at a time. Used for bots, balancing sweeps and
+regression runs where thousands of headless games are simulated at once.
+
+Each phase loops over products / components (small, fixed) and vectorizes
+across games (large), so per-tick cost grows sub-linearly with N. The
+arithmetic mirrors engine.production / engine.sales / engine.purchasing
+step for step so a batch row ends up identical to running run_tick on the
+equivalent GameState.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import numpy as np
+
+from engine.compiled import Config, current_config
+from engine.demand import DemandCalendar
+from engine.game_state import GameState, FactoryState, ProductState, ComponentState
+from engine.production import compile_bom
+
+
+def _efficiency_table(config: Config, max_level: int) -> np.ndarray:
+    """efficiency_multiplier for levels 0..max_level, via the scalar formula.
+
+    Built from Config.efficiency_multiplier so values are bit-identical to
+    the single-game path (np.power may round differently from Python's
+    float pow).
+    """
+    return np.array([config.efficiency_multiplier(level) for level in range(max_level + 1)])
+
+
+@dataclass
+class BatchTickResult:
+    """Per-game arrays describing one batch tick (rows = games)."""
+    units_produced: np.ndarray   # (N, P) int
+    units_sold: np.ndarray       # (N, P) int
+    revenue: np.ndarray          # (N, P) float
+    demand: np.ndarray           # (N, P) float
+    auto_purchased: np.ndarray   # (N, C) int, units bought this tick
+
+
+class GameBatch:
+    """N games stored column-wise and advanced together.
+
+    Products and components are indexed densely in the order given by
+    product_ids / component_ids (config order by default). Every game in a
+    batch runs under the same Config (the current one by default).
+    """
+
+    def __init__(
+        self,
+        n_games: int,
+        product_ids: tuple[str, ...] | None = None,
+        component_ids: tuple[int, ...] | None = None,
+        config: Config | None = None,
+    ):
+        self.config = config = config or current_config()
+        self.product_ids = tuple(product_ids or config.product_ids)
+        self.component_ids = tuple(component_ids or config.component_ids)
+        n = n_games
+        p = len(self.product_ids)
+        c = len(self.component_ids)
+
+        self.cash = np.zeros(n)
+        self.game_day = np.zeros(n, dtype=np.int64)
+
+        self.price = np.zeros((n, p))
+        self.quality = np.ones((n, p))
+        self.inventory = np.zeros((n, p), dtype=np.int64)
+
+        self.throughput_level = np.zeros((n, p), dtype=np.int64)
+        self.efficiency_level = np.zeros((n, p), dtype=np.int64)
+        self.paused = np.zeros((n, p), dtype=bool)
+
+        self.component_price = np.ones((n, c))
+        self.component_inventory = np.zeros((n, c))
+        self.auto_purchase_unlocked = np.zeros((n, c), dtype=bool)
+        self.auto_purchase_quantity = np.full((n, c), 100, dtype=np.int64)
+        self.auto_purchase_max_inventory = np.full((n, c), 1000, dtype=np.int64)
+
+        # Demand calendars, deduplicated: games sharing a seed share a row block
+        self.seed = np.zeros(n, dtype=np.int64)
+        self._calendars: list = []
+        self._calendar_stack: np.ndarray | None = None  # (K, days, P)
+        self._calendar_index = np.zeros(n, dtype=np.int64)
+
+        self._compile_static()
+
+    def _compile_static(self) -> None:
+        """Pick the Config's tables for this batch's product / component order."""
+        # BOM as a list of (component_index, base_units) per product
+        bom = compile_bom(self.product_ids, self.component_ids, self.config)
+        self._bom: list[list[tuple[int, float]]] = [
+            [(k, float(bom.units[j, k])) for k in columns]
+            for j, columns in enumerate(bom.columns)
+        ]
+
+        # Per-product curve parameters and (12, P) seasonal multipliers — row 0 is month 1
+        cols = [self.config.product_ids.index(pid) for pid in self.product_ids]
+        self._a = self.config.demand_a[cols]
+        self._b = self.config.demand_b[cols]
+        self._alpha = self.config.demand_alpha[cols]
+        self._seasonal = self.config.seasonal[:, cols]
+
+    @property
+    def n_games(self) -> int:
+        return self.cash.shape[0]
+
+    # ── Construction / conversion ─────────────────────────────────────────
+
+    @classmethod
+    def new_games(cls, n_games: int) -> GameBatch:
+        """N fresh games from config defaults."""
+        return cls.from_states([GameState.new_game() for _ in range(n_games)])
+
+    @classmethod
+    def from_states(cls, states: list[GameState]) -> GameBatch:
+        """Pack existing game states into a batch.
+
+        All states must share the same product and component ids and Config.
+        """
+        first = states[0]
+        if any(s.config is not first.config for s in states):
+            raise ValueError("all states need the same config version")
+        batch = cls(len(states), tuple(first.products), tuple(first.components), first.config)
+
+        calendar_slot: dict[int, int] = {}
+        for i, state in enumerate(states):
+            batch.cash[i] = state.cash
+            batch.game_day[i] = state.game_day
+            batch.seed[i] = state.seed
+            cal = state.demand_calendar
+            if cal is not None:
+                if id(cal) not in calendar_slot:
+                    calendar_slot[id(cal)] = len(batch._calendars)
+                    batch._calendars.append(cal)
+                batch._calendar_index[i] = calendar_slot[id(cal)]
+            for j, pid in enumerate(batch.product_ids):
+                prod = state.products[pid]
+                factory = state.factories[pid]
+                batch.price[i, j] = prod.price
+                batch.quality[i, j] = prod.quality
+                batch.inventory[i, j] = prod.inventory
+                batch.throughput_level[i, j] = factory.throughput_level
+                batch.efficiency_level[i, j] = factory.efficiency_level
+                batch.paused[i, j] = factory.paused
+            for j, cid in enumerate(batch.component_ids):
+                comp = state.components[cid]
+                batch.component_price[i, j] = comp.price
+                batch.component_inventory[i, j] = comp.inventory
+                batch.auto_purchase_unlocked[i, j] = comp.auto_purchase_unlocked
+                batch.auto_purchase_quantity[i, j] = comp.auto_purchase_quantity
+                batch.auto_purchase_max_inventory[i, j] = comp.auto_purchase_max_inventory
+
+        if batch._calendars:
+            if any(s.demand_calendar is None for s in states):
+                raise ValueError("either all or none of the states need a demand calendar")
+            batch._calendar_stack = np.stack([c.multipliers for c in batch._calendars])
+
+        return batch
+
+    @classmethod
+    def from_records(
+        cls,
+        records: np.ndarray,
+        product_ids: tuple[str, ...],
+        component_ids: tuple[int, ...],
+        config: Config | None = None,
+    ) -> GameBatch:
+        """Build a batch straight from engine.savefile records (column copies only)."""
+        batch = cls(len(records), product_ids, component_ids, config)
+        for name in (
+            "cash", "game_day", "seed", "price", "quality", "inventory",
+            "throughput_level", "efficiency_level", "paused",
+            "component_price", "component_inventory", "auto_purchase_unlocked",
+            "auto_purchase_quantity", "auto_purchase_max_inventory",
+        ):
+            getattr(batch, name)[...] = records[name]
+
+        seeds, batch._calendar_index = np.unique(batch.seed, return_inverse=True)
+        batch._calendars = [DemandCalendar.for_seed(int(seed), batch.product_ids, batch.config) for seed in seeds]
+        if batch._calendars:
+            batch._calendar_stack = np.stack([c.multipliers for c in batch._calendars])
+        return batch
+
+    def to_state(self, i: int) -> GameState:
+        """Unpack game i into a standalone GameState."""
+        state = GameState(
+            cash=float(self.cash[i]), game_day=int(self.game_day[i]), seed=int(self.seed[i]), config=self.config,
+        )
+        if self._calendars:
+            state.demand_calendar = self._calendars[self._calendar_index[i]]
+        for j, pid in enumerate(self.product_ids):
+            state.factories[pid] = FactoryState(
+                throughput_level=int(self.throughput_level[i, j]),
+                efficiency_level=int(self.efficiency_level[i, j]),
+                paused=bool(self.paused[i, j]),
+            )
+            state.products[pid] = ProductState(
+                price=float(self.price[i, j]),
+                quality=float(self.quality[i, j]),
+                inventory=int(self.inventory[i, j]),
+            )
+        for j, cid in enumerate(self.component_ids):
+            state.components[cid] = ComponentState(
+                price=float(self.component_price[i, j]),
+                inventory=float(self.component_inventory[i, j]),
+                auto_purchase_unlocked=bool(self.auto_purchase_unlocked[i, j]),
+                auto_purchase_quantity=int(self.auto_purchase_quantity[i, j]),
+                auto_purchase_max_inventory=int(self.auto_purchase_max_inventory[i, j]),
+            )
+        return state
+
+    def to_states(self) -> list[GameState]:
+        return [self.to_state(i) for i in range(self.n_games)]
+
+    # ── Tick ──────────────────────────────────────────────────────────────
+
+    def _growth_matrix(self, growth_factors) -> np.ndarray | None:
+        """Normalize growth_factors (None, dict, or (N, P) array) to an array."""
+        if growth_factors is None:
+            return None
+        if isinstance(growth_factors, dict):
+            row = [growth_factors.get(pid, 1.0) for pid in self.product_ids]
+            return np.broadcast_to(np.array(row, dtype=float), self.price.shape)
+        return np.asarray(growth_factors, dtype=float)
+
+    def tick(self, growth_factors=None) -> BatchTickResult:
+        """Advance every game by one tick. Mutates the batch.
+
+        growth_factors may be None, a per-product dict shared by all games,
+        or an (N, P) array of per-game factors. With None, each game's demand
+        calendar supplies seasonality × growth (as in sell()); games without
+        a calendar get seasonality only.
+
+        Same phase order as run_tick: produce → sell → auto-purchase → clock.
+        """
+        n = self.n_games
+        n_products = len(self.product_ids)
+
+        # 1. Production — products in order, since factories share components
+        produced = np.zeros((n, n_products), dtype=np.int64)
+        eff_all = _efficiency_table(self.config, int(self.efficiency_level.max()))[self.efficiency_level]
+        active_all = (self.throughput_level > 0) & ~self.paused
+
+        for j, entries in enumerate(self._bom):
+            units = self.throughput_level[:, j] * self.config.capacity_per_throughput_level
+            eff = eff_all[:, j]
+            for k, base_units in entries:
+                can_make = np.trunc(self.component_inventory[:, k] / (base_units * eff)).astype(np.int64)
+                units = np.minimum(units, can_make)
+            units = np.where(active_all[:, j] & (units > 0), units, 0)
+            for k, base_units in entries:
+                self.component_inventory[:, k] -= base_units * eff * units
+            produced[:, j] = units
+        self.inventory += produced
+
+        # 2. Sales
+        positive = self.quality > 0
+        safe_quality = np.where(positive, self.quality, 1.0)
+        base = np.where(
+            positive,
+            self._a * np.exp(-self._b * self.price / safe_quality ** self._alpha),
+            0.0,
+        )
+        growth = self._growth_matrix(growth_factors)
+        if growth is None and self._calendar_stack is not None:
+            last_day = self._calendar_stack.shape[1] - 1
+            day = np.minimum(self.game_day, last_day)
+            demand = base * self._calendar_stack[self._calendar_index, day]
+        else:
+            month = (self.game_day // self.config.days_per_month) % self.config.months_per_year
+            demand = base * self._seasonal[month]
+            if growth is not None:
+                demand = demand * growth
+
+        sold = np.minimum(self.inventory, np.trunc(demand).astype(np.int64))
+        revenue = sold * self.price
+        self.inventory -= sold
+        for j in range(n_products):
+            self.cash += revenue[:, j]
+
+        # 3. Auto-purchase — components in order, since they share cash
+        bought = np.zeros(self.component_inventory.shape, dtype=np.int64)
+        for k in range(len(self.component_ids)):
+            qty = self.auto_purchase_quantity[:, k]
+            cost = self.component_price[:, k] * qty
+            wants = (
+                self.auto_purchase_unlocked[:, k]
+                & (self.component_inventory[:, k] < self.auto_purchase_max_inventory[:, k])
+            )
+            ok = wants & (self.cash >= cost)
+            self.cash = np.where(ok, self.cash - cost, self.cash)
+            self.component_inventory[:, k] = np.where(
+                ok, self.component_inventory[:, k] + qty, self.component_inventory[:, k]
+            )
+            bought[:, k] = np.where(ok, qty, 0)
+
+        # 4. Advance clock
+        self.game_day += 1
+
+        return BatchTickResult(produced, sold, revenue, demand, bought)
@@ -2,35 +2,42 @@
 Game clock — maps real time to in-game calendar.
 
 The tick loop lives in the server layer (threading). This module only
-provides calendar math so the engine stays pure and testable.
+provides calendar math so the engine stays pure and testable. Each
+function takes the game's Config (GameState.config); without one it
+uses the current version.
 """
 
-from engine import config
+from __future__ import annotations
 
+from engine.compiled import Config, current_config
 
-def day_to_month(game_day: int) -> int:
+
+def day_to_month(game_day: int, config: Config | None = None) -> int:
     """Return current month (1-12) for a given game day."""
-    return (game_day // config.DAYS_PER_MONTH) % config.MONTHS_PER_YEAR + 1
+    config = config or current_config()
+    return (game_day // config.days_per_month) % config.months_per_year + 1
 
 
-def day_to_year(game_day: int) -> int:
+def day_to_year(game_day: int, config: Config | None = None) -> int:
     """Return current year (1-based) for a given game day."""
-    return game_day // (config.DAYS_PER_MONTH * config.MONTHS_PER_YEAR) + 1
+    config = config or current_config()
+    return game_day // config.days_per_year + 1
 
 
-def day_to_months_elapsed(game_day: int) -> int:
+def day_to_months_elapsed(game_day: int, config: Config | None = None) -> int:
     """Total months since game start (used for seasonal sine input)."""
-    return game_day // config.DAYS_PER_MONTH
+    return game_day // (config or current_config()).days_per_month
 
 
-def total_game_days() -> int:
+def total_game_days(config: Config | None = None) -> int:
     """Total days in a full game."""
-    return config.GAME_YEARS * config.MONTHS_PER_YEAR * config.DAYS_PER_MONTH
+    return (config or current_config()).total_game_days
 
 
-def format_date(game_day: int) -> str:
+def format_date(game_day: int, config: Config | None = None) -> str:
     """Human-readable date string like 'Year 2, Month 5, Day 14'."""
-    year = day_to_year(game_day)
-    month = day_to_month(game_day)
-    day_in_month = (game_day % config.DAYS_PER_MONTH) + 1
+    config = config or current_config()
+    year = day_to_year(game_day, config)
+    month = day_to_month(game_day, config)
+    day_in_month = (game_day % config.days_per_month) + 1
     return f"Year {year}, Month {month}, Day {day_in_month}"
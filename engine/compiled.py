@@ -0,0 +1,295 @@
+"""
+Compiled, immutable game configuration.
+
+engine.config is a module of plain dicts meant for editing. At runtime the
+engine reads a Config compiled from it instead: every value frozen
+(read-only mappings, tuples and arrays), plus tables the hot paths want
+precomputed (per-product BOM parts, demand-curve arrays, the seasonal
+table). Each game binds the Config current at GameState.new_game and keeps
+it for its whole life:
+
+    cfg = current_config()          # what new games get
+    reload_config("balance.toml")   # new version; running games unaffected
+    state.migrate_config(current_config())   # opt a game in
+
+Config files (JSON or TOML) override the engine.config names they contain,
+e.g. {"UPGRADE_BASE_COST": 800}; everything else keeps the shipped value.
+Caches derived from config (compiled BOMs, demand calendars, curve tables)
+are keyed by the Config object, so a reload can never serve an old
+version's tables to a new game, and games still on the old version keep
+their cache hits.
+
+A Config pickles as the overrides it was compiled from, and unpickles
+(recompiled once per process) to an equal Config, so worker processes run
+exactly the parent's version rather than their own current one.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import threading
+import tomllib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import numpy as np
+
+from engine import config as defaults
+
+# Keys every PRODUCT_DEMAND entry must provide
+DEMAND_PARAMS = (
+    "a", "b", "alpha",
+    "seasonal_mean", "seasonal_amplitude", "seasonal_period", "seasonal_phase",
+    "annual_growth_rate", "growth_noise_range",
+)
+
+# Names a config file may override: the constants in engine.config
+SETTINGS = tuple(name for name in vars(defaults) if name.isupper())
+
+
+@dataclass(frozen=True, eq=False)
+class Config:
+    """One version of the game configuration. Compare and hash by identity."""
+
+    version: int
+    source: str  # "engine.config" or the file it was loaded from
+    overrides: Mapping[str, Any]  # what was compiled over engine.config; rebuilds the Config when unpickled
+
+    # Clock
+    tick_seconds: float
+    days_per_month: int
+    months_per_year: int
+    game_years: int
+
+    # Starting conditions
+    starting_cash: float
+    default_seed: int
+
+    # Catalog (product order follows PRODUCT_STARTING_PRICES)
+    product_ids: tuple[str, ...]
+    component_ids: tuple[int, ...]
+    component_prices: Mapping[int, float]
+    bill_of_materials: Mapping[str, Mapping[int, float | None]]
+    product_demand: Mapping[str, Mapping[str, Any]]
+    product_starting_prices: Mapping[str, float]
+    product_starting_quality: Mapping[str, float]
+
+    # Upgrades
+    upgrade_base_cost: float
+    upgrade_cost_multiplier: float
+    capacity_per_throughput_level: int
+    efficiency_reduction_per_level: float
+    auto_purchase_unlock_cost: float
+
+    # Precomputed
+    bom_parts: Mapping[str, tuple[tuple[int, float], ...]]  # used (component, base units) only
+    demand_a: np.ndarray      # (P,) read-only, product_ids order
+    demand_b: np.ndarray
+    demand_alpha: np.ndarray
+    seasonal: np.ndarray      # (months_per_year, P); row 0 is month 1
+
+    def __deepcopy__(self, memo) -> Config:
+        return self  # immutable; shared by copies of a game
+
+    def __copy__(self) -> Config:
+        return self
+
+    def __reduce__(self):
+        return _unpickle, (dict(self.overrides), self.version, self.source)
+
+    @property
+    def days_per_year(self) -> int:
+        return self.days_per_month * self.months_per_year
+
+    @property
+    def total_game_days(self) -> int:
+        return self.game_years * self.days_per_year
+
+    def capacity(self, throughput_level: int) -> int:
+        """Units produced per tick at a throughput level."""
+        return throughput_level * self.capacity_per_throughput_level
+
+    def efficiency_multiplier(self, efficiency_level: int) -> float:
+        """Component usage multiplier at an efficiency level."""
+        return (1 - self.efficiency_reduction_per_level) ** efficiency_level
+
+    def upgrade_cost(self, current_level: int) -> float:
+        """Cost to upgrade from current_level to current_level + 1."""
+        return self.upgrade_base_cost * (self.upgrade_cost_multiplier ** current_level)
+
+
+_unpickled: dict[str, Config] = {}
+
+
+def _unpickle(overrides: dict, version: int, source: str) -> Config:
+    """Recompile a pickled Config, once per process, so cache keys stay shared."""
+    key = repr((overrides, version, source))
+    cfg = _unpickled.get(key)
+    if cfg is None:
+        cfg = _unpickled[key] = compile_config(overrides, version, source)
+    return cfg
+
+
+def _frozen_array(values) -> np.ndarray:
+    arr = np.array(values, dtype=float)
+    arr.flags.writeable = False
+    return arr
+
+
+def _int_keys(name: str, mapping: Mapping) -> dict:
+    """Component ids come back as strings from JSON/TOML; make them ints."""
+    try:
+        return {int(k): v for k, v in mapping.items()}
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}: component ids must be integers") from None
+
+
+def compile_config(
+    overrides: Mapping[str, Any] | None = None,
+    version: int = 0,
+    source: str = "engine.config",
+) -> Config:
+    """Freeze engine.config, with any overrides applied, into a Config.
+
+    overrides uses engine.config's names. Raises ValueError on unknown
+    names or an inconsistent catalog.
+    """
+    from engine.demand import seasonal_modifier  # engine.demand reads Config
+
+    overrides = dict(overrides or {})
+    unknown = sorted(set(overrides) - set(SETTINGS))
+    if unknown:
+        raise ValueError(f"unknown config settings: {', '.join(unknown)}")
+    values = {name: overrides.get(name, getattr(defaults, name)) for name in SETTINGS}
+
+    for name in ("DAYS_PER_MONTH", "MONTHS_PER_YEAR", "GAME_YEARS", "CAPACITY_PER_THROUGHPUT_LEVEL"):
+        if not isinstance(values[name], int) or values[name] <= 0:
+            raise ValueError(f"{name} must be a positive integer")
+
+    component_prices = {cid: float(p) for cid, p in _int_keys("COMPONENT_PRICES", values["COMPONENT_PRICES"]).items()}
+    component_ids = tuple(component_prices)
+    product_ids = tuple(values["PRODUCT_STARTING_PRICES"])
+    for name in ("BILL_OF_MATERIALS", "PRODUCT_DEMAND", "PRODUCT_STARTING_QUALITY"):
+        if set(values[name]) != set(product_ids):
+            raise ValueError(f"{name} must cover exactly the products in PRODUCT_STARTING_PRICES")
+
+    bom, parts = {}, {}
+    for pid in product_ids:
+        row = _int_keys(f"BILL_OF_MATERIALS[{pid!r}]", values["BILL_OF_MATERIALS"][pid])
+        extra = set(row) - set(component_ids)
+        if extra:
+            raise ValueError(f"BILL_OF_MATERIALS[{pid!r}] uses unknown components {sorted(extra)}")
+        # Files may leave unused components out (TOML has no null)
+        full = {cid: None if row.get(cid) is None else float(row[cid]) for cid in component_ids}
+        bom[pid] = MappingProxyType(full)
+        parts[pid] = tuple((cid, base) for cid, base in full.items() if base is not None)
+
+    demand = {}
+    for pid in product_ids:
+        params = dict(values["PRODUCT_DEMAND"][pid])
+        missing = [key for key in DEMAND_PARAMS if key not in params]
+        if missing:
+            raise ValueError(f"PRODUCT_DEMAND[{pid!r}] is missing {', '.join(missing)}")
+        params["growth_noise_range"] = tuple(params["growth_noise_range"])
+        demand[pid] = MappingProxyType(params)
+
+    params = [demand[pid] for pid in product_ids]
+    seasonal = [
+        [seasonal_modifier(month, p) for p in params]
+        for month in range(1, values["MONTHS_PER_YEAR"] + 1)
+    ]
+
+    return Config(
+        version=version,
+        source=source,
+        overrides=MappingProxyType(copy.deepcopy(overrides)),
+        tick_seconds=float(values["TICK_SECONDS"]),
+        days_per_month=values["DAYS_PER_MONTH"],
+        months_per_year=values["MONTHS_PER_YEAR"],
+        game_years=values["GAME_YEARS"],
+        starting_cash=float(values["STARTING_CASH"]),
+        default_seed=int(values["DEFAULT_SEED"]),
+        product_ids=product_ids,
+        component_ids=component_ids,
+        component_prices=MappingProxyType(component_prices),
+        bill_of_materials=MappingProxyType(bom),
+        product_demand=MappingProxyType(demand),
+        product_starting_prices=MappingProxyType(
+            {pid: float(values["PRODUCT_STARTING_PRICES"][pid]) for pid in product_ids}),
+        product_starting_quality=MappingProxyType(
+            {pid: float(values["PRODUCT_STARTING_QUALITY"][pid]) for pid in product_ids}),
+        upgrade_base_cost=float(values["UPGRADE_BASE_COST"]),
+        upgrade_cost_multiplier=float(values["UPGRADE_COST_MULTIPLIER"]),
+        capacity_per_throughput_level=values["CAPACITY_PER_THROUGHPUT_LEVEL"],
+        efficiency_reduction_per_level=float(values["EFFICIENCY_REDUCTION_PER_LEVEL"]),
+        auto_purchase_unlock_cost=float(values["AUTO_PURCHASE_UNLOCK_COST"]),
+        bom_parts=MappingProxyType(parts),
+        demand_a=_frozen_array([p["a"] for p in params]),
+        demand_b=_frozen_array([p["b"] for p in params]),
+        demand_alpha=_frozen_array([p["alpha"] for p in params]),
+        seasonal=_frozen_array(seasonal),
+    )
+
+
+def read_config_file(path: str) -> dict:
+    """Overrides from a .json or .toml file. Raises ValueError if unreadable."""
+    try:
+        if path.endswith(".toml"):
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            with open(path) as f:
+                data = json.load(f)
+    except (OSError, ValueError) as exc:  # JSONDecodeError and TOMLDecodeError are ValueErrors
+        raise ValueError(f"cannot read config {path}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise ValueError(f"config {path} must hold a table of settings")
+    return data
+
+
+# ── Current version ───────────────────────────────────────────────────────────
+
+_lock = threading.Lock()
+_current: Config | None = None
+
+
+def current_config() -> Config:
+    """The version new games bind to."""
+    global _current
+    cfg = _current
+    if cfg is None:
+        with _lock:
+            if _current is None:
+                _current = compile_config()
+            cfg = _current
+    return cfg
+
+
+def reload_config(path: str | None = None) -> Config:
+    """Compile a new version from path (or the shipped defaults) and make it
+    current. Raises ValueError, leaving the current version in place, if
+    the file is unreadable or invalid. Games already running keep theirs.
+    """
+    global _current
+    overrides = read_config_file(path) if path else None
+    with _lock:
+        previous = _current.version if _current is not None else 0
+        cfg = compile_config(overrides, version=previous + 1, source=path or "engine.config")
+        _current = cfg  # single reference swap: readers see old or new, never a mix
+    return cfg
+
+
+@contextmanager
+def use_config(cfg: Config):
+    """Make cfg current inside the block (tests and benchmarks)."""
+    global _current
+    with _lock:
+        previous, _current = _current, cfg
+    try:
+        yield cfg
+    finally:
+        with _lock:
+            _current = previous
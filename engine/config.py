@@ -3,6 +3,9 @@ All game tuning parameters in one place.
 
 Every magic number lives here — demand curves, costs, BOM, seasonal patterns,
 growth rates, upgrade scaling. Change this file to rebalance the game.
+
+The engine reads these through engine.compiled.Config. A JSON or TOML file
+using the same names can override them at runtime (BIZSIM_CONFIG).
 """
 
 # ── Game Clock ────────────────────────────────────────────────────────────────
@@ -13,6 +16,7 @@ GAME_YEARS = 10                     # Default game length
 
 # ── Starting Conditions ──────────────────────────────────────────────────────
 STARTING_CASH = 10_000
+DEFAULT_SEED = 42                   # Seeds each game's demand calendar
 
 # ── Components ───────────────────────────────────────────────────────────────
 # component_id -> base price per unit
@@ -7,13 +7,26 @@ Combines three layers:
   3. Market growth:             compounding annual growth with noise
 
 Final demand = elasticity * (seasonal / seasonal_mean) * growth_factor
+
+Layers 2 and 3 depend only on the calendar and the game's seed, so each
+game precomputes them once into a DemandCalendar (days × products).
+
+evaluate_grid / capacity_limited_revenue evaluate the same formula over
+NumPy arrays of candidate prices, qualities and days in one call, for
+bots and balancing tools scanning what-if scenarios.
 """
 
 from __future__ import annotations
 
 import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
 import numpy as np
-from engine import config
+from engine.compiled import Config, current_config
+
+if TYPE_CHECKING:
+    from engine.game_state import GameState
 
 
 def price_quality_demand(price: float, quality: float, params: dict) -> float:
@@ -30,6 +43,54 @@ def price_quality_demand(price: float, quality: float, params: dict) -> float:
     return a * math.exp(-b * price / (quality ** alpha))
 
 
+class ElasticityCache:
+    """Per-product memo of price_quality_demand for one game.
+
+    Price and quality only change on player actions, so the exp/pow in the
+    elasticity curve is recomputed only when the (price, quality) pair for
+    a product differs from the cached one. Entries are keyed on the pair,
+    so a stale entry can never be returned; invalidate() just drops them
+    eagerly when an action is known to have changed a product.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, float, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, product_id: str, price: float, quality: float, params: dict) -> float:
+        entry = self._entries.get(product_id)
+        if entry is not None and entry[0] == price and entry[1] == quality:
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        value = price_quality_demand(price, quality, params)
+        self._entries[product_id] = (price, quality, value)
+        return value
+
+    def copy(self) -> ElasticityCache:
+        """Same entries, fresh counters (for a forked game)."""
+        twin = ElasticityCache()
+        twin._entries = dict(self._entries)
+        return twin
+
+    def invalidate(self, product_id: str | None = None) -> None:
+        """Drop one product's entry, or all of them."""
+        if product_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(product_id, None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
 def seasonal_modifier(month: int, params: dict) -> float:
     """Seasonal demand multiplier based on sine wave.
 
@@ -68,12 +129,82 @@ def growth_factor(year: int, params: dict, rng: np.random.Generator | None = Non
     return factor
 
 
+class DemandCalendar:
+    """Seasonal × growth multiplier for every (game_day, product) of one game.
+
+    Growth noise is drawn once, year by year, from a generator seeded with
+    the game's seed, so the same seed always yields the same calendar no
+    matter when (or how often) a year's growth is looked up. Instances are
+    immutable and shared between games with the same seed and Config.
+    """
+
+    def __init__(self, seed: int, product_ids: tuple[str, ...], config: Config | None = None):
+        config = config or current_config()
+        self.seed = seed
+        self.product_ids = product_ids
+        self.config = config
+        self._column = {pid: j for j, pid in enumerate(product_ids)}
+
+        params = [config.product_demand[pid] for pid in product_ids]
+        _, _, _, seasonal = _curve_params(product_ids, config)
+
+        rng = np.random.default_rng(seed)
+        lo = np.array([p["growth_noise_range"][0] for p in params])
+        hi = np.array([p["growth_noise_range"][1] for p in params])
+        noise = rng.uniform(lo, hi, size=(config.game_years, len(params)))
+        base_rate = np.array([1 + p["annual_growth_rate"] for p in params])
+        growth = np.cumprod(base_rate * noise, axis=0)  # row y-1 = factor for year y
+
+        days = np.arange(config.total_game_days)
+        month_idx = (days // config.days_per_month) % config.months_per_year
+        year_idx = days // config.days_per_year
+
+        self.multipliers = seasonal[month_idx] * growth[year_idx]
+        self.multipliers.flags.writeable = False
+        self.growth = growth
+        self.growth.flags.writeable = False
+        self._rows = self.multipliers.tolist()  # fast scalar lookups
+        self._last_day = len(self._rows) - 1
+
+    def __deepcopy__(self, memo) -> DemandCalendar:
+        return self  # immutable; shared by copies of a game
+
+    @classmethod
+    def for_seed(
+        cls, seed: int, product_ids: tuple[str, ...] | None = None, config: Config | None = None
+    ) -> DemandCalendar:
+        """Shared calendar for a seed (built once per Config, then cached)."""
+        config = config or current_config()
+        return _cached_calendar(seed, tuple(product_ids or config.product_ids), config)
+
+    @property
+    def days(self) -> int:
+        return len(self._rows)
+
+    def multiplier(self, game_day: int, product_id: str) -> float:
+        """Seasonal × growth multiplier. Days past the end reuse the last day."""
+        return self._rows[min(game_day, self._last_day)][self._column[product_id]]
+
+    def growth_factors(self, year: int) -> dict[str, float]:
+        """Per-product growth factors for a 1-based game year."""
+        row = self.growth[min(year, self.config.game_years) - 1]
+        return dict(zip(self.product_ids, row.tolist()))
+
+
+@lru_cache(maxsize=256)
+def _cached_calendar(seed: int, product_ids: tuple[str, ...], config: Config) -> DemandCalendar:
+    return DemandCalendar(seed, product_ids, config)
+
+
 def calculate_demand(
     product_id: str,
     price: float,
     quality: float,
     game_day: int,
     growth_factors: dict[str, float] | None = None,
+    calendar: DemandCalendar | None = None,
+    elasticity: ElasticityCache | None = None,
+    config: Config | None = None,
 ) -> float:
     """Full demand calculation combining all three layers.
 
@@ -84,17 +215,29 @@ def calculate_demand(
         game_day: Current game day (for calendar lookups).
         growth_factors: Pre-computed per-product growth factors for the current
                         year. If None, growth is treated as 1.0.
+        calendar: The game's DemandCalendar. When given (and growth_factors
+                  is None), layers 2 and 3 come from a single O(1) lookup.
+        elasticity: The game's ElasticityCache, to reuse layer 1 across ticks.
+        config: The game's Config (GameState.config); defaults to the current one.
 
     Returns:
         Demand as a float (caller should floor to int for actual sales).
     """
-    params = config.PRODUCT_DEMAND[product_id]
+    config = config or current_config()
+    params = config.product_demand[product_id]
 
     # Layer 1: price-quality elasticity
-    base = price_quality_demand(price, quality, params)
+    if elasticity is not None:
+        base = elasticity.get(product_id, price, quality, params)
+    else:
+        base = price_quality_demand(price, quality, params)
+
+    # Layers 2 + 3 precomputed for this game
+    if calendar is not None and growth_factors is None:
+        return base * calendar.multiplier(game_day, product_id)
 
     # Layer 2: seasonal modifier
-    month = (game_day // config.DAYS_PER_MONTH) % config.MONTHS_PER_YEAR + 1
+    month = (game_day // config.days_per_month) % config.months_per_year + 1
     season = seasonal_modifier(month, params)
 
     # Layer 3: market growth
@@ -103,3 +246,107 @@ def calculate_demand(
         gf = growth_factors[product_id]
 
     return base * season * gf
+
+
+# ── Vectorized what-if evaluation ─────────────────────────────────────────────
+
+@dataclass
+class DemandGrid:
+    """Result of a what-if evaluation; every array has the broadcast shape."""
+    demand: np.ndarray    # market demand (float)
+    units: np.ndarray     # units that would sell (int64)
+    revenue: np.ndarray   # units * price
+
+
+@lru_cache(maxsize=64)
+def _curve_params(product_ids: tuple[str, ...], config: Config) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(a, b, alpha, seasonal[12, P]) for a product tuple, from config's tables."""
+    if product_ids == config.product_ids:
+        return config.demand_a, config.demand_b, config.demand_alpha, config.seasonal
+    cols = [config.product_ids.index(pid) for pid in product_ids]
+    tables = (config.demand_a[cols], config.demand_b[cols], config.demand_alpha[cols], config.seasonal[:, cols])
+    for arr in tables:
+        arr.flags.writeable = False
+    return tables
+
+
+def price_quality_demand_array(
+    product_ids: tuple[str, ...], prices, qualities, config: Config | None = None
+) -> np.ndarray:
+    """price_quality_demand over arrays whose last axis is product_ids."""
+    a, b, alpha, _ = _curve_params(tuple(product_ids), config or current_config())
+    prices = np.asarray(prices, dtype=float)
+    qualities = np.asarray(qualities, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        demand = a * np.exp(-b * prices / qualities ** alpha)
+    return np.where(qualities > 0, demand, 0.0)
+
+
+def evaluate_grid(
+    product_ids: tuple[str, ...],
+    prices,
+    qualities,
+    days,
+    calendar: DemandCalendar | None = None,
+    growth_factors: dict[str, float] | None = None,
+    capacity=None,
+    config: Config | None = None,
+) -> DemandGrid:
+    """Demand, units sold and revenue for many candidate scenarios at once.
+
+    prices and qualities broadcast against each other with products on the
+    last axis (length len(product_ids), or 1). days carries no product
+    axis: it broadcasts against the leading axes. capacity, if given, caps
+    units per product (e.g. GameState.factory_capacity); inventory is ignored.
+
+    Seasonality and growth come from calendar when given, otherwise from
+    the seasonal curve and growth_factors, exactly as in calculate_demand.
+    Values agree with calculate_demand up to floating-point rounding.
+    """
+    config = config or current_config()
+    product_ids = tuple(product_ids)
+    prices = np.asarray(prices, dtype=float)
+    base = price_quality_demand_array(product_ids, prices, qualities, config)
+    days = np.asarray(days, dtype=np.int64)
+
+    # Seasonal × growth multiplier with shape days.shape + (P,)
+    if calendar is not None and growth_factors is None:
+        table = calendar.multipliers
+        if product_ids != calendar.product_ids:
+            table = table[:, [calendar._column[pid] for pid in product_ids]]
+        multiplier = table[np.clip(days, 0, calendar.days - 1)]
+    else:
+        _, _, _, seasonal = _curve_params(product_ids, config)
+        multiplier = seasonal[(days // config.days_per_month) % config.months_per_year]
+        if growth_factors:
+            multiplier = multiplier * np.array([growth_factors.get(pid, 1.0) for pid in product_ids])
+
+    demand = base * multiplier
+    units = np.floor(demand).astype(np.int64)
+    if capacity is not None:
+        units = np.minimum(units, np.asarray(capacity, dtype=np.int64))
+    return DemandGrid(demand, units, units * prices)
+
+
+def capacity_limited_revenue(state: GameState, prices=None, qualities=None, days=None) -> DemandGrid:
+    """What-if revenue for a game, capping sales at each factory's capacity.
+
+    Any of prices / qualities / days left as None uses the game's current
+    values. A fast steady-state estimate: component limits and inventory
+    are not modelled, and paused factories count as zero capacity.
+    """
+    product_ids = tuple(state.products)
+    if prices is None:
+        prices = [state.products[pid].price for pid in product_ids]
+    if qualities is None:
+        qualities = [state.products[pid].quality for pid in product_ids]
+    if days is None:
+        days = state.game_day
+    capacity = [
+        0 if state.factories[pid].paused else state.config.capacity(state.factories[pid].throughput_level)
+        for pid in product_ids
+    ]
+    return evaluate_grid(
+        product_ids, prices, qualities, days,
+        calendar=state.demand_calendar, capacity=capacity, config=state.config,
+    )
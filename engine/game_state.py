@@ -4,39 +4,53 @@ Single source of truth for all mutable game state.
 Replaces the scattered global dicts (balances, factory_state, business,
 flows_state, features_unlocked) from the prototype. All mutation goes
 through methods on this class so the engine stays testable.
+
+Every engine mutation calls GameState.touch(), which bumps a monotonically
+increasing version and records which product/component section changed.
+The server uses this for ETags and delta responses.
+
+Products, factories and components are stored either as slotted
+dataclasses (the default) or, with new_game(storage="arrays"), in typed
+arrays behind views with the same attributes (see engine.storage).
+
+Each game is bound to the compiled Config current when it was created
+(see engine.compiled) and keeps it until migrate_config().
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from engine import config
+from engine.config import DEFAULT_SEED
+from engine.compiled import Config, current_config
+from engine.demand import DemandCalendar, ElasticityCache
+from engine.reorder import ReorderIndex
+from engine.storage import GameArrays, views
 
+STORAGE_BACKENDS = ("objects", "arrays")
 
-@dataclass
+
+@dataclass(slots=True)
 class FactoryState:
     throughput_level: int = 0
     efficiency_level: int = 0
     paused: bool = False
-
-    @property
-    def capacity(self) -> int:
-        """Units produced per tick at current throughput level."""
-        return self.throughput_level * config.CAPACITY_PER_THROUGHPUT_LEVEL
-
-    @property
-    def efficiency_multiplier(self) -> float:
-        """Component usage multiplier (lower = less waste)."""
-        return (1 - config.EFFICIENCY_REDUCTION_PER_LEVEL) ** self.efficiency_level
+    # Capacity and efficiency depend on the game's Config: see
+    # GameState.factory_capacity and factory_efficiency
 
 
-@dataclass
+@dataclass(slots=True)
 class ProductState:
     price: float = 0.0
     quality: float = 1.0
     inventory: int = 0
 
+    # Outcome of the most recent sales step (display only)
+    last_sold: int = field(default=0, compare=False)
+    last_revenue: float = field(default=0.0, compare=False)
+    last_demand: float = field(default=0.0, compare=False)
 
-@dataclass
+
+@dataclass(slots=True)
 class ComponentState:
     price: float = 1.0
     inventory: float = 0.0
@@ -51,46 +65,181 @@ class GameState:
 
     cash: float = 0.0
     game_day: int = 0  # days elapsed since game start
+    seed: int = DEFAULT_SEED  # drives the demand calendar
 
     factories: dict[str, FactoryState] = field(default_factory=dict)
     products: dict[str, ProductState] = field(default_factory=dict)
     components: dict[int, ComponentState] = field(default_factory=dict)
 
+    # Tuning this game runs under; shared, immutable, not part of equality
+    config: Config = field(default_factory=current_config, repr=False, compare=False)
+    # Derived from seed; shared, read-only, not part of equality
+    demand_calendar: DemandCalendar | None = field(default=None, repr=False, compare=False)
+    # Memoized price-quality demand; invalidated by price/quality actions
+    elasticity_cache: ElasticityCache = field(default_factory=ElasticityCache, repr=False, compare=False)
+    # Predicted auto-purchase days; invalidated by factory, setting and stock actions
+    reorder_index: ReorderIndex = field(default_factory=ReorderIndex, repr=False, compare=False)
+
+    # Change tracking: version bumps on every touch(); sections not touched
+    # since creation report base_version.
+    version: int = field(default=0, compare=False)
+    base_version: int = field(default=0, compare=False)
+    section_versions: dict[tuple[str, object], int] = field(default_factory=dict, repr=False, compare=False)
+
+    # Backing arrays when created with storage="arrays", else None
+    arrays: GameArrays | None = field(default=None, repr=False, compare=False)
+
     @classmethod
-    def new_game(cls) -> GameState:
-        """Create a fresh game state from config defaults."""
-        state = cls(cash=config.STARTING_CASH)
-
-        for product_id, price in config.PRODUCT_STARTING_PRICES.items():
-            state.factories[product_id] = FactoryState()
-            state.products[product_id] = ProductState(
-                price=price,
-                quality=config.PRODUCT_STARTING_QUALITY[product_id],
+    def new_game(
+        cls, seed: int = DEFAULT_SEED, storage: str = "objects", config: Config | None = None
+    ) -> GameState:
+        """Create a fresh game state from config defaults.
+
+        storage selects the layout: "objects" (one dataclass per entity)
+        or "arrays" (typed arrays behind views; smaller per game). The game
+        binds config, or the current Config if not given.
+        """
+        if storage not in STORAGE_BACKENDS:
+            raise ValueError(f"unknown storage {storage!r}")
+        config = config or current_config()
+        state = cls(cash=config.starting_cash, seed=seed, config=config)
+        product_ids = config.product_ids
+        state.demand_calendar = DemandCalendar.for_seed(seed, product_ids, config)
+
+        if storage == "arrays":
+            state.arrays = GameArrays(product_ids, config.component_ids)
+            state.factories, state.products, state.components = views(state.arrays)
+            default = ComponentState()  # arrays start zeroed; copy non-zero defaults
+            for comp in state.components.values():
+                comp.auto_purchase_quantity = default.auto_purchase_quantity
+                comp.auto_purchase_max_inventory = default.auto_purchase_max_inventory
+        else:
+            for product_id in product_ids:
+                state.factories[product_id] = FactoryState()
+                state.products[product_id] = ProductState()
+            for comp_id in config.component_ids:
+                state.components[comp_id] = ComponentState()
+
+        for product_id, price in config.product_starting_prices.items():
+            product = state.products[product_id]
+            product.price = price
+            product.quality = config.product_starting_quality[product_id]
+
+        for comp_id, price in config.component_prices.items():
+            state.components[comp_id].price = price
+
+        return state
+
+    def migrate_config(self, config: Config) -> None:
+        """Move this game onto another Config version. Mutates state.
+
+        The catalog (product and component ids) must match; balance values
+        take effect from the next tick. Raises ValueError otherwise.
+        """
+        if config.product_ids != tuple(self.products) or config.component_ids != tuple(self.components):
+            raise ValueError("config has a different catalog; this game cannot migrate to it")
+        self.config = config
+        if self.demand_calendar is not None:
+            self.demand_calendar = DemandCalendar.for_seed(self.seed, config.product_ids, config)
+        self.elasticity_cache.invalidate()
+        self.reorder_index.invalidate()
+        for pid in self.products:  # capacities and upgrade costs may all differ
+            self.touch("products", pid)
+        self.touch()
+
+    # ── Forking ───────────────────────────────────────────────────────────
+
+    def fork(self) -> GameState:
+        """Independent copy for what-if play; far cheaper than copy.deepcopy.
+
+        The config and demand calendar are shared (both immutable). With
+        storage="arrays" the entity arrays are copy-on-write, so the fork
+        costs a few small objects until either game writes; with objects,
+        each entity is copied flat. Caches and change tracking carry over.
+        """
+        twin = GameState(
+            cash=self.cash,
+            game_day=self.game_day,
+            seed=self.seed,
+            config=self.config,
+            demand_calendar=self.demand_calendar,
+            elasticity_cache=self.elasticity_cache.copy(),
+            reorder_index=self.reorder_index.copy(),
+            version=self.version,
+            base_version=self.base_version,
+            section_versions=dict(self.section_versions),
+        )
+        if self.arrays is not None:
+            twin.arrays = self.arrays.fork()
+            twin.factories, twin.products, twin.components = views(twin.arrays)
+            return twin
+
+        twin.factories = {
+            pid: FactoryState(f.throughput_level, f.efficiency_level, f.paused)
+            for pid, f in self.factories.items()
+        }
+        twin.products = {
+            pid: ProductState(p.price, p.quality, p.inventory, p.last_sold, p.last_revenue, p.last_demand)
+            for pid, p in self.products.items()
+        }
+        twin.components = {
+            cid: ComponentState(
+                c.price, c.inventory, c.auto_purchase_unlocked,
+                c.auto_purchase_quantity, c.auto_purchase_max_inventory,
             )
+            for cid, c in self.components.items()
+        }
+        return twin
 
-        for comp_id, price in config.COMPONENT_PRICES.items():
-            state.components[comp_id] = ComponentState(price=price)
+    # ── Change tracking ───────────────────────────────────────────────────
 
-        return state
+    def touch(self, section: str | None = None, key: object = None) -> None:
+        """Record a mutation. section is "products" or "components" (keyed by
+        id); None covers top-level fields such as cash and game_day."""
+        self.version += 1
+        if section is not None:
+            self.section_versions[(section, key)] = self.version
+
+    def section_version(self, section: str, key: object) -> int:
+        """Version at which this product/component last changed."""
+        return self.section_versions.get((section, key), self.base_version)
+
+    def changed_since(self, section: str, version: int) -> list:
+        """Ids in a section ("products" or "components") changed after version."""
+        ids = self.products if section == "products" else self.components
+        return [key for key in ids if self.section_version(section, key) > version]
+
+    def start_versions_at(self, version: int) -> None:
+        """Continue another state's version sequence (e.g. after a reset), so
+        everything in this state counts as changed since any older version."""
+        self.version = self.base_version = version
 
     # ── Convenience accessors ─────────────────────────────────────────────
 
     @property
     def game_month(self) -> int:
         """Current month (1-12) in the game calendar."""
-        return (self.game_day // config.DAYS_PER_MONTH) % config.MONTHS_PER_YEAR + 1
+        return (self.game_day // self.config.days_per_month) % self.config.months_per_year + 1
 
     @property
     def game_year(self) -> int:
         """Current year (1-based) in the game calendar."""
-        return self.game_day // (config.DAYS_PER_MONTH * config.MONTHS_PER_YEAR) + 1
+        return self.game_day // self.config.days_per_year + 1
 
     @property
     def months_elapsed(self) -> int:
         """Total months since game start (for seasonal calculations)."""
-        return self.game_day // config.DAYS_PER_MONTH
+        return self.game_day // self.config.days_per_month
+
+    def factory_capacity(self, product_id: str) -> int:
+        """Units the product's factory makes per tick at its throughput level."""
+        return self.config.capacity(self.factories[product_id].throughput_level)
+
+    def factory_efficiency(self, product_id: str) -> float:
+        """Component usage multiplier of the product's factory (lower = less waste)."""
+        return self.config.efficiency_multiplier(self.factories[product_id].efficiency_level)
 
     @property
     def game_over(self) -> bool:
         """Whether the game has reached its time limit."""
-        return self.game_year > config.GAME_YEARS
+        return self.game_year > self.config.game_years
@@ -0,0 +1,212 @@
+"""
+Per-game time series in preallocated ring buffers.
+
+History keeps one row per game day: cash, and per product units sold,
+market demand, inventory, units produced and factory throughput level,
+and per component inventory. Arrays are allocated once, sized to the
+game length by default, and written in place by record() after each
+tick:
+
+    history = History.for_state(state)
+    result = run_tick(state)
+    history.record(state, result)
+    history.query(0, 360, "month")   # 12 rows of sums / means / last values
+
+Row for day d lives at d % capacity. If the game outlives the capacity,
+the oldest days are overwritten. Fast-forwards are recorded too: given
+the History, engine.tick.simulate_until writes every day it advances,
+and each analytic segment as one vectorized span (record_segment).
+Queries skip days with no row, so each bucket aggregates only the
+recorded days (its "ticks" count says how many).
+
+Queries are vectorized: buckets are found with np.diff and reduced with
+np.add.reduceat, with no Python loop over days.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from engine.game_state import GameState
+    from engine.segments import Segment
+    from engine.tick import TickResult
+
+RESOLUTIONS = ("day", "month", "year")
+
+# Per-product series -> how a bucket of days is reduced
+PRODUCT_SERIES = {
+    "sold": "sum", "demand": "mean", "inventory": "last", "produced": "sum", "throughput": "last",
+}
+
+
+class History:
+    """Ring buffers of per-day series for one game."""
+
+    def __init__(
+        self,
+        product_ids: tuple[str, ...],
+        component_ids: tuple[int, ...],
+        capacity: int,
+        days_per_month: int,
+        days_per_year: int,
+    ):
+        self.product_ids = product_ids
+        self.component_ids = component_ids
+        self.capacity = capacity
+        self.bucket_days = {"day": 1, "month": days_per_month, "year": days_per_year}
+        p, c = len(product_ids), len(component_ids)
+
+        self.day = np.full(capacity, -1, dtype=np.int64)  # game day held by each row; -1 = empty
+        self.cash = np.zeros(capacity)
+        self.sold = np.zeros((capacity, p), dtype=np.int64)
+        self.demand = np.zeros((capacity, p))
+        self.inventory = np.zeros((capacity, p), dtype=np.int64)
+        self.produced = np.zeros((capacity, p), dtype=np.int64)
+        self.throughput = np.zeros((capacity, p), dtype=np.int64)
+        self.component_inventory = np.zeros((capacity, c))
+        self.last_day = -1  # most recent day recorded
+
+    @classmethod
+    def for_state(cls, state: GameState, capacity: int | None = None) -> History:
+        """Buffers for this game's catalog; capacity defaults to the game length."""
+        cfg = state.config
+        return cls(
+            tuple(state.products), tuple(state.components),
+            capacity or cfg.total_game_days, cfg.days_per_month, cfg.days_per_year,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (
+            self.day, self.cash, self.sold, self.demand, self.inventory, self.produced, self.throughput,
+            self.component_inventory,
+        ))
+
+    def record(self, state: GameState, result: TickResult) -> None:
+        """Store the day result covers, as state stands after that tick."""
+        self.record_day(
+            state, result.game_day,
+            [p.units_produced for p in result.production],
+            [s.units_sold for s in result.sales],
+            [s.demand for s in result.sales],
+        )
+
+    def record_day(
+        self, state: GameState, day: int,
+        produced: list[int], sold: list[int], demand: list[float],
+    ) -> None:
+        """Store `day` from per-product flows, as state stands after its tick."""
+        row = day % self.capacity
+        self.day[row] = day
+        self.cash[row] = state.cash
+        self.sold[row] = sold
+        self.demand[row] = demand
+        self.produced[row] = produced
+        self.inventory[row] = [p.inventory for p in state.products.values()]
+        self.throughput[row] = [f.throughput_level for f in state.factories.values()]
+        self.component_inventory[row] = [c.inventory for c in state.components.values()]
+        self.last_day = max(self.last_day, day)
+
+    def record_segment(self, state: GameState, segment: Segment) -> None:
+        """Store the segment.ticks identical days just applied to state, in
+        one vectorized write: flows repeat, and levels step back linearly
+        from where state now stands."""
+        k = segment.ticks
+        first = state.game_day - k
+        n = min(k, self.capacity)  # a span longer than the ring keeps its tail
+        days = np.arange(first + k - n, first + k)
+        rows = days % self.capacity
+        back = (first + k - 1 - days)[:, None]  # ticks after each day, to state's day
+
+        made = np.array(segment.units_produced)
+        sold = np.array(segment.units_sold)
+        self.day[rows] = days
+        self.cash[rows] = state.cash - (segment.revenue - segment.spend) * back[:, 0]
+        self.sold[rows] = sold
+        self.demand[rows] = segment.demand
+        self.produced[rows] = made
+        self.inventory[rows] = [p.inventory for p in state.products.values()] - (made - sold) * back
+        self.throughput[rows] = [f.throughput_level for f in state.factories.values()]
+        self.component_inventory[rows] = (
+            [c.inventory for c in state.components.values()] - np.array(segment.component_delta) * back
+        )
+        self.last_day = max(self.last_day, int(days[-1]))
+
+    def truncate(self, day: int) -> None:
+        """Forget recorded days from `day` on (e.g. after a rolled-back batch)."""
+        self.day[self.day >= day] = -1
+        self.last_day = int(self.day.max())
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Every recorded day still held, in day order, as flat columns.
+
+        Keys are "day", "cash", "<series>.<product_id>" for each product
+        series and "component_inventory.<component_id>".
+        """
+        days = np.arange(max(0, self.last_day - self.capacity + 1), self.last_day + 1)
+        rows = days % self.capacity
+        held = self.day[rows] == days
+        rows = rows[held]
+        out = {"day": days[held], "cash": self.cash[rows]}
+        for name in PRODUCT_SERIES:
+            series = getattr(self, name)[rows]
+            for j, pid in enumerate(self.product_ids):
+                out[f"{name}.{pid}"] = series[:, j]
+        for j, cid in enumerate(self.component_ids):
+            out[f"component_inventory.{cid}"] = self.component_inventory[rows, j]
+        return out
+
+    def query(self, start: int, stop: int, resolution: str = "day") -> dict:
+        """Recorded days in [start, stop), bucketed by day, month or year.
+
+        Flows (sold, produced) are summed, demand is averaged and levels
+        (cash, inventories) take the bucket's last recorded day. Returns
+        JSON-ready lists; "start" is the game day each bucket's period
+        begins on.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {', '.join(RESOLUTIONS)}")
+        size = self.bucket_days[resolution]
+        start = max(start, 0, self.last_day - self.capacity + 1)
+        stop = min(stop, self.last_day + 1)
+
+        days = np.arange(start, max(start, stop))
+        rows = days % self.capacity
+        held = self.day[rows] == days
+        days, rows = days[held], rows[held]
+
+        bucket = days // size
+        first = np.flatnonzero(np.diff(bucket, prepend=-1))  # index of each bucket's first day
+        end = np.append(first[1:], len(days)) if len(days) else first
+        counts = end - first
+        last_rows = rows[end - 1]
+
+        def reduce(series: np.ndarray, how: str) -> np.ndarray:
+            if how == "last":
+                return series[last_rows]
+            if not len(days):
+                return series[:0].astype(float)
+            total = np.add.reduceat(series[rows], first, axis=0)
+            return total if how == "sum" else total / counts[:, None]
+
+        products = {name: reduce(getattr(self, name), how).T.tolist() for name, how in PRODUCT_SERIES.items()}
+        components = {"inventory": self.component_inventory[last_rows].T.tolist()}
+        return {
+            "resolution": resolution,
+            "from": start,
+            "to": max(start, stop),
+            "start": (bucket[first] * size).tolist(),
+            "ticks": counts.tolist(),
+            "cash": reduce(self.cash, "last").tolist(),
+            "products": {
+                pid: {name: values[j] for name, values in products.items()}
+                for j, pid in enumerate(self.product_ids)
+            },
+            "components": {
+                str(cid): {name: values[j] for name, values in components.items()}
+                for j, cid in enumerate(self.component_ids)
+            },
+        }
@@ -0,0 +1,256 @@
+"""
+Append-only binary journal of a game, with checkpointed replay.
+
+A journal file holds a short header followed by length-prefixed records:
+
+  GAME        a new game started with this seed (everything before it is
+              an earlier game in the same session)
+  ACTION      one applied Command, stamped with the game_day it ran on
+  CHECKPOINT  the full GameState as a one-game engine.savefile image,
+              written right before the tick of every
+              CHECKPOINT_INTERVAL-th day
+
+The engine is deterministic given the seed and the action sequence, so
+any past day can be rebuilt: load the nearest checkpoint at or before it,
+then tick forward, applying journaled actions on the days they ran.
+(fast_forward runs the same ticks as run_tick, so replay simply ticks
+through it.)
+Restoring a late day replays at most one checkpoint interval of ticks.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterator
+
+from engine.compiled import Config
+from engine.game_state import GameState
+from engine.actions import ACTIONS, Command, apply_command
+from engine.tick import run_tick
+from engine import config, savefile
+
+FORMAT_VERSION = 2  # 2: checkpoints use the engine.savefile layout
+CHECKPOINT_INTERVAL = config.DAYS_PER_MONTH
+
+MAGIC = b"BZJR"
+_HEADER = struct.Struct("<4sH")
+_RECORD = struct.Struct("<BII")  # kind, game_day, payload length
+
+GAME, ACTION, CHECKPOINT = 1, 2, 3
+
+_SEED = struct.Struct("<q")
+
+# ── Actions ───────────────────────────────────────────────────────────────────
+
+_PERIODS = ("month", "year")
+# Numeric Command fields in struct order; product_id trails as raw UTF-8.
+_ACTION_FIELDS = ("component_id", "price", "quantity", "max_inventory", "days", "period", "seed")
+_ACTION = struct.Struct("<BBidqqiBq")  # action, presence mask, then _ACTION_FIELDS
+
+
+def encode_action(cmd: Command) -> bytes:
+    mask = 0
+    values = []
+    for bit, name in enumerate(("product_id",) + _ACTION_FIELDS):
+        value = getattr(cmd, name)
+        if value is not None:
+            mask |= 1 << bit
+        if name == "product_id":
+            continue
+        if name == "period":
+            value = _PERIODS.index(value) if value is not None else 0
+        values.append(0 if value is None else value)
+    pid = (cmd.product_id or "").encode()
+    return _ACTION.pack(ACTIONS.index(cmd.action), mask, *values) + pid
+
+
+def decode_action(payload: bytes) -> Command:
+    action, mask, *values = _ACTION.unpack_from(payload)
+    fields = {}
+    if mask & 1:
+        fields["product_id"] = payload[_ACTION.size:].decode()
+    for bit, (name, value) in enumerate(zip(_ACTION_FIELDS, values), start=1):
+        if mask & (1 << bit):
+            fields[name] = _PERIODS[value] if name == "period" else value
+    return Command(ACTIONS[action], **fields)
+
+
+# ── Journal file ──────────────────────────────────────────────────────────────
+
+def _read_records(f: BinaryIO, offset: int) -> Iterator[tuple[int, int, bytes, int]]:
+    """Yield (kind, game_day, payload, next_offset) from offset to EOF.
+
+    A truncated trailing record (crash mid-write) ends iteration.
+    """
+    f.seek(offset)
+    while True:
+        head = f.read(_RECORD.size)
+        if len(head) < _RECORD.size:
+            return
+        kind, day, length = _RECORD.unpack(head)
+        payload = f.read(length)
+        if len(payload) < length:
+            return
+        offset += _RECORD.size + length
+        yield kind, day, payload, offset
+
+
+@dataclass
+class _GameIndex:
+    """Where the current game starts and where its checkpoints are.
+
+    Replaced wholesale on a new game; checkpoint offsets are appended
+    before days, so a concurrent reader never sees a day without one.
+    """
+    seed: int
+    offset: int                                   # just past the GAME record
+    checkpoint_days: list[int] = field(default_factory=list)
+    checkpoint_offsets: list[int] = field(default_factory=list)
+
+
+class Journal:
+    """Writer and replayer for one session's journal file.
+
+    Writes come from whoever holds the session lock; restore() only reads
+    the file and the checkpoint index, so it can run without that lock.
+    """
+
+    def __init__(self, path: str, f: BinaryIO):
+        self.path = path
+        self._f = f
+        self._end = f.seek(0, os.SEEK_END)
+        self._index: _GameIndex | None = None
+
+    @classmethod
+    def create(cls, path: str, seed: int) -> Journal:
+        """Start a new journal file (replacing any existing one)."""
+        f = open(path, "w+b")
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        journal = cls(path, f)
+        journal.start_game(seed)
+        return journal
+
+    @classmethod
+    def open(cls, path: str, readonly: bool = False) -> Journal:
+        """Reopen an existing journal for appending; rebuilds the index.
+
+        With readonly, the file is only read: a torn trailing record is
+        skipped rather than truncated, so a journal a live session is
+        still writing can be replayed safely. Do not append to it.
+        """
+        f = open(path, "rb" if readonly else "r+b")
+        magic, version = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            f.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} journal")
+        journal = cls(path, f)
+        journal._end = _HEADER.size
+        for kind, day, payload, end in _read_records(f, _HEADER.size):
+            if kind == GAME:
+                journal._index = _GameIndex(_SEED.unpack(payload)[0], end)
+            elif kind == CHECKPOINT and journal._index is not None:
+                journal._index.checkpoint_offsets.append(journal._end)
+                journal._index.checkpoint_days.append(day)
+            journal._end = end
+        if not readonly:
+            f.truncate(journal._end)  # drop any torn trailing record
+        if journal._index is None:
+            f.close()
+            raise ValueError(f"{path} records no game")
+        return journal
+
+    def close(self) -> None:
+        self._f.close()
+
+    @property
+    def seed(self) -> int:
+        return self._index.seed
+
+    @property
+    def checkpoint_days(self) -> list[int]:
+        return list(self._index.checkpoint_days)
+
+    # ── Writing ───────────────────────────────────────────────────────────
+
+    def _append(self, kind: int, day: int, payload: bytes) -> int:
+        offset = self._end
+        self._f.seek(offset)
+        self._f.write(_RECORD.pack(kind, day, len(payload)) + payload)
+        self._f.flush()
+        self._end = offset + _RECORD.size + len(payload)
+        return offset
+
+    def start_game(self, seed: int) -> None:
+        """Record that a new game began; earlier records no longer replay."""
+        self._append(GAME, 0, _SEED.pack(seed))
+        self._index = _GameIndex(seed, self._end)
+
+    def record(self, game_day: int, cmd: Command) -> None:
+        """Record a command applied on game_day (before that day's tick)."""
+        self._append(ACTION, game_day, encode_action(cmd))
+
+    def checkpoint(self, state: GameState) -> bool:
+        """Checkpoint state if one is due. Call right before run_tick.
+
+        Returns True if a checkpoint was written.
+        """
+        day = state.game_day
+        index = self._index
+        if day == 0 or day % CHECKPOINT_INTERVAL:
+            return False
+        if index.checkpoint_days and index.checkpoint_days[-1] >= day:
+            return False
+        offset = self._append(CHECKPOINT, day, savefile.dumps([state]))
+        index.checkpoint_offsets.append(offset)
+        index.checkpoint_days.append(day)
+        return True
+
+    # ── Replay ────────────────────────────────────────────────────────────
+
+    def restore(self, day: int, config: Config | None = None) -> GameState:
+        """Rebuild the current game as it stood on `day`.
+
+        The result has game_day == day and every action journaled on or
+        before that day applied, i.e. the state right before day's tick.
+        Days past the end of the recording are simulated with no further
+        actions. Replay runs under config (the current one by default);
+        the journal does not record config migrations.
+        """
+        index = self._index
+        i = bisect.bisect_right(index.checkpoint_days, day) - 1
+        with open(self.path, "rb") as f:
+            if i < 0:
+                return _replay(GameState.new_game(index.seed, config=config), f, index.offset, day)
+            f.seek(index.checkpoint_offsets[i])
+            _, _, length = _RECORD.unpack(f.read(_RECORD.size))
+            state = savefile.loads(f.read(length), config)[0]
+            return _replay(state, f, f.tell(), day)
+
+
+def _replay(state: GameState, f: BinaryIO, offset: int, day: int) -> GameState:
+    """Tick state forward to `day`, applying ACTION records from offset."""
+    for kind, rec_day, payload, _ in _read_records(f, offset):
+        if rec_day > day:
+            break
+        if kind != ACTION:
+            continue
+        while state.game_day < rec_day:
+            run_tick(state)
+        cmd = decode_action(payload)
+        if cmd.action != "fast_forward":  # its ticks are replayed by the loops here
+            apply_command(state, cmd)
+    while state.game_day < day and not state.game_over:
+        run_tick(state)
+    return state
+
+
+def replay(path: str, day: int) -> GameState:
+    """Restore `day` of the last game in the journal file at path."""
+    journal = Journal.open(path, readonly=True)
+    try:
+        return journal.restore(day)
+    finally:
+        journal.close()
@@ -0,0 +1,270 @@
+"""
+Monte Carlo strategy evaluation across processes.
+
+Runs every (strategy, seed) pair for a full game and collects one compact
+summary row per game. Jobs are spread over a ProcessPoolExecutor; each
+worker writes its rows straight into a shared-memory NumPy array, so only
+job indexes travel back through the pool. Row i always belongs to job i
+and every game is a pure function of (strategy, seed), so the output is
+identical for any worker count. Every game runs under one Config (the
+caller's current one by default), shipped to the workers with the jobs.
+
+Strategies are registered by name:
+
+    @register_strategy("hold_price", interval=30)
+    def hold_price(state):
+        return [Command("set_price", product_id="A", price=40.0)]
+
+and are called every `interval` game days with the live GameState,
+returning Commands to apply before the game continues.
+
+branch() instead starts from one live game: it forks it once per plan
+(a list of Commands, e.g. a price or an upgrade order), plays each fork
+forward and returns the same summary rows.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Iterator, Sequence
+
+import numpy as np
+
+from engine.actions import Command, apply_command
+from engine.demand import capacity_limited_revenue
+from engine.game_state import GameState
+from engine.tick import simulate_until
+from engine.compiled import Config, current_config
+from engine import config
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """A named decision function, called every `interval` days."""
+    name: str
+    decide: Callable[[GameState], list[Command]]
+    interval: int = config.DAYS_PER_MONTH
+
+
+STRATEGIES: dict[str, Strategy] = {}
+
+
+def register_strategy(name: str, interval: int = config.DAYS_PER_MONTH):
+    """Decorator adding a module-level decide(state) function to STRATEGIES.
+
+    The function must be importable by worker processes (defined at module
+    top level), since strategies are sent to workers by reference.
+    """
+    def wrap(decide: Callable[[GameState], list[Command]]):
+        STRATEGIES[name] = Strategy(name, decide, interval)
+        return decide
+    return wrap
+
+
+def summary_dtype(n_products: int) -> np.dtype:
+    """One row of run() output."""
+    return np.dtype([
+        ("job", "<i8"),
+        ("seed", "<i8"),
+        ("days", "<i8"),
+        ("cash", "<f8"),
+        ("revenue", "<f8"),
+        ("units_produced", "<i8"),
+        ("units_sold", "<i8"),
+        ("auto_purchase_spend", "<f8"),
+        ("product_revenue", "<f8", (n_products,)),
+    ])
+
+
+# ── Built-in strategies ───────────────────────────────────────────────────────
+
+@register_strategy("idle")
+def idle(state: GameState) -> list[Command]:
+    """Never act: the baseline."""
+    return []
+
+
+@register_strategy("expand")
+def expand(state: GameState) -> list[Command]:
+    """Automate supply for the cheapest-to-run product, then keep adding
+    throughput to the least-built factory whenever cash covers it twice."""
+    commands = []
+    first = next(iter(state.factories))
+    for cid, _ in state.config.bom_parts[first]:
+        if not state.components[cid].auto_purchase_unlocked:
+            commands.append(Command("unlock_auto_purchase", component_id=cid))
+    if state.factories[first].throughput_level == 0:
+        commands.append(Command("upgrade_throughput", product_id=first))
+        return commands
+
+    built = [pid for pid, f in state.factories.items() if f.throughput_level > 0]
+    pid = min(built, key=lambda p: state.factories[p].throughput_level)
+    if state.cash >= 2 * state.config.upgrade_cost(state.factories[pid].throughput_level):
+        commands.append(Command("upgrade_throughput", product_id=pid))
+    return commands
+
+
+PRICE_CANDIDATES = np.linspace(1.0, 100.0, 199)
+
+
+@register_strategy("expand_priced")
+def expand_priced(state: GameState) -> list[Command]:
+    """expand, plus a monthly price set to the revenue-maximizing candidate."""
+    commands = expand(state)
+    pids = tuple(state.products)
+    prices = np.repeat(PRICE_CANDIDATES[:, None], len(pids), axis=1)
+    grid = capacity_limited_revenue(state, prices)
+    best = PRICE_CANDIDATES[grid.revenue.argmax(axis=0)]
+    for pid, price in zip(pids, best.tolist()):
+        if state.factories[pid].throughput_level > 0 and price != state.products[pid].price:
+            commands.append(Command("set_price", product_id=pid, price=price))
+    return commands
+
+
+# ── Running games ─────────────────────────────────────────────────────────────
+
+def play(
+    strategy: Strategy, seed: int, days: int | None = None, config: Config | None = None,
+) -> tuple[GameState, dict]:
+    """Play one game to `days` (default: the full game) under config (default:
+    the current one). Returns (state, totals)."""
+    state = GameState.new_game(seed, config=config)
+    end = state.config.total_game_days if days is None else days
+    totals = {"revenue": 0.0, "units_produced": 0, "units_sold": 0, "auto_purchase_spend": 0.0}
+    product_revenue = dict.fromkeys(state.products, 0.0)
+
+    while state.game_day < end and not state.game_over:
+        for cmd in strategy.decide(state):
+            apply_command(state, cmd)
+        summary = simulate_until(state, min(end, state.game_day + strategy.interval))
+        totals["revenue"] += sum(summary.revenue.values())
+        totals["units_produced"] += sum(summary.units_produced.values())
+        totals["units_sold"] += sum(summary.units_sold.values())
+        totals["auto_purchase_spend"] += summary.auto_purchase_spend
+        for pid, value in summary.revenue.items():
+            product_revenue[pid] += value
+
+    totals["product_revenue"] = [product_revenue[pid] for pid in state.products]
+    return state, totals
+
+
+def branch(state: GameState, plans: Sequence[Sequence[Command]], ticks: int, analytic: bool = False) -> np.ndarray:
+    """Summary rows for `state` played `ticks` days on under each plan.
+
+    Each plan's commands are applied to its own fork of state, which then
+    runs with no further actions. Row i ("job" == i) belongs to plans[i];
+    "days" is the fork's final game day. state itself is not changed.
+    """
+    rows = np.zeros(len(plans), dtype=summary_dtype(len(state.products)))
+    end = state.game_day + ticks
+    for i, commands in enumerate(plans):
+        fork = state.fork()
+        for cmd in commands:
+            apply_command(fork, cmd)
+        summary = simulate_until(fork, end, analytic=analytic)
+        _fill_row(rows[i], i, state.seed, fork, {
+            "revenue": sum(summary.revenue.values()),
+            "units_produced": sum(summary.units_produced.values()),
+            "units_sold": sum(summary.units_sold.values()),
+            "auto_purchase_spend": summary.auto_purchase_spend,
+            "product_revenue": [summary.revenue.get(pid, 0.0) for pid in fork.products],
+        })
+    return rows
+
+
+def _fill_row(row, job: int, seed: int, state: GameState, totals: dict) -> None:
+    row["job"] = job
+    row["seed"] = seed
+    row["days"] = state.game_day
+    row["cash"] = state.cash
+    for key, value in totals.items():
+        row[key] = value
+
+
+def _run_chunk(shm_name: str, n_jobs: int, cfg: Config, jobs: list, days: int | None) -> list[int]:
+    """Worker entry point: play jobs, write rows into shared memory."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray((n_jobs,), dtype=summary_dtype(len(cfg.product_ids)), buffer=shm.buf)
+        for job, strategy, seed in jobs:
+            state, totals = play(strategy, seed, days, cfg)
+            _fill_row(out[job], job, seed, state, totals)
+        del out  # release the buffer before closing
+    finally:
+        shm.close()
+    return [job for job, _, _ in jobs]
+
+
+def _resolve(strategy: str | Strategy) -> Strategy:
+    return STRATEGIES[strategy] if isinstance(strategy, str) else strategy
+
+
+def make_jobs(strategies: list[str | Strategy], seeds: list[int]) -> list[tuple[int, Strategy, int]]:
+    """(job_index, strategy, seed) for every pair, strategy-major."""
+    pairs = [(_resolve(s), seed) for s in strategies for seed in seeds]
+    return [(i, strategy, seed) for i, (strategy, seed) in enumerate(pairs)]
+
+
+def iter_run(
+    strategies: list[str | Strategy],
+    seeds: list[int],
+    workers: int | None = None,
+    days: int | None = None,
+    chunk_size: int = 4,
+    config: Config | None = None,
+) -> Iterator[np.void]:
+    """Play every (strategy, seed) game, yielding summary rows as they finish.
+
+    Rows arrive in completion order; use row["job"] to place them.
+    workers=0 plays inline in this process. Games run under config
+    (default: the current one), in the workers too.
+    """
+    jobs = make_jobs(strategies, seeds)
+    cfg = config or current_config()
+    dtype = summary_dtype(len(cfg.product_ids))
+
+    if workers == 0:
+        row = np.zeros(1, dtype=dtype)
+        for job, strategy, seed in jobs:
+            state, totals = play(strategy, seed, days, cfg)
+            _fill_row(row[0], job, seed, state, totals)
+            yield row[0].copy()
+        return
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, dtype.itemsize * len(jobs)))
+    shared = np.ndarray((len(jobs),), dtype=dtype, buffer=shm.buf)
+    try:
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [
+                pool.submit(_run_chunk, shm.name, len(jobs), cfg, chunk, days)
+                for chunk in chunks
+            ]
+            for future in as_completed(futures):
+                for job in future.result():
+                    yield shared[job].copy()
+    finally:
+        del shared
+        shm.close()
+        shm.unlink()
+
+
+def run(
+    strategies: list[str | Strategy],
+    seeds: list[int],
+    workers: int | None = None,
+    days: int | None = None,
+    config: Config | None = None,
+) -> np.ndarray:
+    """Summary array with one row per (strategy, seed), strategy-major.
+
+    Row order and contents do not depend on the number of workers.
+    """
+    cfg = config or current_config()
+    results = np.zeros(len(strategies) * len(seeds), dtype=summary_dtype(len(cfg.product_ids)))
+    for row in iter_run(strategies, seeds, workers, days, config=cfg):
+        results[row["job"]] = row
+    return results
@@ -3,13 +3,20 @@ Production engine.
 
 Determines how many widgets each factory produces per tick, consuming
 components from inventory. Produces whole units only — no fractional widgets.
+
+Large catalogs are produced on a compiled BOM matrix (products ×
+components) in a few array passes rather than nested dict loops; small
+ones stay on the scalar produce() path, which is faster below the
+crossover where NumPy call overhead dominates.
 """
 
 from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from engine import config
+from functools import lru_cache
+import numpy as np
+from engine.compiled import Config, current_config
 from engine.game_state import GameState
 
 
@@ -22,35 +29,102 @@ class ProductionResult:
     limited_by: str | None = None  # None, "no_factory", or "component_{id}"
 
 
-def calculate_max_producible(state: GameState, product_id: str) -> tuple[int, str | None]:
-    """How many units can be produced given current component inventory.
+# Catalog size at which produce_all switches to the array path (measured
+# crossover is ~30 products; below it the scalar loop wins).
+VECTORIZE_MIN_PRODUCTS = 32
 
-    Returns (max_units, limiting_factor).
+
+@dataclass(frozen=True)
+class BomMatrix:
+    """BILL_OF_MATERIALS compiled to dense arrays.
+
+    Rows follow product_ids, columns follow component_ids. `units` holds the
+    base units per widget (0.0 where the component is unused) and `mask`
+    marks the components a product actually needs.
     """
-    factory = state.factories[product_id]
-    if factory.throughput_level == 0:
-        return 0, "no_factory"
+    product_ids: tuple[str, ...]
+    component_ids: tuple[int, ...]
+    units: np.ndarray  # (P, C) float
+    mask: np.ndarray   # (P, C) bool
+    columns: tuple[tuple[int, ...], ...]  # per product: used column indexes
 
-    capacity = factory.capacity
-    bom = config.BILL_OF_MATERIALS[product_id]
-    eff = factory.efficiency_multiplier
+
+def compile_bom(
+    product_ids: tuple[str, ...], component_ids: tuple[int, ...], config: Config | None = None
+) -> BomMatrix:
+    """The dense BOM for these ids under config (default: the current one)."""
+    return _compile_bom(product_ids, component_ids, config or current_config())
+
+
+@lru_cache(maxsize=32)
+def _compile_bom(product_ids: tuple[str, ...], component_ids: tuple[int, ...], config: Config) -> BomMatrix:
+    """Built once per catalog layout and Config version."""
+    units = np.zeros((len(product_ids), len(component_ids)))
+    mask = np.zeros(units.shape, dtype=bool)
+    col = {cid: j for j, cid in enumerate(component_ids)}
+    for i, pid in enumerate(product_ids):
+        for comp_id, base_units in config.bom_parts[pid]:
+            units[i, col[comp_id]] = base_units
+            mask[i, col[comp_id]] = True
+    units.flags.writeable = False
+    mask.flags.writeable = False
+    columns = tuple(tuple(np.flatnonzero(row).tolist()) for row in mask)
+    return BomMatrix(product_ids, component_ids, units, mask, columns)
+
+
+def _max_units(state: GameState, product_id: str) -> tuple[int, int | None]:
+    """Capacity/inventory ceiling for a built factory.
+
+    Returns (max_units, limiting component id or None).
+    """
+    factory = state.factories[product_id]
+    cfg = state.config
+    capacity = cfg.capacity(factory.throughput_level)
+    eff = cfg.efficiency_multiplier(factory.efficiency_level)
 
     max_units = capacity  # start with factory capacity as ceiling
     limiter = None
 
-    for comp_id, base_units in bom.items():
-        if base_units is None:
-            continue
+    for comp_id, base_units in cfg.bom_parts[product_id]:
         units_per_widget = base_units * eff
         available = state.components[comp_id].inventory
         can_make = int(available / units_per_widget) if units_per_widget > 0 else capacity
         if can_make < max_units:
             max_units = can_make
-            limiter = f"component_{comp_id}"
+            limiter = comp_id
 
     return max_units, limiter
 
 
+def calculate_max_producible(state: GameState, product_id: str) -> tuple[int, str | None]:
+    """How many units can be produced given current component inventory.
+
+    Returns (max_units, limiting_factor).
+    """
+    factory = state.factories[product_id]
+    if factory.throughput_level == 0:
+        return 0, "no_factory"
+
+    max_units, comp_id = _max_units(state, product_id)
+    return max_units, None if comp_id is None else f"component_{comp_id}"
+
+
+def _consume(state: GameState, product_id: str, units: int, consumed: dict[int, float] | None = None) -> None:
+    """Take components for `units` widgets and add them to product inventory."""
+    cfg = state.config
+    eff = cfg.efficiency_multiplier(state.factories[product_id].efficiency_level)
+
+    for comp_id, base_units in cfg.bom_parts[product_id]:
+        amount = base_units * eff * units
+        state.components[comp_id].inventory -= amount
+        state.touch("components", comp_id)
+        if consumed is not None:
+            consumed[comp_id] = amount
+
+    state.products[product_id].inventory += units
+    state.touch("products", product_id)
+
+
 def produce(state: GameState, product_id: str) -> ProductionResult:
     """Produce widgets for one product, consuming components. Mutates state."""
     factory = state.factories[product_id]
@@ -65,27 +139,123 @@ def produce(state: GameState, product_id: str) -> ProductionResult:
     if units <= 0:
         return ProductionResult(product_id, 0, {}, limiter)
 
-    # Consume components
-    bom = config.BILL_OF_MATERIALS[product_id]
-    eff = factory.efficiency_multiplier
     consumed = {}
+    _consume(state, product_id, units, consumed)
 
-    for comp_id, base_units in bom.items():
-        if base_units is None:
-            continue
-        amount = base_units * eff * units
-        state.components[comp_id].inventory -= amount
-        consumed[comp_id] = amount
+    return ProductionResult(product_id, units, consumed, limiter)
 
-    # Add to product inventory
-    state.products[product_id].inventory += units
 
-    return ProductionResult(product_id, units, consumed, limiter)
+def produce_units(state: GameState, product_id: str) -> int:
+    """Same as produce() but returns only the unit count. Mutates state.
+
+    Used by fast-forward loops that never look at the per-tick result.
+    """
+    factory = state.factories[product_id]
+    if factory.throughput_level == 0 or factory.paused:
+        return 0
+
+    units, _ = _max_units(state, product_id)
+    if units <= 0:
+        return 0
+
+    _consume(state, product_id, units)
+    return units
+
+
+def limiting_factor(state: GameState, product_id: str) -> str | None:
+    """What would hold production back on the next tick, as a label."""
+    factory = state.factories[product_id]
+    if factory.throughput_level > 0 and factory.paused:
+        return "paused"
+    return calculate_max_producible(state, product_id)[1]
 
 
 def produce_all(state: GameState) -> list[ProductionResult]:
     """Run production for all products. Mutates state."""
+    if len(state.factories) >= VECTORIZE_MIN_PRODUCTS:
+        return produce_all_vectorized(state)
+
     results = []
     for product_id in state.factories:
         results.append(produce(state, product_id))
     return results
+
+
+def produce_all_vectorized(state: GameState) -> list[ProductionResult]:
+    """Run production for all products on the compiled BOM. Mutates state.
+
+    Equivalent to calling produce() for each product in order — earlier
+    factories draw shared components first — but evaluated as whole-catalog
+    array passes. Each pass computes every product's output from the
+    inventory left by the previous pass's guesses for the products ahead
+    of it; since product p only depends on products before p, the guesses
+    settle to the sequential answer (usually on the second pass, at worst
+    after one pass per product).
+    """
+    product_ids = tuple(state.factories)
+    component_ids = tuple(state.components)
+    cfg = state.config
+    bom = compile_bom(product_ids, component_ids, cfg)
+    factories = list(state.factories.values())
+    components = list(state.components.values())
+
+    built = np.array([f.throughput_level > 0 for f in factories])
+    paused = np.array([f.paused for f in factories])
+    capacity = np.array([cfg.capacity(f.throughput_level) for f in factories])
+    eff = np.array([cfg.efficiency_multiplier(f.efficiency_level) for f in factories])
+    inventory = np.array([c.inventory for c in components])
+
+    per_widget = bom.units * eff[:, None]
+    usable = bom.mask & (per_widget > 0)
+    divisor = np.where(usable, per_widget, 1.0)
+    running = built & ~paused
+
+    units = np.zeros(len(product_ids), dtype=np.int64)
+    for _ in range(len(product_ids)):
+        # Row p = inventory left after products 0..p-1, subtracted in order
+        amounts = per_widget * units[:, None]
+        available = np.subtract.accumulate(np.vstack([inventory, amounts[:-1]]), axis=0)
+        can_make = np.where(usable, np.trunc(available / divisor), np.inf)
+        guess = np.minimum(capacity, can_make.min(axis=1)).astype(np.int64)
+        guess = np.where(running & (guess > 0), guess, 0)
+        if np.array_equal(guess, units):
+            break
+        units = guess
+
+    amounts = per_widget * units[:, None]
+    remaining = np.subtract.accumulate(np.vstack([inventory, amounts]), axis=0)[-1]
+    limiting = np.where(can_make < capacity[:, None], can_make, np.inf)
+    limiter_col = limiting.argmin(axis=1).tolist()
+    has_limiter = np.isfinite(limiting.min(axis=1)).tolist()
+
+    for comp_id, comp, level in zip(component_ids, components, remaining.tolist()):
+        if level != comp.inventory:
+            comp.inventory = level
+            state.touch("components", comp_id)
+
+    built = built.tolist()
+    paused = paused.tolist()
+    units = units.tolist()
+    amounts = amounts.tolist()
+    results = []
+    for i, product_id in enumerate(product_ids):
+        if not built[i]:
+            results.append(ProductionResult(product_id, 0, {}, "no_factory"))
+            continue
+        if paused[i]:
+            results.append(ProductionResult(product_id, 0, {}, "paused"))
+            continue
+
+        limiter = f"component_{component_ids[limiter_col[i]]}" if has_limiter[i] else None
+        n = units[i]
+        if n <= 0:
+            results.append(ProductionResult(product_id, 0, {}, limiter))
+            continue
+
+        state.products[product_id].inventory += n
+        state.touch("products", product_id)
+        row = amounts[i]
+        consumed = {component_ids[j]: row[j] for j in bom.columns[i]}
+        results.append(ProductionResult(product_id, n, consumed, limiter))
+
+    return results
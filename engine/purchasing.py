@@ -2,12 +2,14 @@
 Component purchasing engine.
 
 Manual purchases and auto-purchase (threshold-based reordering).
+
+Auto-purchase only visits the components the game's ReorderIndex says
+are due this tick, rather than scanning the whole catalog.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from engine import config
 from engine.game_state import GameState
 
 
@@ -30,16 +32,35 @@ def purchase_component(state: GameState, component_id: int, quantity: int) -> Pu
 
     state.cash -= total_cost
     comp.inventory += quantity
+    state.touch("components", component_id)
     return PurchaseResult(component_id, quantity, total_cost, True, "ok")
 
 
 def auto_purchase_all(state: GameState) -> list[PurchaseResult]:
     """Run auto-purchase for all unlocked components. Mutates state."""
     results = []
-    for comp_id, comp in state.components.items():
-        if not comp.auto_purchase_unlocked:
-            continue
-        if comp.inventory < comp.auto_purchase_max_inventory:
+    index = state.reorder_index
+    for comp_id in index.pop_due(state):
+        comp = state.components[comp_id]
+        if comp.auto_purchase_unlocked and comp.inventory < comp.auto_purchase_max_inventory:
             result = purchase_component(state, comp_id, comp.auto_purchase_quantity)
             results.append(result)
+        index.reschedule(state, comp_id)
     return results
+
+
+def auto_purchase_spend(state: GameState) -> float:
+    """auto_purchase_all without result objects. Returns cash spent. Mutates state."""
+    spent = 0.0
+    index = state.reorder_index
+    for comp_id in index.pop_due(state):
+        comp = state.components[comp_id]
+        if comp.auto_purchase_unlocked and comp.inventory < comp.auto_purchase_max_inventory:
+            total_cost = comp.price * comp.auto_purchase_quantity
+            if state.cash >= total_cost:
+                state.cash -= total_cost
+                comp.inventory += comp.auto_purchase_quantity
+                state.touch("components", comp_id)
+                spent += total_cost
+        index.reschedule(state, comp_id)
+    return spent
@@ -0,0 +1,113 @@
+"""
+Reorder-point index for auto-purchase.
+
+Instead of checking every unlocked component every tick, each game keeps
+a heap of (due_day, component) predicting the first day a component's
+stock could fall below its auto_purchase_max_inventory. Predictions
+assume every running factory consumes at full capacity, the fastest
+stock can possibly fall, so a reorder is never predicted late. A
+component is checked exactly on its due day (or on every tick while it
+sits below its reorder point), then predicted again.
+
+Predictions depend on factory levels, pauses, reorder settings and stock.
+Production and auto-purchase keep them valid on their own. Anything else
+that changes those inputs must call invalidate(). engine.upgrades and
+engine.actions already do.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine.game_state import GameState
+
+# Predictions come due this much early, relative to the stock margin,
+# so float rounding in per-tick consumption can never make them late.
+REL_MARGIN = 1e-9
+
+
+class ReorderIndex:
+    """Per-game heap of predicted reorder days for unlocked components."""
+
+    def __init__(self):
+        self._heap: list[tuple[int, int, int]] = []  # (due_day, catalog position, component_id)
+        self._due: dict[int, int] = {}                # component_id -> due_day of its live entry
+        self._rate: dict[int, float] = {}             # component_id -> max units consumed per tick
+        self._position: dict[int, int] = {}
+        self._valid = False
+        self.rebuilds = 0
+
+    def copy(self) -> ReorderIndex:
+        """Independent copy with the same predictions (for a forked game)."""
+        twin = ReorderIndex()
+        twin._heap = list(self._heap)
+        twin._due = dict(self._due)
+        twin._rate = self._rate          # replaced, never mutated, on rebuild
+        twin._position = self._position
+        twin._valid = self._valid
+        return twin
+
+    def invalidate(self, component_id: int | None = None) -> None:
+        """Re-check one component this tick, or rebuild everything (after
+        any change to factories, which moves consumption rates)."""
+        if component_id is None or not self._valid:
+            self._valid = False
+            return
+        self._push(component_id, -1)  # due on any day
+
+    def pop_due(self, state: GameState) -> list[int]:
+        """Unlocked components to check this tick, in catalog order.
+
+        Call reschedule() for each once its purchase step has run.
+        """
+        if not self._valid:
+            self._rebuild(state)
+        today = state.game_day
+        heap, due = self._heap, self._due
+        ready = []
+        while heap and heap[0][0] <= today:
+            day, position, cid = heapq.heappop(heap)
+            if due.get(cid) == day:
+                del due[cid]
+                ready.append((position, cid))
+        ready.sort()
+        return [cid for _, cid in ready]
+
+    def reschedule(self, state: GameState, component_id: int) -> None:
+        """Predict the next check from current stock (after this tick's purchase)."""
+        comp = state.components[component_id]
+        if not comp.auto_purchase_unlocked:
+            return
+        surplus = comp.inventory - comp.auto_purchase_max_inventory
+        rate = self._rate.get(component_id, 0.0)
+        if surplus < 0:
+            self._push(component_id, state.game_day + 1)
+        elif rate > 0:
+            ahead = int(surplus / (rate * (1 + REL_MARGIN)))
+            self._push(component_id, state.game_day + ahead + 1)
+        # rate 0: stock cannot fall, so no entry until invalidated
+
+    def _push(self, component_id: int, day: int) -> None:
+        self._due[component_id] = day
+        heapq.heappush(self._heap, (day, self._position.get(component_id, 0), component_id))
+
+    def _rebuild(self, state: GameState) -> None:
+        self._heap.clear()
+        self._due.clear()
+        self._position = {cid: i for i, cid in enumerate(state.components)}
+        rate = dict.fromkeys(state.components, 0.0)
+        cfg = state.config
+        for pid, factory in state.factories.items():
+            if factory.throughput_level == 0 or factory.paused:
+                continue
+            per_tick = cfg.capacity(factory.throughput_level) * cfg.efficiency_multiplier(factory.efficiency_level)
+            for cid, base in cfg.bom_parts[pid]:
+                rate[cid] += base * per_tick
+        self._rate = rate
+        for cid, comp in state.components.items():
+            if comp.auto_purchase_unlocked:
+                self._push(cid, state.game_day)  # checked on the next purchase step
+        self._valid = True
+        self.rebuilds += 1
@@ -20,12 +20,18 @@ class SaleResult:
     unmet_demand: float     # demand we couldn't fill (future: out-of-stock penalty)
 
 
-def sell(
+def sell_units(
     state: GameState,
     product_id: str,
     growth_factors: dict[str, float] | None = None,
-) -> SaleResult:
-    """Sell product into the market for one tick. Mutates state."""
+) -> tuple[int, float, float]:
+    """Sell one product for one tick. Mutates state.
+
+    Seasonality and growth come from the game's demand calendar unless
+    explicit growth_factors are passed (legacy per-year path).
+
+    Returns (units_sold, revenue, demand) without building a SaleResult.
+    """
     product = state.products[product_id]
 
     demand = calculate_demand(
@@ -34,6 +40,9 @@ def sell(
         quality=product.quality,
         game_day=state.game_day,
         growth_factors=growth_factors,
+        calendar=state.demand_calendar,
+        elasticity=state.elasticity_cache,
+        config=state.config,
     )
 
     units_sold = min(product.inventory, int(demand))
@@ -42,6 +51,23 @@ def sell(
     product.inventory -= units_sold
     state.cash += revenue
 
+    # Any sale moves inventory and cash; with none, only changed figures count
+    if units_sold or (units_sold, revenue, demand) != (product.last_sold, product.last_revenue, product.last_demand):
+        product.last_sold = units_sold
+        product.last_revenue = revenue
+        product.last_demand = demand
+        state.touch("products", product_id)
+
+    return units_sold, revenue, demand
+
+
+def sell(
+    state: GameState,
+    product_id: str,
+    growth_factors: dict[str, float] | None = None,
+) -> SaleResult:
+    """Sell product into the market for one tick. Mutates state."""
+    units_sold, revenue, demand = sell_units(state, product_id, growth_factors)
     unmet = max(0.0, demand - units_sold)
 
     return SaleResult(product_id, units_sold, revenue, demand, unmet)
@@ -0,0 +1,218 @@
+"""
+Fixed-layout binary save files for GameState.
+
+A save file is a versioned header, the product and component id tables,
+then one NumPy record per game. Every record has the same size and
+layout (see record_dtype), so a file of any number of saves can be
+memory-mapped and read column-wise without parsing individual games:
+
+    header, records = open_records("runs.bzs")
+    records["cash"].mean()                     # all games, no unpacking
+    batch = GameBatch.from_records(records, header.product_ids, header.component_ids)
+
+Field names match the GameBatch arrays. Demand calendars and the game's
+Config are not stored; loaded games bind the given Config (the current
+one by default) and rebuild their calendar from the seed.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from engine.compiled import Config
+from engine.game_state import GameState, FactoryState, ProductState, ComponentState
+from engine.demand import DemandCalendar
+
+FORMAT_VERSION = 1
+MAGIC = b"BZSV"
+ID_BYTES = 16   # product ids are stored as fixed-width UTF-8
+ALIGN = 64      # records start on a 64-byte boundary
+
+_HEADER = struct.Struct("<4sHHHQ")  # magic, version, n_products, n_components, n_records
+
+
+@lru_cache(maxsize=None)
+def record_dtype(n_products: int, n_components: int) -> np.dtype:
+    """Layout of one saved game for a catalog of the given size."""
+    p, c = (n_products,), (n_components,)
+    return np.dtype([
+        ("cash", "<f8"),
+        ("game_day", "<i8"),
+        ("seed", "<i8"),
+        ("version", "<i8"),
+        ("price", "<f8", p),
+        ("quality", "<f8", p),
+        ("inventory", "<i8", p),
+        ("last_sold", "<i8", p),
+        ("last_revenue", "<f8", p),
+        ("last_demand", "<f8", p),
+        ("throughput_level", "<i8", p),
+        ("efficiency_level", "<i8", p),
+        ("paused", "?", p),
+        ("component_price", "<f8", c),
+        ("component_inventory", "<f8", c),
+        ("auto_purchase_unlocked", "?", c),
+        ("auto_purchase_quantity", "<i8", c),
+        ("auto_purchase_max_inventory", "<i8", c),
+    ])
+
+
+@dataclass(frozen=True)
+class SaveHeader:
+    """Everything needed to interpret the records of a save file."""
+    product_ids: tuple[str, ...]
+    component_ids: tuple[int, ...]
+    n_records: int
+    data_offset: int  # byte offset of the first record
+
+    @property
+    def dtype(self) -> np.dtype:
+        return record_dtype(len(self.product_ids), len(self.component_ids))
+
+
+# ── Header ────────────────────────────────────────────────────────────────────
+
+def _header_bytes(product_ids: tuple[str, ...], component_ids: tuple[int, ...], n_records: int) -> bytes:
+    raw_ids = [pid.encode() for pid in product_ids]
+    if any(len(raw) > ID_BYTES for raw in raw_ids):
+        raise ValueError(f"product ids longer than {ID_BYTES} bytes cannot be saved")
+    head = (
+        _HEADER.pack(MAGIC, FORMAT_VERSION, len(product_ids), len(component_ids), n_records)
+        + np.array(raw_ids, dtype=f"S{ID_BYTES}").tobytes()
+        + np.array(component_ids, dtype="<i8").tobytes()
+    )
+    return head + b"\0" * (-len(head) % ALIGN)
+
+
+def parse_header(buffer) -> SaveHeader:
+    """Read the header at the start of a bytes-like buffer."""
+    magic, version, n_products, n_components, n_records = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("not a bizsim save file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"save format version {version} is not supported (expected {FORMAT_VERSION})")
+    offset = _HEADER.size
+    pids = np.frombuffer(buffer, dtype=f"S{ID_BYTES}", count=n_products, offset=offset)
+    offset += n_products * ID_BYTES
+    cids = np.frombuffer(buffer, dtype="<i8", count=n_components, offset=offset)
+    offset += n_components * 8
+    return SaveHeader(
+        product_ids=tuple(raw.decode() for raw in pids.tolist()),
+        component_ids=tuple(cids.tolist()),
+        n_records=n_records,
+        data_offset=offset + (-offset % ALIGN),
+    )
+
+
+def read_header(path: str) -> SaveHeader:
+    with open(path, "rb") as f:
+        head = f.read(_HEADER.size)
+        _, _, n_products, n_components, _ = _HEADER.unpack(head)
+        rest = f.read(n_products * ID_BYTES + n_components * 8)
+    return parse_header(head + rest)
+
+
+# ── States <-> records ────────────────────────────────────────────────────────
+
+def to_records(states: list[GameState]) -> np.ndarray:
+    """Pack states (sharing one catalog) into a structured array."""
+    first = states[0]
+    pids, cids = tuple(first.products), tuple(first.components)
+    records = np.zeros(len(states), dtype=record_dtype(len(pids), len(cids)))
+
+    records["cash"] = [s.cash for s in states]
+    records["game_day"] = [s.game_day for s in states]
+    records["seed"] = [s.seed for s in states]
+    records["version"] = [s.version for s in states]
+
+    products = [[s.products[pid] for pid in pids] for s in states]
+    factories = [[s.factories[pid] for pid in pids] for s in states]
+    for name in ("price", "quality", "inventory", "last_sold", "last_revenue", "last_demand"):
+        records[name] = [[getattr(prod, name) for prod in row] for row in products]
+    for name in ("throughput_level", "efficiency_level", "paused"):
+        records[name] = [[getattr(factory, name) for factory in row] for row in factories]
+
+    components = [[s.components[cid] for cid in cids] for s in states]
+    records["component_price"] = [[comp.price for comp in row] for row in components]
+    records["component_inventory"] = [[comp.inventory for comp in row] for row in components]
+    for name in ("auto_purchase_unlocked", "auto_purchase_quantity", "auto_purchase_max_inventory"):
+        records[name] = [[getattr(comp, name) for comp in row] for row in components]
+    return records
+
+
+def from_record(
+    record, product_ids: tuple[str, ...], component_ids: tuple[int, ...], config: Config | None = None
+) -> GameState:
+    """Unpack one record (a row of to_records / open_records) into a GameState."""
+    r = {name: record[name].tolist() for name in record.dtype.names}
+    state = GameState(cash=r["cash"], game_day=r["game_day"], seed=r["seed"])
+    if config is not None:
+        state.config = config
+    for j, pid in enumerate(product_ids):
+        state.products[pid] = ProductState(
+            price=r["price"][j],
+            quality=r["quality"][j],
+            inventory=r["inventory"][j],
+            last_sold=r["last_sold"][j],
+            last_revenue=r["last_revenue"][j],
+            last_demand=r["last_demand"][j],
+        )
+        state.factories[pid] = FactoryState(
+            throughput_level=r["throughput_level"][j],
+            efficiency_level=r["efficiency_level"][j],
+            paused=r["paused"][j],
+        )
+    for j, cid in enumerate(component_ids):
+        state.components[cid] = ComponentState(
+            price=r["component_price"][j],
+            inventory=r["component_inventory"][j],
+            auto_purchase_unlocked=r["auto_purchase_unlocked"][j],
+            auto_purchase_quantity=r["auto_purchase_quantity"][j],
+            auto_purchase_max_inventory=r["auto_purchase_max_inventory"][j],
+        )
+    state.demand_calendar = DemandCalendar.for_seed(state.seed, tuple(product_ids), state.config)
+    state.start_versions_at(r["version"])
+    return state
+
+
+# ── Bytes and files ───────────────────────────────────────────────────────────
+
+def dumps(states: list[GameState]) -> bytes:
+    records = to_records(states)
+    first = states[0]
+    return _header_bytes(tuple(first.products), tuple(first.components), len(records)) + records.tobytes()
+
+
+def loads(data: bytes, config: Config | None = None) -> list[GameState]:
+    header = parse_header(data)
+    records = np.frombuffer(data, dtype=header.dtype, count=header.n_records, offset=header.data_offset)
+    return [from_record(rec, header.product_ids, header.component_ids, config) for rec in records]
+
+
+def save(path: str, states: list[GameState]) -> None:
+    """Write states (sharing one catalog) to a new save file."""
+    with open(path, "wb") as f:
+        f.write(dumps(states))
+
+
+def load(path: str, config: Config | None = None) -> list[GameState]:
+    """Load every game in a save file as GameState objects."""
+    header, records = open_records(path)
+    return [from_record(rec, header.product_ids, header.component_ids, config) for rec in records]
+
+
+def open_records(path: str, mode: str = "r") -> tuple[SaveHeader, np.ndarray]:
+    """Memory-map the records of a save file as one structured array.
+
+    Nothing is parsed or copied up front; columns are read on access.
+    Use mode="r+" to edit saves in place.
+    """
+    header = read_header(path)
+    if header.n_records == 0:
+        return header, np.zeros(0, dtype=header.dtype)
+    records = np.memmap(path, dtype=header.dtype, mode=mode, offset=header.data_offset, shape=(header.n_records,))
+    return header, records
@@ -0,0 +1,236 @@
+"""
+Analytic fast-forward over steady stretches of a month.
+
+Within one calendar month the seasonal modifier and growth factor are
+fixed, so with prices and factory levels unchanged every tick repeats
+the same production, sales and auto-purchase arithmetic. Each tick's
+branch decisions stay the same until some threshold is crossed: a
+component running short, an auto-purchase starting or stopping, stock
+running out, or cash no longer covering a reorder.
+
+plan_segment works out how many ticks from now all of those decisions
+stay fixed, and apply_segment advances the whole span in closed form:
+
+    seg = plan_segment(state, max_ticks=day - state.game_day)
+    if seg.ticks >= MIN_SEGMENT_TICKS:
+        apply_segment(state, seg)
+    else:
+        run_tick(state)  # a boundary tick: step it normally
+
+Every threshold is checked with a relative safety margin (REL_TOL), so a
+segment never covers a tick whose decision could go either way; that tick
+is left to run_tick. Integer fields (units, inventories, days) come out
+exactly as day-by-day ticking would leave them. Cash and component
+inventories are summed as k × per-tick delta rather than k additions, so
+they agree to within floating-point rounding.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from engine.demand import calculate_demand
+from engine.game_state import GameState
+
+REL_TOL = 1e-9          # safety margin on float thresholds, relative to their scale
+MIN_SEGMENT_TICKS = 2   # shorter spans are cheaper as ordinary ticks
+
+
+@dataclass(frozen=True)
+class Segment:
+    """A run of identical ticks, starting at the current state.
+
+    Per-tick amounts are in state order (products, then components).
+    `event` names what ends the span: "month", "limit", "stock_<pid>",
+    "component_<id>", "reorder_<id>" or "cash".
+    """
+    ticks: int
+    event: str
+    units_produced: tuple[int, ...]
+    units_sold: tuple[int, ...]
+    demand: tuple[float, ...]
+    component_delta: tuple[float, ...]  # purchases minus consumption
+    purchased: tuple[int, ...]          # component ids auto-bought every tick
+    revenue: float                      # per tick, all products
+    spend: float                        # per tick, all auto-purchases
+
+
+def _span(a: float, b: float, limit: int) -> int:
+    """Largest k <= limit with a + b*t >= 0 for every t in [0, k)."""
+    if a < 0:
+        return 0
+    if b >= 0:
+        return limit
+    return min(limit, int(a // -b) + 1)
+
+
+def plan_segment(
+    state: GameState,
+    max_ticks: int,
+    growth_factors: dict[str, float] | None = None,
+) -> Segment:
+    """How many of the next ticks (at most max_ticks) repeat exactly.
+
+    Does not mutate state. A result with ticks < MIN_SEGMENT_TICKS means
+    the next tick is a boundary and should be run normally.
+    """
+    cfg = state.config
+    limit = min(max_ticks, cfg.days_per_month - state.game_day % cfg.days_per_month)
+    event = "month" if limit < max_ticks else "limit"
+    best = [limit, event]
+
+    def bound(k: int, reason: str) -> None:
+        if k < best[0]:
+            best[0], best[1] = k, reason
+
+    product_ids = list(state.products)
+    component_ids = list(state.components)
+    inventory = {cid: comp.inventory for cid, comp in state.components.items()}
+
+    # ── Production (replayed once for this tick) ──────────────────────────
+    units_produced = []
+    uses: dict[int, list[float]] = {cid: [] for cid in component_ids}  # per-widget usage of producers
+    starved: list[tuple[int, float]] = []  # (component, per-widget usage) holding a factory at zero
+    for pid in product_ids:
+        factory = state.factories[pid]
+        if factory.throughput_level == 0 or factory.paused:
+            units_produced.append(0)
+            continue
+        capacity = cfg.capacity(factory.throughput_level)
+        eff = cfg.efficiency_multiplier(factory.efficiency_level)
+        units, limiter = capacity, None
+        for cid, base in cfg.bom_parts[pid]:
+            per_widget = base * eff
+            can_make = int(inventory[cid] / per_widget) if per_widget > 0 else capacity
+            if can_make < units:
+                units, limiter = can_make, (cid, per_widget)
+        if 0 < units < capacity:
+            bound(0, f"component_{limiter[0]}")
+        elif units == 0 and limiter is not None:
+            starved.append(limiter)
+        units_produced.append(units)
+        for cid, base in cfg.bom_parts[pid]:
+            if units > 0:
+                inventory[cid] -= base * eff * units
+                uses[cid].append(base * eff)
+
+    consumed = {cid: state.components[cid].inventory - inventory[cid] for cid in component_ids}
+
+    # ── Sales (integers: exact) ───────────────────────────────────────────
+    units_sold, demand, revenue = [], [], 0.0
+    for pid, made in zip(product_ids, units_produced):
+        product = state.products[pid]
+        wanted = calculate_demand(
+            pid, product.price, product.quality, state.game_day,
+            growth_factors, state.demand_calendar, state.elasticity_cache, cfg,
+        )
+        want = int(wanted)
+        stock = product.inventory + made
+        if stock >= want:
+            sold = want
+            bound(_span(stock - want, made - want, limit), f"stock_{pid}")  # stays demand-bound
+        else:
+            sold = stock
+            if product.inventory > 0:
+                bound(0, f"stock_{pid}")  # sells out this tick; supply-bound afterwards
+        units_sold.append(sold)
+        demand.append(wanted)
+        revenue += sold * product.price
+
+    # ── Auto-purchase ─────────────────────────────────────────────────────
+    cash = state.cash + revenue
+    purchased, spend = [], 0.0
+    blocked: list[tuple[float, float]] = []  # (cash at the check, cost) of unaffordable reorders
+    for cid in component_ids:
+        comp = state.components[cid]
+        if not comp.auto_purchase_unlocked or inventory[cid] >= comp.auto_purchase_max_inventory:
+            continue
+        cost = comp.price * comp.auto_purchase_quantity
+        if cash < cost:
+            blocked.append((cash, cost))
+            continue
+        cash -= cost
+        spend += cost
+        purchased.append(cid)
+
+    delta = []
+    for cid in component_ids:
+        comp = state.components[cid]
+        bought = comp.auto_purchase_quantity if cid in purchased else 0
+        step = bought - consumed[cid]
+        delta.append(step)
+        start = comp.inventory
+        tol = REL_TOL * (1 + abs(start) + (bought + consumed[cid]) * limit)
+
+        # Every producer still gets its full capacity
+        if uses[cid]:
+            bound(_span(start - consumed[cid] - tol, step, limit), f"component_{cid}")
+        # Reorder decision (made after production) does not flip
+        if comp.auto_purchase_unlocked:
+            gap = comp.auto_purchase_max_inventory - (start - consumed[cid])
+            if gap > 0:  # wants to reorder, whether or not cash allows
+                bound(_span(gap - tol, -step, limit), f"reorder_{cid}")
+            else:
+                bound(_span(-gap - tol, step, limit), f"reorder_{cid}")
+    for cid, per_widget in starved:
+        # Factory held at zero stays there: stock must stay under one widget's worth
+        start = state.components[cid].inventory
+        step = delta[component_ids.index(cid)]
+        tol = REL_TOL * (1 + abs(start) + abs(step) * limit)
+        bound(_span(per_widget - start - tol, -step, limit), f"component_{cid}")
+
+    # Reorders that clear keep clearing (cash after the last one stays
+    # non-negative), and those cash blocks stay blocked
+    net = revenue - spend
+    tol = REL_TOL * (1 + abs(state.cash) + (revenue + spend) * limit)
+    if spend > 0:
+        bound(_span(state.cash + net - tol, net, limit), "cash")
+    for available, cost in blocked:
+        bound(_span(cost - available - tol, -net, limit), "cash")
+
+    return Segment(
+        ticks=best[0],
+        event=best[1],
+        units_produced=tuple(units_produced),
+        units_sold=tuple(units_sold),
+        demand=tuple(demand),
+        component_delta=tuple(delta),
+        purchased=tuple(purchased),
+        revenue=revenue,
+        spend=spend,
+    )
+
+
+def apply_segment(state: GameState, segment: Segment) -> None:
+    """Advance state by segment.ticks identical ticks. Mutates state."""
+    k = segment.ticks
+    for pid, made, sold, wanted in zip(
+        state.products, segment.units_produced, segment.units_sold, segment.demand
+    ):
+        product = state.products[pid]
+        product.inventory += (made - sold) * k
+        product.last_sold = sold
+        product.last_revenue = sold * product.price
+        product.last_demand = wanted
+        state.touch("products", pid)
+
+    for (cid, comp), step in zip(state.components.items(), segment.component_delta):
+        if step:
+            comp.inventory += step * k
+            state.touch("components", cid)
+
+    state.cash += (segment.revenue - segment.spend) * k
+    state.game_day += k
+    state.touch()
+
+
+def skip_ticks(state: GameState, max_ticks: int, growth_factors: dict[str, float] | None = None) -> int:
+    """Apply the steady segment ahead, if long enough. Mutates state.
+
+    Returns the ticks advanced (0 when the next tick is a boundary).
+    """
+    segment = plan_segment(state, max_ticks, growth_factors)
+    if segment.ticks < MIN_SEGMENT_TICKS:
+        return 0
+    apply_segment(state, segment)
+    return segment.ticks
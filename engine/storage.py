@@ -0,0 +1,203 @@
+"""
+Array-backed storage for GameState.
+
+The default layout keeps one small dataclass per product, factory and
+component. GameState.new_game(storage="arrays") instead stores each game's
+fields in four typed arrays (floats and ints, for products and components)
+indexed by dense ids, and exposes them through slotted views:
+
+    state.products["A"].price         # reads product_floats[...]
+    state.factories["A"].paused       # same attributes as FactoryState
+    state.components[3].inventory += 5
+
+state.products / factories / components become read-only mappings that
+build a view on access; the id -> index tables are shared by every game
+with the same catalog. Engine code works unchanged on either layout.
+
+GameArrays.fork() shares all four arrays with the copy; whichever side
+writes to a shared array first copies that array (copy-on-write), so a
+fork costs nothing per entity until it diverges.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Iterator
+
+
+# ── Layout ────────────────────────────────────────────────────────────────────
+
+# Fields per entity, in storage order. Row i of an entity occupies
+# [i * len(fields), (i + 1) * len(fields)) of its array.
+PRODUCT_FLOATS = ("price", "quality", "last_revenue", "last_demand")
+PRODUCT_INTS = ("inventory", "last_sold", "throughput_level", "efficiency_level", "paused")
+COMPONENT_FLOATS = ("price", "inventory")
+COMPONENT_INTS = ("auto_purchase_unlocked", "auto_purchase_quantity", "auto_purchase_max_inventory")
+ARRAY_NAMES = ("product_floats", "product_ints", "component_floats", "component_ints")
+
+
+@lru_cache(maxsize=None)
+def catalog_index(ids: tuple) -> dict:
+    """Shared id -> dense index table. Never mutate the result."""
+    return {key: i for i, key in enumerate(ids)}
+
+
+class GameArrays:
+    """Typed arrays holding every product, factory and component of one game."""
+
+    __slots__ = ("product_index", "component_index", "product_floats", "product_ints",
+                 "component_floats", "component_ints", "shared")
+
+    def __init__(self, product_ids: tuple[str, ...], component_ids: tuple[int, ...]):
+        self.product_index = catalog_index(product_ids)
+        self.component_index = catalog_index(component_ids)
+        p, c = len(product_ids), len(component_ids)
+        self.product_floats = array("d", bytes(8 * p * len(PRODUCT_FLOATS)))
+        self.product_ints = array("q", bytes(8 * p * len(PRODUCT_INTS)))
+        self.component_floats = array("d", bytes(8 * c * len(COMPONENT_FLOATS)))
+        self.component_ints = array("q", bytes(8 * c * len(COMPONENT_INTS)))
+        self.shared: set[str] = set()  # arrays another GameArrays may also hold
+
+    def fork(self) -> GameArrays:
+        """A copy that shares every array until one side writes to it."""
+        twin = object.__new__(GameArrays)
+        for name in self.__slots__:
+            setattr(twin, name, getattr(self, name))
+        self.shared = set(ARRAY_NAMES)
+        twin.shared = set(ARRAY_NAMES)
+        return twin
+
+    def own(self, name: str) -> None:
+        """Give this game a private copy of a shared array before writing."""
+        if name in self.shared:
+            setattr(self, name, getattr(self, name)[:])
+            self.shared.discard(name)
+
+    def nbytes(self) -> int:
+        return sum(
+            a.itemsize * len(a)
+            for a in (self.product_floats, self.product_ints, self.component_floats, self.component_ints)
+        )
+
+
+# ── Views ─────────────────────────────────────────────────────────────────────
+
+def _field(array_name: str, fields: tuple[str, ...], name: str, kind=None) -> property:
+    k = fields.index(name)
+    width = len(fields)
+
+    if kind is None:
+        def get(self):
+            return getattr(self._a, array_name)[self._i * width + k]
+    else:
+        def get(self):
+            return kind(getattr(self._a, array_name)[self._i * width + k])
+
+    def set(self, value):
+        arrays = self._a
+        if arrays.shared:
+            arrays.own(array_name)
+        getattr(arrays, array_name)[self._i * width + k] = value
+
+    return property(get, set)
+
+
+class _View:
+    __slots__ = ("_a", "_i")
+    _eq_fields: tuple[str, ...] = ()
+
+    def __init__(self, arrays: GameArrays, index: int):
+        self._a = arrays
+        self._i = index
+
+    def __eq__(self, other):
+        try:
+            return all(getattr(self, f) == getattr(other, f) for f in self._eq_fields)
+        except AttributeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self._eq_fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class ProductView(_View):
+    """Array-backed stand-in for ProductState."""
+    __slots__ = ()
+    _eq_fields = ("price", "quality", "inventory")  # last_* are display-only, as in ProductState
+
+    price = _field("product_floats", PRODUCT_FLOATS, "price")
+    quality = _field("product_floats", PRODUCT_FLOATS, "quality")
+    last_revenue = _field("product_floats", PRODUCT_FLOATS, "last_revenue")
+    last_demand = _field("product_floats", PRODUCT_FLOATS, "last_demand")
+    inventory = _field("product_ints", PRODUCT_INTS, "inventory")
+    last_sold = _field("product_ints", PRODUCT_INTS, "last_sold")
+
+
+class FactoryView(_View):
+    """Array-backed stand-in for FactoryState."""
+    __slots__ = ()
+    _eq_fields = ("throughput_level", "efficiency_level", "paused")
+
+    throughput_level = _field("product_ints", PRODUCT_INTS, "throughput_level")
+    efficiency_level = _field("product_ints", PRODUCT_INTS, "efficiency_level")
+    paused = _field("product_ints", PRODUCT_INTS, "paused", bool)
+
+
+class ComponentView(_View):
+    """Array-backed stand-in for ComponentState."""
+    __slots__ = ()
+    _eq_fields = ("price", "inventory", "auto_purchase_unlocked",
+                  "auto_purchase_quantity", "auto_purchase_max_inventory")
+
+    price = _field("component_floats", COMPONENT_FLOATS, "price")
+    inventory = _field("component_floats", COMPONENT_FLOATS, "inventory")
+    auto_purchase_unlocked = _field("component_ints", COMPONENT_INTS, "auto_purchase_unlocked", bool)
+    auto_purchase_quantity = _field("component_ints", COMPONENT_INTS, "auto_purchase_quantity")
+    auto_purchase_max_inventory = _field("component_ints", COMPONENT_INTS, "auto_purchase_max_inventory")
+
+
+class ViewMap(Mapping):
+    """Read-only id -> view mapping over a GameArrays section."""
+
+    __slots__ = ("_arrays", "_index", "_view")
+
+    def __init__(self, arrays: GameArrays, index: dict, view: type[_View]):
+        self._arrays = arrays
+        self._index = index
+        self._view = view
+
+    def __getitem__(self, key) -> _View:
+        return self._view(self._arrays, self._index[key])
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.keys() == other.keys() and all(self[k] == other[k] for k in self._index)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ViewMap({dict(self)!r})"
+
+
+def views(arrays: GameArrays) -> tuple[ViewMap, ViewMap, ViewMap]:
+    """(factories, products, components) mappings for GameState."""
+    return (
+        ViewMap(arrays, arrays.product_index, FactoryView),
+        ViewMap(arrays, arrays.product_index, ProductView),
+        ViewMap(arrays, arrays.component_index, ComponentView),
+    )
@@ -4,22 +4,45 @@ Tick orchestrator.
 Runs one game tick: production → sales → auto-purchase → advance clock.
 Pure function — no threading, no Flask. The server layer calls this
 on a timer.
+
+simulate_until runs the same phases in a tight loop for headless
+fast-forward, keeping only aggregated totals instead of per-tick results.
+With analytic=True it also jumps over steady stretches of each month in
+closed form (see engine.segments).
+
+set_phase_hook installs a callback that run_tick calls with each phase's
+wall time; with no hook installed the cost is one None check per phase.
 """
 
 from __future__ import annotations
 
 import logging
+import time
 from dataclasses import dataclass, field
+from typing import Callable
 from engine.game_state import GameState
+from engine.history import History
 
 logger = logging.getLogger("bizsim.tick")
-from engine.production import produce_all, ProductionResult
-from engine.sales import sell_all, SaleResult
-from engine.purchasing import auto_purchase_all, PurchaseResult
-from engine import config
+from engine.production import produce_all, produce_units, limiting_factor, ProductionResult
+from engine.sales import sell_all, sell_units, SaleResult
+from engine.purchasing import auto_purchase_all, auto_purchase_spend, PurchaseResult
+from engine.segments import plan_segment, apply_segment, MIN_SEGMENT_TICKS
 
 import numpy as np
 
+PhaseHook = Callable[[str, float], None]
+_phase_hook: PhaseHook | None = None
+
+
+def set_phase_hook(hook: PhaseHook | None) -> PhaseHook | None:
+    """Install hook(phase, seconds), called after each run_tick phase
+    ("production", "sales", "auto_purchase", "clock"). None disables.
+    Returns the previously installed hook."""
+    global _phase_hook
+    previous, _phase_hook = _phase_hook, hook
+    return previous
+
 
 @dataclass
 class TickResult:
@@ -32,14 +55,42 @@ class TickResult:
     total_units_sold: int = 0
 
 
+@dataclass
+class PeriodTotals:
+    """Aggregated activity for one month or year of a fast-forward."""
+    period: int  # months_elapsed (period="month") or game_year (period="year")
+    units_produced: dict[str, int] = field(default_factory=dict)
+    units_sold: dict[str, int] = field(default_factory=dict)
+    revenue: dict[str, float] = field(default_factory=dict)
+    auto_purchase_spend: float = 0.0
+
+
+@dataclass
+class FastForwardSummary:
+    """Result of simulate_until — totals only, no per-tick objects."""
+    start_day: int
+    end_day: int
+    ticks: int
+    steps: int = 0  # loop iterations: ticks, or fewer when segments were skipped
+    units_produced: dict[str, int] = field(default_factory=dict)
+    units_sold: dict[str, int] = field(default_factory=dict)
+    revenue: dict[str, float] = field(default_factory=dict)
+    auto_purchase_spend: float = 0.0
+    periods: list[PeriodTotals] = field(default_factory=list)
+    limited_by: dict[str, str | None] = field(default_factory=dict)
+    growth_factors: dict[str, float] | None = None  # in effect at end_day
+
+
 def precompute_growth_factors(state: GameState, rng: np.random.Generator) -> dict[str, float]:
     """Compute per-product growth factors for the current year.
 
-    Should be called once per year and cached, not every tick.
+    Should be called once per year and cached, not every tick. Legacy path:
+    games created by GameState.new_game read growth from their demand
+    calendar instead, and only use these when passed explicitly.
     """
     year = state.game_year
     factors = {}
-    for product_id, params in config.PRODUCT_DEMAND.items():
+    for product_id, params in state.config.product_demand.items():
         from engine.demand import growth_factor
         factors[product_id] = growth_factor(year, params, rng)
     return factors
@@ -58,20 +109,35 @@ def run_tick(
       4. Advance clock
     """
     result = TickResult(game_day=state.game_day)
+    hook = _phase_hook
+    if hook is not None:
+        t0 = time.perf_counter()
 
     # 1. Production
     result.production = produce_all(state)
+    if hook is not None:
+        t1 = time.perf_counter()
+        hook("production", t1 - t0)
 
-    # 2. Sales
+    # 2. Sales (seasonality and growth are calendar lookups inside this phase)
     result.sales = sell_all(state, growth_factors)
     result.total_revenue = sum(s.revenue for s in result.sales)
     result.total_units_sold = sum(s.units_sold for s in result.sales)
+    if hook is not None:
+        t0 = time.perf_counter()
+        hook("sales", t0 - t1)
 
     # 3. Auto-purchase
     result.auto_purchases = auto_purchase_all(state)
+    if hook is not None:
+        t1 = time.perf_counter()
+        hook("auto_purchase", t1 - t0)
 
     # 4. Advance clock
     state.game_day += 1
+    state.touch()
+    if hook is not None:
+        hook("clock", time.perf_counter() - t1)
 
     logger.debug(
         "tick day=%d produced=%d sold=%d revenue=%.2f cash=%.2f",
@@ -83,3 +149,154 @@ def run_tick(
     )
 
     return result
+
+
+def simulate_until(
+    state: GameState,
+    day: int,
+    growth_provider: Callable[[GameState], dict[str, float]] | None = None,
+    growth_factors: dict[str, float] | None = None,
+    period: str = "month",
+    analytic: bool = False,
+    history: History | None = None,
+) -> FastForwardSummary:
+    """Advance state to `day` (or game over) in a tight loop. Mutates state.
+
+    Same phase order and arithmetic as run_tick, but nothing is allocated
+    per tick — only running totals per product and per period.
+
+    Args:
+        state: Game to advance.
+        day: Stop once state.game_day reaches this day.
+        growth_provider: Called with the state whenever the game year
+                         changes; returns that year's growth factors.
+        growth_factors: Factors for the current year. If None and a
+                        provider is given, the provider is asked up front.
+        period: "month" or "year" — granularity of summary.periods.
+        analytic: Advance steady stretches in closed form. Integer totals
+                  and fields match tick-by-tick exactly; cash and component
+                  inventories agree to within float rounding.
+        history: If given, every day advanced is recorded in it, as
+                 run_tick plus History.record would.
+    """
+    if period not in ("month", "year"):
+        raise ValueError(f"unknown period {period!r}")
+
+    if growth_factors is None and growth_provider is not None:
+        growth_factors = growth_provider(state)
+
+    product_ids = list(state.products)
+    produced = [0] * len(product_ids)
+    sold = [0] * len(product_ids)
+    revenue = [0.0] * len(product_ids)
+    spend = 0.0
+
+    periods: list[PeriodTotals] = []
+    period_produced = [0] * len(product_ids)
+    period_sold = [0] * len(product_ids)
+    period_revenue = [0.0] * len(product_ids)
+    period_spend = 0.0
+    period_ticks = 0
+    # Today's flows, reused every tick, for history
+    day_produced = [0] * len(product_ids)
+    day_sold = [0] * len(product_ids)
+    day_demand = [0.0] * len(product_ids)
+
+    def period_key() -> int:
+        return state.months_elapsed if period == "month" else state.game_year
+
+    def close_period(key: int) -> None:
+        periods.append(PeriodTotals(
+            period=key,
+            units_produced=dict(zip(product_ids, period_produced)),
+            units_sold=dict(zip(product_ids, period_sold)),
+            revenue=dict(zip(product_ids, period_revenue)),
+            auto_purchase_spend=period_spend,
+        ))
+
+    start_day = state.game_day
+    current_key = period_key()
+    current_year = state.game_year
+    steps = 0
+
+    while state.game_day < day and not state.game_over:
+        steps += 1
+        segment = plan_segment(state, day - state.game_day, growth_factors) if analytic else None
+        if segment is not None and segment.ticks >= MIN_SEGMENT_TICKS:
+            k = segment.ticks
+            apply_segment(state, segment)
+            if history is not None:
+                history.record_segment(state, segment)
+            for i in range(len(product_ids)):
+                produced[i] += segment.units_produced[i] * k
+                period_produced[i] += segment.units_produced[i] * k
+                sold[i] += segment.units_sold[i] * k
+                period_sold[i] += segment.units_sold[i] * k
+                rev = segment.units_sold[i] * state.products[product_ids[i]].price * k
+                revenue[i] += rev
+                period_revenue[i] += rev
+            spend += segment.spend * k
+            period_spend += segment.spend * k
+            period_ticks += k
+        else:
+            for i, product_id in enumerate(product_ids):
+                units = produce_units(state, product_id)
+                produced[i] += units
+                period_produced[i] += units
+                day_produced[i] = units
+
+            for i, product_id in enumerate(product_ids):
+                units, rev, wanted = sell_units(state, product_id, growth_factors)
+                day_sold[i] = units
+                day_demand[i] = wanted
+                sold[i] += units
+                revenue[i] += rev
+                period_sold[i] += units
+                period_revenue[i] += rev
+
+            cost = auto_purchase_spend(state)
+            spend += cost
+            period_spend += cost
+
+            state.game_day += 1
+            state.touch()
+            period_ticks += 1
+            if history is not None:
+                history.record_day(state, state.game_day - 1, day_produced, day_sold, day_demand)
+
+        if state.game_year != current_year:
+            current_year = state.game_year
+            if growth_provider is not None:
+                growth_factors = growth_provider(state)
+
+        key = period_key()
+        if key != current_key:
+            close_period(current_key)
+            current_key = key
+            period_produced = [0] * len(product_ids)
+            period_sold = [0] * len(product_ids)
+            period_revenue = [0.0] * len(product_ids)
+            period_spend = 0.0
+            period_ticks = 0
+
+    if period_ticks:
+        close_period(current_key)
+
+    logger.debug(
+        "simulate_until day=%d->%d sold=%d revenue=%.2f cash=%.2f",
+        start_day, state.game_day, sum(sold), sum(revenue), state.cash,
+    )
+
+    return FastForwardSummary(
+        start_day=start_day,
+        end_day=state.game_day,
+        ticks=state.game_day - start_day,
+        steps=steps,
+        units_produced=dict(zip(product_ids, produced)),
+        units_sold=dict(zip(product_ids, sold)),
+        revenue=dict(zip(product_ids, revenue)),
+        auto_purchase_spend=spend,
+        periods=periods,
+        limited_by={pid: limiting_factor(state, pid) for pid in product_ids},
+        growth_factors=growth_factors,
+    )
@@ -4,25 +4,44 @@ Flask application — thin web layer over the engine.
 Handles:
   - Serving the UI
   - JSON API for AJAX polling (no more full-page refresh)
-  - Player action routes (all return JSON, no redirects)
-  - Background tick thread
+  - Player action routes (all return JSON, no redirects), applied at
+    tick boundaries through each session's action queue; /action/batch
+    applies a list of them in one go, atomically or best-effort
+  - Many concurrent games, one session per game_id
+  - Background tick scheduler (one thread for all sessions), with
+    per-game speed ("max" for flat out), pause and resume
+  - Server-Sent Events stream pushing one state update per tick
+  - Pre-serialized state snapshots served without taking the game lock
+  - Per-game binary action journals, and replay of any past day (opt in
+    by setting BIZSIM_JOURNALS to a directory)
+  - /api/history: per-day series downsampled to day, month or year
+  - Finished games' histories archived as columnar files (engine.archive)
+  - /metrics: tick phase, lock, scheduler and request timings in
+    Prometheus text format (disable with BIZSIM_METRICS=0)
+  - Hot config reload from BIZSIM_CONFIG (JSON or TOML): new games get
+    the new version, running games keep theirs until migrated
   - Action logging
+
+Every /api/state and /action/* call targets the session named by a
+`game_id` query parameter or body field, defaulting to "default".
 """
 
 from __future__ import annotations
 
+import dataclasses
 import logging
-import threading
 import time
-import numpy as np
-from flask import Flask, render_template, request, jsonify
-
-from engine.game_state import GameState
-from engine.tick import run_tick, precompute_growth_factors
-from engine.upgrades import upgrade_throughput, upgrade_efficiency, unlock_auto_purchase, calculate_upgrade_cost
-from engine.purchasing import purchase_component
-from engine.clock import format_date
+from concurrent.futures import TimeoutError as FuturesTimeout
+from flask import Flask, Response, render_template, request, jsonify, abort, g
+
+from engine.actions import ACTIONS, INT64_RANGE, parse_command, parse_batch
+from engine.compiled import current_config, reload_config
+from engine.tick import set_phase_hook
 from engine import config
+from server.sessions import SessionRegistry, TickScheduler, Session, DEFAULT_GAME_ID, MAX_SPEED
+from server.streaming import sse_frame
+from server.metrics import TickMetrics
+from server import snapshot
 
 # ── Logging ───────────────────────────────────────────────────────────────────
 import os
@@ -40,33 +59,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger("bizsim.server")
 
-app = Flask(__name__)
+JOURNAL_DIR = os.environ.get("BIZSIM_JOURNALS")  # unset: games are not journaled
+if JOURNAL_DIR:
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+ARCHIVE_DIR = os.environ.get("BIZSIM_ARCHIVE", os.path.join(LOG_DIR, "archive"))
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
 
-# ── Global game state ─────────────────────────────────────────────────────────
-game = GameState.new_game()
-rng = np.random.default_rng(42)
-growth_factors: dict[str, float] = precompute_growth_factors(game, rng)
-last_tick_result = None
-tick_lock = threading.Lock()
+METRICS_ENABLED = os.environ.get("BIZSIM_METRICS", "1") != "0"
+metrics = TickMetrics() if METRICS_ENABLED else None
+set_phase_hook(metrics.observe_phase if metrics is not None else None)
+
+# ── Config ────────────────────────────────────────────────────────────────────
+
+CONFIG_PATH = os.environ.get("BIZSIM_CONFIG")  # overrides for engine.config; re-read on reload
+if CONFIG_PATH:
+    reload_config(CONFIG_PATH)
+
+app = Flask(__name__)
 
+# ── Sessions ──────────────────────────────────────────────────────────────────
 
-def tick_loop():
-    """Background thread that runs the game simulation."""
-    global growth_factors, last_tick_result
+def publish_tick(session: Session) -> None:
+    """Publish the post-tick snapshot and fan its bytes out to stream subscribers."""
+    snap = snapshot.refresh(session)
+    if session.broadcaster.has_subscribers:
+        session.broadcaster.publish(sse_frame(snap.body, snap.version))
 
-    while True:
-        with tick_lock:
-            if game.game_over:
-                break
 
-            current_year = game.game_year
-            result = run_tick(game, growth_factors)
-            last_tick_result = result
+def add_session(game_id: str | None = None, seed: int = config.DEFAULT_SEED) -> Session:
+    """Register, snapshot and schedule a new game."""
+    session = sessions.create(game_id, seed=seed)
+    snapshot.refresh(session)
+    scheduler.schedule(session.game_id)
+    return session
 
-            if game.game_year != current_year:
-                growth_factors = precompute_growth_factors(game, rng)
 
-        time.sleep(config.TICK_SECONDS)
+sessions = SessionRegistry(journal_dir=JOURNAL_DIR or None, archive_dir=ARCHIVE_DIR)
+scheduler = TickScheduler(sessions, on_tick=publish_tick, metrics=metrics)
+add_session(DEFAULT_GAME_ID)
 
 
 # ── Helper ────────────────────────────────────────────────────────────────────
@@ -76,178 +107,306 @@ def get_data():
     return request.get_json(silent=True) or request.form
 
 
-# ── Routes ────────────────────────────────────────────────────────────────────
+def get_session() -> Session:
+    """Session named by ?game_id= or a game_id body field; 404 if unknown."""
+    game_id = request.args.get("game_id") or get_data().get("game_id") or DEFAULT_GAME_ID
+    session = sessions.get(game_id)
+    if session is None:
+        abort(404, description=f"unknown game_id {game_id!r}")
+    return session
 
-@app.route("/")
-def index():
-    return render_template("index.html")
 
+# ── Request timing ────────────────────────────────────────────────────────────
 
-@app.route("/api/state")
-def api_state():
-    """JSON snapshot of the full game state for AJAX polling."""
-    with tick_lock:
-        products = {}
-        for pid, prod in game.products.items():
-            factory = game.factories[pid]
-            products[pid] = {
-                "price": round(prod.price, 2),
-                "quality": round(prod.quality, 1),
-                "inventory": prod.inventory,
-                "throughput_level": factory.throughput_level,
-                "efficiency_level": factory.efficiency_level,
-                "capacity": factory.capacity,
-                "efficiency_multiplier": round(factory.efficiency_multiplier, 4),
-                "throughput_upgrade_cost": round(calculate_upgrade_cost(factory.throughput_level), 0),
-                "efficiency_upgrade_cost": round(calculate_upgrade_cost(factory.efficiency_level), 0),
-                "paused": factory.paused,
-            }
-
-            if last_tick_result:
-                for s in last_tick_result.sales:
-                    if s.product_id == pid:
-                        products[pid]["last_sold"] = s.units_sold
-                        products[pid]["last_revenue"] = round(s.revenue, 2)
-                        products[pid]["last_demand"] = round(s.demand, 1)
-                        break
-
-        components = {}
-        for cid, comp in game.components.items():
-            components[str(cid)] = {
-                "price": comp.price,
-                "inventory": round(comp.inventory, 1),
-                "auto_purchase_unlocked": comp.auto_purchase_unlocked,
-                "auto_purchase_quantity": comp.auto_purchase_quantity,
-                "auto_purchase_max_inventory": comp.auto_purchase_max_inventory,
-            }
-
-        bom_display = {}
-        for pid in game.products:
-            bom_display[pid] = {}
-            eff = game.factories[pid].efficiency_multiplier
-            for cid, base in config.BILL_OF_MATERIALS[pid].items():
-                if base is not None:
-                    bom_display[pid][str(cid)] = round(base * eff, 2)
-                else:
-                    bom_display[pid][str(cid)] = None
-
-        return jsonify({
-            "cash": round(game.cash, 2),
-            "game_day": game.game_day,
-            "game_date": format_date(game.game_day),
-            "game_year": game.game_year,
-            "game_month": game.game_month,
-            "game_over": game.game_over,
-            "products": products,
-            "components": components,
-            "bom": bom_display,
-            "auto_purchase_unlock_cost": config.AUTO_PURCHASE_UNLOCK_COST,
-        })
-
+if metrics is not None:
+    @app.before_request
+    def _start_timer():
+        g.request_start = time.perf_counter()
 
-# ── Player actions (all return JSON, no redirects) ───────────────────────────
+    @app.after_request
+    def _record_latency(response):
+        start = g.get("request_start")
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            metrics.requests.observe(time.perf_counter() - start, route)
+        return response
 
-@app.route("/action/upgrade_throughput", methods=["POST"])
-def action_upgrade_throughput():
-    data = get_data()
-    pid = data["product_id"]
-    with tick_lock:
-        success = upgrade_throughput(game, pid)
-    logger.info("upgrade_throughput product=%s success=%s", pid, success)
-    return jsonify({"success": success, "action": "upgrade_throughput", "product_id": pid})
 
+# ── Routes ────────────────────────────────────────────────────────────────────
 
-@app.route("/action/upgrade_efficiency", methods=["POST"])
-def action_upgrade_efficiency():
-    data = get_data()
-    pid = data["product_id"]
-    with tick_lock:
-        success = upgrade_efficiency(game, pid)
-    logger.info("upgrade_efficiency product=%s success=%s", pid, success)
-    return jsonify({"success": success, "action": "upgrade_efficiency", "product_id": pid})
+@app.route("/")
+def index():
+    return render_template("index.html")
 
 
-@app.route("/action/set_price", methods=["POST"])
-def action_set_price():
-    data = get_data()
-    pid = data["product_id"]
-    new_price = float(data["price"])
-    with tick_lock:
-        old_price = game.products[pid].price
-        game.products[pid].price = max(0.0, round(new_price, 2))
-    logger.info("set_price product=%s old=%.2f new=%.2f", pid, old_price, game.products[pid].price)
-    return jsonify({"success": True, "action": "set_price", "product_id": pid, "new_price": game.products[pid].price})
+@app.route("/api/games", methods=["GET"])
+def api_list_games():
+    return jsonify({"games": sessions.ids()})
 
 
-@app.route("/action/purchase_component", methods=["POST"])
-def action_purchase_component():
+@app.route("/api/games", methods=["POST"])
+def api_create_game():
+    """Start a new hosted game. Optional body: game_id, seed."""
     data = get_data()
-    cid = int(data["component_id"])
-    qty = int(data["quantity"])
-    with tick_lock:
-        result = purchase_component(game, cid, qty)
-    logger.info("purchase_component comp=%d qty=%d success=%s reason=%s", cid, qty, result.success, result.reason)
-    return jsonify({"success": result.success, "action": "purchase_component", "component_id": cid, "quantity": qty, "reason": result.reason})
+    try:
+        seed = int(data.get("seed", config.DEFAULT_SEED))
+        if not INT64_RANGE[0] <= seed <= INT64_RANGE[1]:
+            raise ValueError("seed is out of range")
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "reason": "invalid_seed"}), 400
+    try:
+        session = add_session(data.get("game_id"), seed=seed)
+    except KeyError:
+        return jsonify({"success": False, "reason": "game_id_taken"}), 409
+    except ValueError:
+        return jsonify({"success": False, "reason": "invalid_game_id"}), 400
+    logger.info("create_game game_id=%s seed=%d", session.game_id, seed)
+    return jsonify({"success": True, "game_id": session.game_id, "seed": seed})
+
+
+@app.route("/api/games/<game_id>", methods=["DELETE"])
+def api_delete_game(game_id):
+    removed = sessions.remove(game_id) is not None
+    logger.info("delete_game game_id=%s removed=%s", game_id, removed)
+    return jsonify({"success": removed, "game_id": game_id}), 200 if removed else 404
+
+
+def _clock(session: Session) -> dict:
+    speed = "max" if session.speed == MAX_SPEED else session.speed
+    return {"success": True, "game_id": session.game_id, "speed": speed, "paused": session.paused}
+
+
+def _game_or_404(game_id: str) -> Session:
+    session = sessions.get(game_id)
+    if session is None:
+        abort(404, description=f"unknown game_id {game_id!r}")
+    return session
+
+
+@app.route("/api/games/<game_id>/speed", methods=["POST"])
+def api_set_speed(game_id):
+    """Body: speed — game days per tick interval (e.g. 0.5, 4) or "max"."""
+    session = _game_or_404(game_id)
+    raw = get_data().get("speed")
+    try:
+        speed = MAX_SPEED if raw == "max" else float(raw)
+        scheduler.set_speed(session, speed)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "reason": "speed must be a positive number or \"max\""}), 400
+    logger.info("set_speed game_id=%s speed=%s", game_id, raw)
+    return jsonify(_clock(session))
+
+
+@app.route("/api/games/<game_id>/pause", methods=["POST"])
+def api_pause(game_id):
+    """Stop the game clock; actions still apply immediately."""
+    session = _game_or_404(game_id)
+    scheduler.pause(session)
+    logger.info("pause game_id=%s", game_id)
+    return jsonify(_clock(session))
+
+
+@app.route("/api/games/<game_id>/resume", methods=["POST"])
+def api_resume(game_id):
+    session = _game_or_404(game_id)
+    scheduler.resume(session)
+    logger.info("resume game_id=%s", game_id)
+    return jsonify(_clock(session))
+
+
+@app.route("/api/games/<game_id>/migrate", methods=["POST"])
+def api_migrate(game_id):
+    """Move a running game onto the current config version."""
+    session = _game_or_404(game_id)
+    cfg = current_config()
+    try:
+        with session.lock:
+            session.state.migrate_config(cfg)
+    except ValueError as exc:
+        return jsonify({"success": False, "reason": str(exc)}), 409
+    publish_tick(session)
+    logger.info("migrate game_id=%s config_version=%d", game_id, cfg.version)
+    return jsonify({"success": True, "game_id": game_id, "config_version": cfg.version})
+
+
+@app.route("/api/config", methods=["GET"])
+def api_config():
+    """Config version new games start on."""
+    cfg = current_config()
+    return jsonify({"version": cfg.version, "source": cfg.source})
+
+
+@app.route("/api/config/reload", methods=["POST"])
+def api_reload_config():
+    """Re-read BIZSIM_CONFIG (or the shipped defaults) into a new version.
+
+    Running games are unaffected; see /api/games/<id>/migrate.
+    """
+    try:
+        cfg = reload_config(CONFIG_PATH)
+    except ValueError as exc:
+        logger.warning("config reload failed: %s", exc)
+        return jsonify({"success": False, "reason": str(exc)}), 400
+    logger.info("reload_config version=%d source=%s", cfg.version, cfg.source)
+    return jsonify({"success": True, "version": cfg.version, "source": cfg.source})
 
 
-@app.route("/action/unlock_auto_purchase", methods=["POST"])
-def action_unlock_auto_purchase():
-    data = get_data()
-    cid = int(data["component_id"])
-    with tick_lock:
-        success = unlock_auto_purchase(game, cid)
-    logger.info("unlock_auto_purchase comp=%d success=%s", cid, success)
-    return jsonify({"success": success, "action": "unlock_auto_purchase", "component_id": cid})
+@app.route("/api/state")
+def api_state():
+    """JSON snapshot of the full game state for AJAX polling.
+
+    Served from the last published snapshot without taking the game lock.
+    Supports If-None-Match (304 when the version is unchanged) and
+    ?since=<version> for a delta holding only what changed after it.
+    """
+    snap = get_session().snapshot
+    since = request.args.get("since", type=int)
+    if request.if_none_match.contains(snap.etag):
+        response = Response(status=304)
+    elif since is not None:
+        response = jsonify(snap.delta(since))
+    else:
+        response = Response(snap.body, mimetype="application/json")
+    response.set_etag(snap.etag)
+    return response
+
+
+@app.route("/metrics")
+def api_metrics():
+    """Prometheus text exposition of tick and request timings."""
+    if metrics is None:
+        abort(404, description="metrics are disabled")
+    body = metrics.render(sessions.values())
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/api/replay")
+def api_replay():
+    """State of this game as it stood on ?day=, rebuilt from its journal."""
+    session = get_session()
+    day = request.args.get("day", type=int)
+    if day is None or day < 0:
+        return jsonify({"success": False, "reason": "day must be a non-negative integer"}), 400
+    journal = session.journal
+    if journal is None:
+        abort(404, description="this game is not journaled")
+    state = journal.restore(day, session.state.config)
+    return Response(snapshot.build_snapshot(session.game_id, state).body, mimetype="application/json")
+
+
+@app.route("/api/history")
+def api_history():
+    """Recorded series for ?from= to ?to= (game days, end exclusive;
+    default: the whole game so far) at ?resolution=day|month|year."""
+    session = get_session()
+    start = request.args.get("from", 0, type=int)
+    stop = request.args.get("to", type=int)
+    resolution = request.args.get("resolution", "day")
+    with session.lock:
+        if stop is None:
+            stop = session.state.game_day
+        try:
+            body = session.history.query(start, stop, resolution)
+        except ValueError as exc:
+            return jsonify({"success": False, "reason": str(exc)}), 400
+    return jsonify({"game_id": session.game_id, **body})
+
+
+@app.route("/api/stream")
+def api_stream():
+    """Server-Sent Events: the current state, then one update per tick."""
+    session = get_session()
+    q = session.broadcaster.subscribe()
+    snap = session.snapshot
+    first = sse_frame(snap.body, snap.version)
+    return Response(
+        session.broadcaster.stream(q, first),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@app.route("/action/toggle_pause", methods=["POST"])
-def action_toggle_pause():
+# ── Player actions (all return JSON, no redirects) ───────────────────────────
+
+ACTION_TIMEOUT = 30.0  # seconds a request may wait for its tick boundary
+
+
+def _apply_at_boundary(session: Session, cmd) -> tuple[dict, int]:
+    """Queue a Command or Batch and wait for its result.
+
+    Returns (JSON body, HTTP status): 503 on timeout and 500 if the action
+    raised while being applied. If nothing is ticking this game (scheduler
+    not started, paused, or the game has finished) the queue is drained
+    immediately instead.
+    """
+    future = session.actions.submit(cmd)
+    if not (scheduler.running and scheduler.is_scheduled(session.game_id)):
+        session.apply_queued()
+        snapshot.refresh(session)
+    try:
+        return future.result(timeout=ACTION_TIMEOUT), 200
+    except FuturesTimeout:
+        return {"success": False, "action": cmd.action, "reason": "timeout"}, 503
+    except Exception as exc:  # already logged by the drain
+        return {"success": False, "action": cmd.action, "reason": str(exc) or type(exc).__name__}, 500
+
+
+@app.route("/action/batch", methods=["POST"])
+def batch_action():
+    """Apply a list of actions in order in one lock hold, at one tick boundary.
+
+    Body: {"actions": [{"action": "set_price", "product_id": "A", "price": 9}, ...],
+           "mode": "atomic" | "best_effort"}. Atomic (the default) applies
+    all or nothing; best-effort applies what it can. Either way the
+    response has one result per action.
+    """
+    data = request.get_json(silent=True) or {}
+    session = get_session()
+    try:
+        batch = parse_batch(data, session.state)
+    except ValueError as exc:
+        return jsonify({"success": False, "action": "batch", "reason": str(exc)}), 400
+
+    result, status = _apply_at_boundary(session, batch)
+    if status != 200:
+        return jsonify(result), status
+    logger.info(
+        "batch game_id=%s mode=%s actions=%d applied=%d success=%s",
+        session.game_id, result["mode"], len(batch.commands), result["applied"], result["success"],
+    )
+    return jsonify(result)
+
+
+@app.route("/action/<action>", methods=["POST"])
+def player_action(action):
+    """Validate, queue for the next tick boundary, and wait for the result."""
+    if action not in ACTIONS:
+        abort(404, description=f"unknown action {action!r}")
     data = get_data()
-    pid = data["product_id"]
-    with tick_lock:
-        factory = game.factories[pid]
-        factory.paused = not factory.paused
-    logger.info("toggle_pause product=%s paused=%s", pid, factory.paused)
-    return jsonify({"success": True, "action": "toggle_pause", "product_id": pid, "paused": factory.paused})
+    session = get_session()
+    try:
+        cmd = parse_command(action, data, session.state)
+    except ValueError as exc:
+        return jsonify({"success": False, "action": action, "reason": str(exc)}), 400
 
+    result, status = _apply_at_boundary(session, cmd)
+    if status != 200:
+        return jsonify(result), status
 
-@app.route("/action/set_auto_purchase", methods=["POST"])
-def action_set_auto_purchase():
-    data = get_data()
-    cid = int(data["component_id"])
-    with tick_lock:
-        comp = game.components[cid]
-        if "quantity" in data and data["quantity"] is not None:
-            comp.auto_purchase_quantity = max(1, int(data["quantity"]))
-        if "max_inventory" in data and data["max_inventory"] is not None:
-            comp.auto_purchase_max_inventory = max(0, int(data["max_inventory"]))
-    logger.info("set_auto_purchase comp=%d qty=%d max_inv=%d", cid, comp.auto_purchase_quantity, comp.auto_purchase_max_inventory)
-    return jsonify({
-        "success": True,
-        "action": "set_auto_purchase",
-        "component_id": cid,
-        "auto_purchase_quantity": comp.auto_purchase_quantity,
-        "auto_purchase_max_inventory": comp.auto_purchase_max_inventory,
-    })
-
-
-@app.route("/action/new_game", methods=["POST"])
-def action_new_game():
-    global game, rng, growth_factors, last_tick_result
-    with tick_lock:
-        game = GameState.new_game()
-        rng = np.random.default_rng(42)
-        growth_factors = precompute_growth_factors(game, rng)
-        last_tick_result = None
-    logger.info("new_game started")
-    return jsonify({"success": True, "action": "new_game"})
+    if action == "new_game" and not session.paused:
+        scheduler.schedule(session.game_id)  # no-op unless it had finished
+
+    fields = " ".join(
+        f"{k}={v}" for k, v in dataclasses.asdict(cmd).items() if k != "action" and v is not None
+    )
+    logger.info("%s game_id=%s %s success=%s", action, session.game_id, fields, result.get("success"))
+    return jsonify(result)
 
 
 # ── Start ─────────────────────────────────────────────────────────────────────
 
 def start_app():
-    tick_thread = threading.Thread(target=tick_loop, daemon=True)
-    tick_thread.start()
+    scheduler.start()
     app.run(debug=False, port=5000)
 
 
@@ -0,0 +1,149 @@
+"""
+In-process metrics in Prometheus text exposition format.
+
+Fixed-bucket histograms and plain counters/gauges, cheap enough to update
+on every tick and request. TickMetrics bundles everything the server
+records (tick phases from engine.tick's phase hook, lock waits, scheduler
+sleep, tick lag and drift, request latency) and renders it for /metrics.
+Nothing here is touched unless metrics are enabled.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+
+# Seconds; 50 µs to 10 s covers a single phase through a stalled request
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _labels(pairs: dict[str, str]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Cumulative fixed-bucket histogram, optionally split by one label."""
+
+    def __init__(self, name: str, help: str, label: str | None = None, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._series: dict[str | None, list] = {}  # label value -> [counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, label_value: str | None = None) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, label_value: str | None = None) -> int:
+        series = self._series.get(label_value)
+        return series[-1] if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+        for label_value, series in sorted(snapshot.items(), key=lambda kv: kv[0] or ""):
+            base = {self.label: label_value} if self.label else {}
+            running = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series):
+                running += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels({**base, 'le': le})} {running}")
+            lines.append(f"{self.name}_sum{_labels(base)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(base)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    """Monotonic total (use Gauge for values that go down)."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}",
+                f"{self.name} {_number(self.value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class TickMetrics:
+    """Everything the server exports at /metrics."""
+
+    def __init__(self):
+        self.phase = Histogram("bizsim_tick_phase_seconds", "Time spent in each run_tick phase.", label="phase")
+        self.tick = Histogram("bizsim_tick_seconds", "Lock hold per scheduled batch of ticks, including queued actions.")
+        self.ticks = Counter("bizsim_ticks_total", "Game ticks run by the scheduler.")
+        self.lock_wait = Histogram("bizsim_tick_lock_wait_seconds", "Time the tick waited for the session lock.")
+        self.sleep = Histogram("bizsim_scheduler_sleep_seconds", "Scheduler idle waits between due ticks.")
+        self.lag = Histogram("bizsim_tick_lag_seconds", "How late each batch started relative to its due time.")
+        self.last_lag = Gauge("bizsim_tick_lag_last_seconds", "Lag of the most recent batch.")
+        self.drift = Counter(
+            "bizsim_tick_drift_seconds_total",
+            "Game time dropped because a game fell further behind than catch-up allows.",
+        )
+        self.requests = Histogram("bizsim_http_request_seconds", "HTTP request latency by route.", label="route")
+
+    # Hook signatures used by engine.tick and server.sessions
+
+    def observe_phase(self, phase: str, seconds: float) -> None:
+        self.phase.observe(seconds, phase)
+
+    def observe_tick(self, lag: float, seconds: float, ticks: int) -> None:
+        """One scheduled batch: how late it started, its lock hold, ticks run."""
+        self.lag.observe(lag)
+        self.last_lag.set(lag)
+        self.tick.observe(seconds)
+        self.ticks.inc(ticks)
+
+    def render(self, sessions=()) -> str:
+        """Exposition text; `sessions` adds per-process game gauges."""
+        lines = []
+        for metric in (self.phase, self.tick, self.ticks, self.lock_wait, self.sleep, self.lag,
+                       self.last_lag, self.drift, self.requests):
+            lines.extend(metric.render())
+
+        sessions = list(sessions)
+        hits = sum(s.state.elasticity_cache.hits for s in sessions)
+        misses = sum(s.state.elasticity_cache.misses for s in sessions)
+        lines += [
+            "# HELP bizsim_sessions Hosted games.",
+            "# TYPE bizsim_sessions gauge",
+            f"bizsim_sessions {len(sessions)}",
+            "# HELP bizsim_elasticity_cache_lookups Elasticity cache lookups summed over live games.",
+            "# TYPE bizsim_elasticity_cache_lookups gauge",
+            f'bizsim_elasticity_cache_lookups{{result="hit"}} {hits}',
+            f'bizsim_elasticity_cache_lookups{{result="miss"}} {misses}',
+        ]
+        return "\n".join(lines) + "\n"
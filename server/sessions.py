@@ -0,0 +1,432 @@
+"""
+Session registry and tick scheduler.
+
+One process hosts many games. Each session owns its GameState (which
+carries its own seed and demand calendar), a lock, the last tick's result
+and an engine.history.History of every day so far. A single scheduler
+thread keeps a min-heap of next-due times and ticks only the sessions
+that are due — no thread per game.
+
+Due times are monotonic deadlines: each game's next tick is due exactly
+interval / speed after the previous due time, however long the tick took,
+so game time does not drift. A game that falls behind runs the ticks it
+owes (up to max_catch_up) in one lock hold. Speed (including "max") and
+pause are per session and change at runtime.
+
+Player actions do not take the session lock themselves: they are queued
+as engine.actions Commands and drained by the tick, in arrival order, in
+the same lock hold as the tick itself. When the registry has a journal
+directory, every applied command and a periodic checkpoint are appended
+to the session's engine.journal file so past days can be replayed. When
+it has an archive directory, each game's history is written to the
+engine.archive there as the game ends.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable
+
+from engine.game_state import GameState
+from engine.tick import run_tick, TickResult
+from engine.actions import Command, Batch, apply_command, apply_batch, superseded
+from engine.archive import Archive
+from engine.history import History
+from engine.journal import Journal
+from engine import config
+from server.streaming import Broadcaster
+from server.metrics import TickMetrics
+
+logger = logging.getLogger("bizsim.sessions")
+
+DEFAULT_GAME_ID = "default"
+GAME_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")  # ids double as journal file names
+MAX_CATCH_UP_TICKS = 50  # ticks a lagging game may run per lock hold
+MAX_SPEED = math.inf     # speed value meaning "as fast as possible"
+
+
+class ActionQueue:
+    """FIFO of (Command or Batch, Future) pairs waiting for the next tick boundary."""
+
+    def __init__(self):
+        self._items: list[tuple[Command | Batch, Future]] = []
+        self._lock = threading.Lock()
+
+    def submit(self, cmd: Command | Batch) -> Future:
+        future: Future = Future()
+        with self._lock:
+            self._items.append((cmd, future))
+        return future
+
+    def take(self) -> list[tuple[Command | Batch, Future]]:
+        """Remove and return everything queued so far."""
+        with self._lock:
+            items, self._items = self._items, []
+        return items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+@dataclass
+class Session:
+    """One hosted game."""
+    game_id: str
+    state: GameState
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    last_tick_result: TickResult | None = None
+    broadcaster: Broadcaster = field(default_factory=Broadcaster)
+    snapshot: object | None = None  # latest server.snapshot.StateSnapshot; swapped, never mutated
+    actions: ActionQueue = field(default_factory=ActionQueue)
+    journal: Journal | None = None
+    speed: float = 1.0      # game days per TickScheduler interval; MAX_SPEED for flat out
+    paused: bool = False    # clock stopped; queued actions still apply
+    history: History | None = None  # per-day series; sized to the game on creation
+    archive: Archive | None = None  # where finished games' histories go
+    archived: bool = False  # this game's history has gone to the archive
+
+    def __post_init__(self):
+        if self.history is None:
+            self.history = History.for_state(self.state)
+
+    def tick(self, lock_timer: Callable[[float], None] | None = None) -> TickResult | None:
+        """Apply queued actions, then run one tick, in one lock hold.
+
+        Returns None (after still applying actions) if the game is over.
+        """
+        return self.last_tick_result if self.advance(1, lock_timer) else None
+
+    def advance(self, ticks: int, lock_timer: Callable[[float], None] | None = None) -> int:
+        """Apply queued actions, then run up to `ticks` ticks, in one lock hold.
+
+        Stops early at game over. Returns the number of ticks run.
+        lock_timer, if given, is called with the seconds spent waiting
+        for the lock.
+        """
+        if lock_timer is not None:
+            start = time.perf_counter()
+        with self.lock:
+            if lock_timer is not None:
+                lock_timer(time.perf_counter() - start)
+            self._apply_queued()
+            ran = 0
+            while ran < ticks and not self.state.game_over:
+                if self.journal is not None:
+                    self.journal.checkpoint(self.state)
+                self.last_tick_result = run_tick(self.state)
+                self.history.record(self.state, self.last_tick_result)
+                ran += 1
+            self._archive_if_over()
+            return ran
+
+    def _archive_if_over(self) -> None:
+        """Archive the game once, however it ended (ticks, a fast_forward or a
+        batch holding one). Caller holds the lock."""
+        if self.archive is None or self.archived or not self.state.game_over:
+            return
+        self.archived = True
+        chunk = f"{self.game_id}-{uuid.uuid4().hex[:12]}"  # game ids repeat across resets and restarts
+        try:
+            self.archive.write(
+                chunk, self.history,
+                game_id=self.game_id, seed=self.state.seed,
+                config_version=self.state.config.version, final_cash=self.state.cash,
+            )
+        except OSError:
+            logger.exception("archive failed game_id=%s", self.game_id)
+            return
+        logger.info("game archived game_id=%s chunk=%s", self.game_id, chunk)
+
+    def apply_queued(self) -> int:
+        """Apply queued actions now, without ticking. Returns how many ran."""
+        with self.lock:
+            applied = self._apply_queued()
+            self._archive_if_over()
+            return applied
+
+    def _apply_queued(self) -> int:
+        """Drain the action queue in arrival order. Caller holds the lock.
+
+        Repeated set_price calls on one product collapse to the last; the
+        earlier requests get the winning result, marked "coalesced".
+        """
+        items = self.actions.take()
+        if not items:
+            return 0
+
+        skip = superseded([cmd for cmd, _ in items])
+        results: dict[int, dict] = {}
+        for i, (cmd, future) in enumerate(items):
+            if i in skip:
+                continue
+            day = self.state.game_day
+            try:
+                if cmd.action == "new_game":
+                    self.reset(cmd.seed)
+                    result = {"success": True, "action": "new_game", "game_id": self.game_id}
+                elif cmd.action == "batch":
+                    self.state, result, applied = apply_batch(self.state, cmd, self.history)
+                    if self.journal is not None:
+                        for batch_day, batch_cmd in applied:
+                            self.journal.record(batch_day, batch_cmd)
+                else:
+                    result = apply_command(self.state, cmd, self.history)
+                    if self.journal is not None:
+                        self.journal.record(day, cmd)
+            except Exception as exc:  # report to the waiting request, keep draining
+                logger.exception("action failed game_id=%s action=%s", self.game_id, cmd.action)
+                future.set_exception(exc)
+                continue
+            results[i] = result
+            future.set_result(result)
+
+        for i, winner in skip.items():
+            if winner in results:
+                items[i][1].set_result({**results[winner], "coalesced": True})
+            else:
+                items[i][1].set_exception(RuntimeError("superseding set_price failed"))
+        return len(items) - len(skip)
+
+    def reset(self, seed: int | None = None) -> None:
+        """Start a fresh game in this session. Caller holds the lock.
+
+        Versions continue from the old game so clients' ETags and ?since=
+        values never match the new one by accident.
+        """
+        self._archive_if_over()  # a queued action may have just ended it
+        old = self.state
+        self.state = GameState.new_game(old.seed if seed is None else seed)
+        self.state.start_versions_at(old.version + 1)
+        self.last_tick_result = None
+        self.history = History.for_state(self.state)
+        self.archived = False
+        if self.journal is not None:
+            self.journal.start_game(self.state.seed)
+
+
+class SessionRegistry:
+    """Thread-safe map of game_id -> Session.
+
+    With a journal_dir, each session journals to <journal_dir>/<game_id>.journal.
+    With an archive_dir, finished games are archived there.
+    """
+
+    def __init__(self, journal_dir: str | None = None, archive_dir: str | None = None):
+        self._sessions: dict[str, Session] = {}
+        self._lock = threading.Lock()
+        self.journal_dir = journal_dir
+        self.archive = Archive(archive_dir) if archive_dir is not None else None
+
+    def create(self, game_id: str | None = None, seed: int = config.DEFAULT_SEED) -> Session:
+        """Register a new game.
+
+        Raises ValueError for a malformed game_id, KeyError if it is taken.
+        """
+        game_id = game_id or uuid.uuid4().hex
+        if not GAME_ID_PATTERN.fullmatch(game_id):
+            raise ValueError(f"invalid game_id {game_id!r}")
+        session = Session(game_id, GameState.new_game(seed), archive=self.archive)
+        with self._lock:
+            if game_id in self._sessions:
+                raise KeyError(game_id)
+            self._sessions[game_id] = session
+        if self.journal_dir is not None:
+            session.journal = Journal.create(os.path.join(self.journal_dir, f"{game_id}.journal"), seed)
+        return session
+
+    def get(self, game_id: str) -> Session | None:
+        return self._sessions.get(game_id)
+
+    def remove(self, game_id: str) -> Session | None:
+        with self._lock:
+            session = self._sessions.pop(game_id, None)
+        if session is not None and session.journal is not None:
+            with session.lock:
+                session.journal.close()
+                session.journal = None
+        return session
+
+    def ids(self) -> list[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    def values(self) -> list[Session]:
+        with self._lock:
+            return list(self._sessions.values())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class TickScheduler:
+    """Single thread that ticks every registered session on its own schedule.
+
+    Heap entries are (due_time, seq, game_id). Each game has at most one
+    live entry, recorded in _entries; rescheduling pushes a new one and
+    leaves the old one to be skipped when it reaches the top. Removed,
+    paused or finished sessions are dropped the same way.
+    """
+
+    def __init__(
+        self,
+        registry: SessionRegistry,
+        interval: float = config.TICK_SECONDS,
+        on_tick: Callable[[Session], None] | None = None,
+        metrics: TickMetrics | None = None,
+        max_catch_up: int = MAX_CATCH_UP_TICKS,
+    ):
+        self.registry = registry
+        self.interval = interval
+        self.on_tick = on_tick  # called after each batch of ticks, outside the session lock
+        self.metrics = metrics  # None: no timing at all
+        self.max_catch_up = max_catch_up
+        self._heap: list[tuple[float, int, str]] = []
+        self._entries: dict[str, int] = {}  # game_id -> seq of its live heap entry
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_scheduled(self, game_id: str) -> bool:
+        return game_id in self._entries
+
+    def period(self, session: Session) -> float:
+        """Seconds between ticks of a session at its current speed."""
+        return 0.0 if session.speed == MAX_SPEED else self.interval / session.speed
+
+    def schedule(self, game_id: str, due: float | None = None, replace: bool = False) -> None:
+        """Queue a session; first tick one interval from now by default.
+
+        No-op if the session is already queued, unless replace is set.
+        """
+        if due is None:
+            due = time.monotonic() + self.interval
+        with self._cond:
+            if game_id in self._entries and not replace:
+                return
+            self._seq += 1
+            self._entries[game_id] = self._seq
+            heapq.heappush(self._heap, (due, self._seq, game_id))
+            self._cond.notify()
+
+    def unschedule(self, game_id: str) -> None:
+        """Stop ticking a session (its heap entry is skipped when popped)."""
+        with self._cond:
+            self._entries.pop(game_id, None)
+
+    def set_speed(self, session: Session, speed: float) -> None:
+        """Change a session's speed; the next tick follows the new period."""
+        if not speed > 0:
+            raise ValueError("speed must be positive")
+        session.speed = speed
+        if not session.paused and self.is_scheduled(session.game_id):
+            self.schedule(session.game_id, time.monotonic() + self.period(session), replace=True)
+
+    def pause(self, session: Session) -> None:
+        session.paused = True
+        self.unschedule(session.game_id)
+
+    def resume(self, session: Session) -> None:
+        session.paused = False
+        self.schedule(session.game_id, time.monotonic() + self.period(session))
+
+    def run_due(self, now: float | None = None) -> int:
+        """Tick every session whose due time has passed. Returns ticks run.
+
+        Each due session gets one batch per call; sessions rescheduled
+        during the call wait for the next one, so a game at max speed
+        cannot starve the rest.
+        """
+        if now is None:
+            now = time.monotonic()
+        batch = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                due, seq, game_id = heapq.heappop(self._heap)
+                if self._entries.get(game_id) != seq:
+                    continue  # superseded or unscheduled
+                del self._entries[game_id]
+                batch.append((due, game_id))
+
+        ticked = 0
+        for due, game_id in batch:
+            session = self.registry.get(game_id)
+            if session is None:
+                continue
+            if session.paused:
+                if session.apply_queued() and self.on_tick is not None:
+                    self.on_tick(session)
+                continue
+
+            # Ticks owed since `due`, capped so one game cannot hog the thread
+            period = self.period(session)
+            owed = self.max_catch_up if period == 0 else min(self.max_catch_up, int((now - due) // period) + 1)
+            metrics = self.metrics
+            if metrics is None:
+                ran = session.advance(owed)
+            else:
+                started = time.monotonic()
+                ran = session.advance(owed, metrics.lock_wait.observe)
+                metrics.observe_tick(max(0.0, now - due), time.monotonic() - started, ran)
+            if ran == 0:
+                logger.info("game over game_id=%s", game_id)
+                continue
+            ticked += ran
+            if self.on_tick is not None:
+                self.on_tick(session)
+
+            if period == 0:
+                next_due = time.monotonic()
+            else:
+                next_due = due + ran * period
+                behind = now - next_due
+                if behind > self.max_catch_up * period:
+                    # Too far behind to catch up: drop the backlog rather than spiral
+                    logger.warning("tick backlog dropped game_id=%s seconds=%.3f", game_id, behind)
+                    if metrics is not None:
+                        metrics.drift.inc(behind)
+                    next_due = now
+            self.schedule(game_id, next_due)
+        return ticked
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                timeout = None
+                if self._heap:
+                    timeout = max(0.0, self._heap[0][0] - time.monotonic())
+                if timeout is None or timeout > 0:
+                    if self.metrics is None:
+                        self._cond.wait(timeout)
+                    else:
+                        start = time.monotonic()
+                        self._cond.wait(timeout)
+                        self.metrics.sleep.observe(time.monotonic() - start)
+                    continue
+            self.run_due()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="tick-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,163 @@
+"""
+Pre-serialized state snapshots.
+
+After every tick or player action the server builds an immutable
+StateSnapshot — payload sections plus the already-encoded JSON body — and
+publishes it on the session with a single reference assignment. Readers
+(/api/state, the SSE stream) use whatever snapshot is current without
+touching the session lock, so polling can never hold up the tick thread.
+
+Product and component sections whose version has not moved since the
+previous snapshot are reused rather than rebuilt.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+
+from engine.game_state import GameState
+from engine.clock import format_date
+
+_publish_lock = threading.Lock()  # orders concurrent publishers; readers never take it
+
+
+def product_payload(game: GameState, pid: str) -> dict:
+    prod = game.products[pid]
+    factory = game.factories[pid]
+    cfg = game.config
+    return {
+        "price": round(prod.price, 2),
+        "quality": round(prod.quality, 1),
+        "inventory": prod.inventory,
+        "throughput_level": factory.throughput_level,
+        "efficiency_level": factory.efficiency_level,
+        "capacity": cfg.capacity(factory.throughput_level),
+        "efficiency_multiplier": round(cfg.efficiency_multiplier(factory.efficiency_level), 4),
+        "throughput_upgrade_cost": round(cfg.upgrade_cost(factory.throughput_level), 0),
+        "efficiency_upgrade_cost": round(cfg.upgrade_cost(factory.efficiency_level), 0),
+        "paused": factory.paused,
+        "last_sold": prod.last_sold,
+        "last_revenue": round(prod.last_revenue, 2),
+        "last_demand": round(prod.last_demand, 1),
+    }
+
+
+def component_payload(game: GameState, cid: int) -> dict:
+    comp = game.components[cid]
+    return {
+        "price": comp.price,
+        "inventory": round(comp.inventory, 1),
+        "auto_purchase_unlocked": comp.auto_purchase_unlocked,
+        "auto_purchase_quantity": comp.auto_purchase_quantity,
+        "auto_purchase_max_inventory": comp.auto_purchase_max_inventory,
+    }
+
+
+def bom_payload(game: GameState, pid: str) -> dict:
+    eff = game.config.efficiency_multiplier(game.factories[pid].efficiency_level)
+    return {
+        str(cid): round(base * eff, 2) if base is not None else None
+        for cid, base in game.config.bill_of_materials[pid].items()
+    }
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """One published view of a game. Never mutated after construction."""
+    version: int
+    header: dict                      # top-level scalar fields
+    products: dict[str, dict]
+    components: dict[str, dict]       # keyed by str(component_id)
+    bom: dict[str, dict]
+    product_versions: dict[str, int]
+    component_versions: dict[str, int]
+    body: bytes                       # full payload, JSON-encoded once
+
+    @property
+    def etag(self) -> str:
+        return str(self.version)
+
+    def delta(self, since: int) -> dict:
+        """Payload with only products/components changed after `since`."""
+        pids = [pid for pid, v in self.product_versions.items() if v > since]
+        cids = [cid for cid, v in self.component_versions.items() if v > since]
+        return {
+            **self.header,
+            "products": {pid: self.products[pid] for pid in pids},
+            "components": {cid: self.components[cid] for cid in cids},
+            "bom": {pid: self.bom[pid] for pid in pids},
+            "delta": True,
+            "since": since,
+        }
+
+
+def build_snapshot(game_id: str, game: GameState, previous: StateSnapshot | None = None) -> StateSnapshot:
+    """Snapshot `game`, reusing unchanged sections from `previous`.
+
+    Reads the game, so the caller must hold the session lock; refresh()
+    splits this into a locked collection step and an unlocked encode.
+    """
+    return _encode(*_collect(game_id, game, previous))
+
+
+def _collect(game_id: str, game: GameState, previous: StateSnapshot | None) -> tuple:
+    products, bom, product_versions = {}, {}, {}
+    for pid in game.products:
+        v = game.section_version("products", pid)
+        product_versions[pid] = v
+        if previous is not None and previous.product_versions.get(pid) == v:
+            products[pid] = previous.products[pid]
+            bom[pid] = previous.bom[pid]
+        else:
+            products[pid] = product_payload(game, pid)
+            bom[pid] = bom_payload(game, pid)
+
+    components, component_versions = {}, {}
+    for cid in game.components:
+        key = str(cid)
+        v = game.section_version("components", cid)
+        component_versions[key] = v
+        if previous is not None and previous.component_versions.get(key) == v:
+            components[key] = previous.components[key]
+        else:
+            components[key] = component_payload(game, cid)
+
+    header = {
+        "game_id": game_id,
+        "version": game.version,
+        "cash": round(game.cash, 2),
+        "game_day": game.game_day,
+        "game_date": format_date(game.game_day, game.config),
+        "game_year": game.game_year,
+        "game_month": game.game_month,
+        "game_over": game.game_over,
+        "auto_purchase_unlock_cost": game.config.auto_purchase_unlock_cost,
+        "config_version": game.config.version,
+        "elasticity_cache": game.elasticity_cache.stats(),
+    }
+    return game.version, header, products, components, bom, product_versions, component_versions
+
+
+def _encode(version, header, products, components, bom, product_versions, component_versions) -> StateSnapshot:
+    payload = {**header, "products": products, "components": components, "bom": bom}
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    return StateSnapshot(version, header, products, components, bom, product_versions, component_versions, body)
+
+
+def refresh(session) -> StateSnapshot:
+    """Rebuild and publish session.snapshot. Call without holding the lock.
+
+    Only the collection step runs under the session lock; JSON encoding and
+    the reference swap happen outside it. A snapshot older than the one
+    already published is discarded.
+    """
+    with session.lock:
+        parts = _collect(session.game_id, session.state, session.snapshot)
+    snap = _encode(*parts)
+    with _publish_lock:
+        current = session.snapshot
+        if current is None or snap.version >= current.version:
+            session.snapshot = snap
+        return session.snapshot
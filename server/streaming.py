@@ -0,0 +1,84 @@
+"""
+Push-based state streaming (Server-Sent Events).
+
+After each tick the scheduler serializes a session's state once and hands
+the encoded frame to its Broadcaster, which fans the same bytes out to
+every subscriber queue. Per-client cost is a queue put and a socket write;
+nobody walks the game state or takes the session lock on a client's behalf.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+from typing import Iterator
+
+# Frames buffered per subscriber before the oldest are dropped. A slow
+# client only ever needs the latest state, so there is no point queueing more.
+SUBSCRIBER_BUFFER = 4
+KEEPALIVE_SECONDS = 15.0
+
+
+def encode_event(payload: dict, event_id: int | None = None) -> bytes:
+    """One SSE frame carrying payload as compact JSON."""
+    return sse_frame(json.dumps(payload, separators=(",", ":")).encode(), event_id)
+
+
+def sse_frame(data: bytes, event_id: int | None = None) -> bytes:
+    """One SSE frame around an already-encoded (single-line) JSON body."""
+    head = b"id: %d\n" % event_id if event_id is not None else b""
+    return head + b"data: " + data + b"\n\n"
+
+
+class Broadcaster:
+    """Fan-out of pre-encoded frames to any number of subscriber queues."""
+
+    def __init__(self):
+        self._subscribers: set[queue.Queue] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> queue.Queue:
+        q: queue.Queue = queue.Queue(maxsize=SUBSCRIBER_BUFFER)
+        with self._lock:
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def publish(self, frame: bytes) -> None:
+        """Deliver frame to every subscriber, dropping their oldest if full."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            while True:
+                try:
+                    q.put_nowait(frame)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def stream(self, q: queue.Queue, first: bytes | None = None) -> Iterator[bytes]:
+        """Generator for an SSE response body; unsubscribes when closed."""
+        try:
+            if first is not None:
+                yield first
+            while True:
+                try:
+                    yield q.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield b": keep-alive\n\n"
+        finally:
+            self.unsubscribe(q)
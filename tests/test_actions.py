@@ -0,0 +1,217 @@
+"""Tests for player commands and the tick-boundary action queue."""
+
+import pytest
+
+from engine.actions import (
+    Command, Batch, parse_command, parse_batch, superseded, apply_command, apply_batch,
+)
+from engine.game_state import GameState
+from engine.journal import decode_action, encode_action
+from server.sessions import SessionRegistry
+
+
+def test_parse_rejects_bad_input():
+    state = GameState.new_game()
+    for action, data in (
+        ("set_price", {"product_id": "A", "price": "cheap"}),
+        ("set_price", {"product_id": "Z", "price": 5}),
+        ("purchase_component", {"component_id": 99, "quantity": 1}),
+        ("purchase_component", {"component_id": 1, "quantity": -1}),
+        ("fast_forward", {"period": "week"}),
+        ("launch_rocket", {}),
+    ):
+        with pytest.raises(ValueError):
+            parse_command(action, data, state)
+
+
+def test_only_repeated_price_changes_coalesce():
+    cmds = [
+        Command("set_price", product_id="A", price=1.0),
+        Command("toggle_pause", product_id="A"),
+        Command("set_price", product_id="B", price=2.0),
+        Command("set_price", product_id="A", price=3.0),
+        Command("toggle_pause", product_id="A"),
+    ]
+    assert superseded(cmds) == {0: 3}
+
+
+def test_price_changes_do_not_coalesce_across_fast_forward():
+    cmds = [
+        Command("set_price", product_id="A", price=1.0),
+        Command("fast_forward", days=30, period="month"),
+        Command("set_price", product_id="A", price=50.0),
+        Command("set_price", product_id="A", price=60.0),
+    ]
+    assert superseded(cmds) == {2: 3}
+
+    session = SessionRegistry().create("ff")
+    session.state.products["A"].inventory = 10_000
+    futures = [session.actions.submit(cmd) for cmd in cmds]
+    session.apply_queued()
+
+    direct = GameState.new_game()
+    direct.products["A"].inventory = 10_000
+    for cmd in cmds:
+        apply_command(direct, cmd)
+    assert session.state.cash == direct.cash
+    assert futures[0].result()["new_price"] == 1.0 and "coalesced" not in futures[0].result()
+    assert futures[2].result() == {**futures[3].result(), "coalesced": True}
+
+
+def test_apply_matches_direct_mutation():
+    state = GameState.new_game()
+    result = apply_command(state, parse_command("set_price", {"product_id": "A", "price": "12.345"}, state))
+    assert result["success"] and result["new_price"] == 12.35
+    assert state.products["A"].price == 12.35
+
+
+def test_tick_drains_queue_before_running():
+    session = SessionRegistry().create("q")
+    first = session.actions.submit(Command("set_price", product_id="A", price=5.0))
+    pause = session.actions.submit(Command("toggle_pause", product_id="A"))
+    last = session.actions.submit(Command("set_price", product_id="A", price=7.0))
+    assert not first.done()
+
+    session.tick()
+
+    assert session.state.game_day == 1
+    assert session.state.products["A"].price == 7.0
+    assert pause.result()["paused"] is True
+    assert last.result()["new_price"] == 7.0
+    assert first.result() == {**last.result(), "coalesced": True}
+    assert len(session.actions) == 0
+
+
+def test_new_game_through_queue_keeps_versions_increasing():
+    session = SessionRegistry().create("q")
+    session.tick()
+    version = session.state.version
+    done = session.actions.submit(Command("new_game", seed=9))
+    session.apply_queued()
+    assert done.result()["success"]
+    assert session.state.game_day == 0 and session.state.seed == 9
+    assert session.state.version > version
+
+
+def test_invalid_action_returns_400():
+    from server.app import app
+
+    client = app.test_client()
+    response = client.post("/action/set_price", json={"product_id": "A", "price": "x"})
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+    assert client.post("/action/launch_rocket", json={}).status_code == 404
+
+
+def test_integers_wider_than_the_journal_are_rejected():
+    from server.app import app
+
+    state = GameState.new_game()
+    for action, data in (
+        ("set_auto_purchase", {"component_id": 1, "quantity": 10 ** 19}),
+        ("set_auto_purchase", {"component_id": 1, "max_inventory": -10 ** 19}),
+        ("fast_forward", {"days": 2 ** 31}),
+        ("new_game", {"seed": 10 ** 19}),
+    ):
+        with pytest.raises(ValueError):
+            parse_command(action, data, state)
+
+    widest = parse_command("set_auto_purchase", {"component_id": 1, "quantity": 2 ** 63 - 1}, state)
+    assert decode_action(encode_action(widest)) == widest
+
+    client = app.test_client()
+    before = client.get("/api/state").get_json()["components"]["1"]
+    response = client.post("/action/set_auto_purchase", json={"component_id": 1, "quantity": 10 ** 19})
+    assert response.status_code == 400
+    assert client.get("/api/state").get_json()["components"]["1"] == before
+    assert client.post("/api/games", json={"seed": 10 ** 19}).status_code == 400
+
+
+def test_parse_batch_names_the_bad_entry():
+    state = GameState.new_game()
+    good = {"action": "set_price", "product_id": "A", "price": 4}
+    with pytest.raises(ValueError, match=r"actions\[1\]"):
+        parse_batch({"actions": [good, {"action": "set_price", "product_id": "Z", "price": 1}]}, state)
+    with pytest.raises(ValueError, match="cannot be batched"):
+        parse_batch({"actions": [{"action": "new_game"}]}, state)
+    with pytest.raises(ValueError):
+        parse_batch({"actions": [good], "mode": "yolo"}, state)
+    batch = parse_batch({"actions": [good], "mode": "best_effort"}, state)
+    assert batch == Batch((Command("set_price", product_id="A", price=4.0),), atomic=False)
+
+
+def test_atomic_batch_rolls_back_on_failure():
+    state = GameState.new_game()
+    state.cash = 600.0
+    batch = Batch((
+        Command("set_price", product_id="A", price=9.0),
+        Command("purchase_component", component_id=1, quantity=500),
+        Command("purchase_component", component_id=2, quantity=500),  # cannot afford
+        Command("toggle_pause", product_id="A"),
+    ))
+    before = state.fork()
+    kept, result, applied = apply_batch(state, batch)
+    assert kept == before and kept.cash == 600.0
+    assert result["success"] is False and result["failed_index"] == 2 and result["applied"] == 0
+    assert [r["success"] for r in result["results"]] == [True, True, False, False]
+    assert result["results"][3]["reason"] == "not_applied"
+    assert applied == []
+
+
+def test_best_effort_batch_keeps_going():
+    state = GameState.new_game()
+    state.cash = 600.0
+    batch = Batch((
+        Command("purchase_component", component_id=1, quantity=500),
+        Command("purchase_component", component_id=2, quantity=500),
+        Command("set_price", product_id="A", price=9.0),
+    ), atomic=False)
+    kept, result, applied = apply_batch(state, batch)
+    assert kept is state
+    assert state.cash == 100.0 and state.products["A"].price == 9.0
+    assert result["applied"] == 2 and not result["success"]
+    assert [cmd for _, cmd in applied] == list(batch.commands)  # failures are journaled too
+
+
+def test_batch_route_applies_in_one_request():
+    from server.app import app, sessions
+
+    client = app.test_client()
+    game_id = client.post("/api/games").get_json()["game_id"]
+    try:
+        body = {"game_id": game_id, "actions": [
+            {"action": "set_price", "product_id": "A", "price": 11},
+            {"action": "upgrade_throughput", "product_id": "A"},
+            {"action": "purchase_component", "component_id": 3, "quantity": 100},
+        ]}
+        result = client.post("/action/batch", json=body).get_json()
+        assert result["success"] and result["applied"] == 3
+        state = sessions.get(game_id).state
+        assert state.products["A"].price == 11 and state.factories["A"].throughput_level == 1
+
+        body["actions"].append({"action": "purchase_component", "component_id": 1, "quantity": 10 ** 9})
+        result = client.post("/action/batch", json=body).get_json()
+        assert result["rolled_back"] and sessions.get(game_id).state.factories["A"].throughput_level == 1
+
+        bad = client.post("/action/batch", json={"game_id": game_id, "actions": []})
+        assert bad.status_code == 400
+    finally:
+        sessions.remove(game_id)
+
+
+def test_action_that_raises_returns_json_500(monkeypatch):
+    import server.sessions
+    from server.app import app, sessions
+
+    def boom(state, cmd, history=None):
+        raise RuntimeError("engine exploded")
+
+    monkeypatch.setattr(server.sessions, "apply_command", boom)
+    client = app.test_client()
+    game_id = client.post("/api/games").get_json()["game_id"]
+    try:
+        response = client.post("/action/set_price", json={"game_id": game_id, "product_id": "A", "price": 3})
+        assert response.status_code == 500
+        assert response.get_json() == {"success": False, "action": "set_price", "reason": "engine exploded"}
+    finally:
+        sessions.remove(game_id)
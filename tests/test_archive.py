@@ -0,0 +1,95 @@
+"""Tests for the columnar archive of finished games."""
+
+import numpy as np
+import pytest
+
+from engine.actions import Command
+from engine.archive import Archive
+from engine.compiled import compile_config, use_config
+from engine.game_state import GameState
+from engine.history import History
+from engine.tick import run_tick
+from server.sessions import SessionRegistry
+
+
+def _played(seed: int, level: int, ticks: int = 120) -> History:
+    state = GameState.new_game(seed)
+    state.factories["D"].throughput_level = level
+    for comp in state.components.values():
+        comp.inventory = 50_000.0
+    history = History.for_state(state)
+    for _ in range(ticks):
+        history.record(state, run_tick(state))
+    return history
+
+
+def test_at_day_answers_cross_game_questions(tmp_path):
+    archive = Archive(str(tmp_path))
+    histories = {}
+    for seed, level in [(1, 0), (2, 2), (3, 3), (4, 2)]:
+        chunk = f"g{seed}"
+        histories[chunk] = _played(seed, level)
+        archive.write(chunk, histories[chunk], seed=seed)
+
+    rows = archive.at_day(["cash", "throughput.D"], day=99)
+    assert rows["chunk"].tolist() == ["g1", "g2", "g3", "g4"]
+    expected = [h.cash[99] for chunk, h in histories.items() if h.throughput[99, 3] >= 2]
+    assert np.median(rows["cash"][rows["throughput.D"] >= 2]) == np.median(expected)
+
+    assert len(archive.at_day(["cash"], day=500)) == 0  # no game got that far
+    assert archive.at_day(["cash"], day=99, where={"seed": 3})["chunk"].tolist() == ["g3"]
+
+
+def test_read_maps_only_requested_days(tmp_path):
+    archive = Archive(str(tmp_path))
+    history = _played(5, 1, ticks=60)
+    entry = archive.write("g", history, seed=5)
+    assert entry["days"] == 60 and "sold.A" in entry["columns"]
+
+    out = archive.read("g", ["sold.A"], 10, 20)
+    assert isinstance(out["sold.A"], np.memmap)
+    assert out["day"].tolist() == list(range(10, 20))
+    assert out["sold.A"].tolist() == history.sold[10:20, 0].tolist()
+    assert [chunk for chunk, _ in archive.scan(["cash"])] == ["g"]
+
+    with pytest.raises(KeyError):
+        archive.write("g", history)
+
+
+def test_session_archives_history_at_game_over(tmp_path):
+    with use_config(compile_config({"GAME_YEARS": 1})):
+        registry = SessionRegistry(archive_dir=str(tmp_path))
+        session = registry.create("short", seed=9)
+    session.advance(1000)
+    assert session.state.game_over
+
+    [entry] = registry.archive.index()
+    assert entry["game_id"] == "short" and entry["seed"] == 9
+    assert entry["days"] == 360 and entry["last_day"] == 359
+    assert registry.archive.column(entry["chunk"], "cash")[-1] == session.state.cash
+
+    session.advance(1)  # already over: nothing new archived
+    assert len(registry.archive.index()) == 1
+
+
+def test_game_ended_by_fast_forward_is_archived_once(tmp_path):
+    with use_config(compile_config({"GAME_YEARS": 1})):
+        registry = SessionRegistry(archive_dir=str(tmp_path))
+        session = registry.create("ff")
+    session.advance(10)
+    session.actions.submit(Command("fast_forward", days=None, period="month"))
+    assert session.advance(5) == 0 and session.state.game_over
+
+    [entry] = registry.archive.index()
+    assert entry["game_id"] == "ff" and entry["days"] == 360 and entry["last_day"] == 359
+    assert registry.archive.column(entry["chunk"], "cash")[-1] == session.state.cash
+    session.apply_queued()
+    session.advance(1)
+    assert len(registry.archive.index()) == 1
+
+    session.actions.submit(Command("new_game", seed=3))
+    session.actions.submit(Command("fast_forward", days=None, period="month"))
+    session.actions.submit(Command("new_game", seed=4))
+    session.apply_queued()  # the seed-3 game ends and is replaced in one drain
+    assert [e["seed"] for e in registry.archive.index()] == [entry["seed"], 3]
+    assert session.state.seed == 4 and not session.archived
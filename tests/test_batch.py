@@ -0,0 +1,80 @@
+"""Tests for the vectorized batch simulator."""
+
+import numpy as np
+from engine.batch import GameBatch
+from engine.game_state import GameState
+from engine.tick import run_tick
+
+
+def _varied_states(n: int) -> list[GameState]:
+    """Games with different factories, prices and auto-purchase settings."""
+    rng = np.random.default_rng(7)
+    states = []
+    for _ in range(n):
+        state = GameState.new_game()
+        for pid in state.products:
+            state.factories[pid].throughput_level = int(rng.integers(0, 4))
+            state.factories[pid].efficiency_level = int(rng.integers(0, 3))
+            state.factories[pid].paused = bool(rng.random() < 0.1)
+            state.products[pid].price = float(rng.uniform(1, 12))
+            state.products[pid].quality = float(rng.uniform(0.5, 3))
+        for cid, comp in state.components.items():
+            comp.inventory = float(rng.uniform(0, 400))
+            comp.auto_purchase_unlocked = bool(rng.random() < 0.6)
+            comp.auto_purchase_max_inventory = int(rng.integers(50, 500))
+        states.append(state)
+    return states
+
+
+def _assert_same(a: GameState, b: GameState):
+    assert a.cash == b.cash
+    assert a.game_day == b.game_day
+    for pid in a.products:
+        assert a.products[pid].inventory == b.products[pid].inventory
+    for cid in a.components:
+        assert a.components[cid].inventory == b.components[cid].inventory
+
+
+def test_batch_matches_run_tick():
+    states = _varied_states(20)
+    batch = GameBatch.from_states(states)
+    growth = {"A": 1.1, "B": 0.95, "C": 1.0, "D": 1.2, "E": 1.05}
+
+    for _ in range(120):
+        batch.tick(growth)
+        for state in states:
+            run_tick(state, growth)
+
+    for i, state in enumerate(states):
+        _assert_same(batch.to_state(i), state)
+
+
+def test_batch_tick_result_shapes():
+    batch = GameBatch.new_games(8)
+    result = batch.tick()
+    assert result.units_sold.shape == (8, 5)
+    assert result.auto_purchased.shape == (8, 5)
+    assert np.all(batch.game_day == 1)
+
+
+def test_batch_round_trips_states():
+    states = _varied_states(3)
+    batch = GameBatch.from_states(states)
+    for i, state in enumerate(states):
+        assert batch.to_state(i) == state
+
+
+def test_batch_matches_run_tick_with_calendars():
+    states = _varied_states(6)
+    for i, state in enumerate(states):
+        fresh = GameState.new_game(seed=i % 2)
+        state.seed, state.demand_calendar = fresh.seed, fresh.demand_calendar
+    batch = GameBatch.from_states(states)
+
+    for _ in range(400):
+        batch.tick()
+        for state in states:
+            run_tick(state)
+
+    for i, state in enumerate(states):
+        _assert_same(batch.to_state(i), state)
@@ -0,0 +1,17 @@
+"""Tests for the benchmark baseline comparison (not the timings themselves)."""
+
+from benchmarks.suite import Metric, compare, to_baseline
+
+
+def test_compare_flags_only_regressions_past_threshold():
+    baseline = to_baseline([
+        Metric("ticks_per_s", 1000.0, "ticks/s", "higher"),
+        Metric("p99_ms", 10.0, "ms", "lower"),
+    ])
+    ok = [Metric("ticks_per_s", 800.0, "ticks/s", "higher"), Metric("p99_ms", 12.0, "ms", "lower")]
+    bad = [Metric("ticks_per_s", 700.0, "ticks/s", "higher"), Metric("p99_ms", 5.0, "ms", "lower")]
+    new_metric = [Metric("unseen", 1.0, "x", "higher")]
+
+    assert compare(ok, baseline, threshold=0.25) == []
+    assert [r.split(":")[0] for r in compare(bad, baseline, threshold=0.25)] == ["ticks_per_s"]
+    assert compare(new_metric, baseline) == []
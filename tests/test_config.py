@@ -0,0 +1,142 @@
+"""Tests for the compiled config, hot reload and migration."""
+
+import dataclasses
+import json
+
+import pytest
+
+from engine import config
+from engine.compiled import compile_config, current_config, reload_config, use_config
+from engine.demand import DemandCalendar
+from engine.game_state import GameState
+from engine.production import compile_bom
+from engine.tick import run_tick
+from engine.upgrades import upgrade_throughput
+
+
+@pytest.fixture
+def restore_config():
+    """Put back whatever version was current before the test reloaded."""
+    with use_config(current_config()):
+        yield
+
+
+def test_compiled_matches_module_and_is_frozen():
+    cfg = compile_config()
+    assert cfg.product_ids == tuple(config.PRODUCT_STARTING_PRICES)
+    assert cfg.bom_parts["A"] == ((3, 2.1), (4, 2.9))
+    assert cfg.upgrade_cost(2) == config.UPGRADE_BASE_COST * config.UPGRADE_COST_MULTIPLIER ** 2
+    assert cfg.demand_a.tolist() == [config.PRODUCT_DEMAND[pid]["a"] for pid in cfg.product_ids]
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cfg.starting_cash = 0
+    with pytest.raises(TypeError):
+        cfg.bill_of_materials["A"][3] = 1.0
+    with pytest.raises(ValueError):
+        cfg.seasonal[0, 0] = 2.0
+
+
+def test_reload_leaves_running_games_on_their_version(tmp_path, restore_config):
+    old_game = GameState.new_game()
+    path = tmp_path / "balance.json"
+    path.write_text(json.dumps({"UPGRADE_BASE_COST": 100, "STARTING_CASH": 500}))
+
+    cfg = reload_config(str(path))
+    assert cfg.version == old_game.config.version + 1
+    new_game = GameState.new_game()
+    assert new_game.config is cfg and new_game.cash == 500
+
+    old_game.cash = new_game.cash = 500.0
+    assert not upgrade_throughput(old_game, "A")  # still costs 1000
+    assert upgrade_throughput(new_game, "A")
+
+    path.write_text(json.dumps({"CAPACITY_PER_THROUGHPUT_LEVEL": 1}))
+    reload_config(str(path))
+    assert new_game.factory_capacity("A") == config.CAPACITY_PER_THROUGHPUT_LEVEL
+
+
+def test_toml_overrides_with_sparse_bom(tmp_path, restore_config):
+    path = tmp_path / "balance.toml"
+    path.write_text(
+        "[BILL_OF_MATERIALS.A]\n3 = 1.0\n"
+        '[BILL_OF_MATERIALS.B]\n4 = 1.7\n5 = 2.2\n'
+        '[BILL_OF_MATERIALS.C]\n2 = 1.5\n5 = 2.5\n'
+        '[BILL_OF_MATERIALS.D]\n1 = 2.5\n2 = 2.9\n5 = 1.4\n'
+        '[BILL_OF_MATERIALS.E]\n2 = 2.9\n3 = 2.5\n4 = 1.9\n5 = 1.7\n'
+    )
+    cfg = reload_config(str(path))
+    assert cfg.bill_of_materials["A"] == {1: None, 2: None, 3: 1.0, 4: None, 5: None}
+
+    state = GameState.new_game()
+    state.factories["A"].throughput_level = 1
+    state.components[3].inventory = 100.0
+    run_tick(state)
+    assert state.components[3].inventory == 90.0
+    assert compile_bom(cfg.product_ids, cfg.component_ids, cfg).units[0].tolist() == [0, 0, 1.0, 0, 0]
+
+
+def test_bad_config_is_rejected_and_current_kept(tmp_path, restore_config):
+    before = current_config()
+    for content in ('{"NO_SUCH_SETTING": 1}', '{"PRODUCT_STARTING_PRICES": {"A": 1}}', "{not json"):
+        path = tmp_path / "bad.json"
+        path.write_text(content)
+        with pytest.raises(ValueError):
+            reload_config(str(path))
+    with pytest.raises(ValueError):
+        reload_config(str(tmp_path / "missing.json"))
+    assert current_config() is before
+
+
+def test_migrate_rebuilds_derived_state():
+    state = GameState.new_game()
+    state.products["A"].inventory = 1000
+    run_tick(state)  # fills the elasticity cache and the calendar under the old version
+    sold_before = state.products["A"].last_sold
+
+    demand = {pid: dict(p) for pid, p in config.PRODUCT_DEMAND.items()}
+    demand["A"]["a"] = 300
+    cfg = compile_config({"PRODUCT_DEMAND": demand, "GAME_YEARS": 20}, version=7)
+    state.migrate_config(cfg)
+
+    assert state.config is cfg
+    assert state.demand_calendar is DemandCalendar.for_seed(state.seed, cfg.product_ids, cfg)
+    assert state.demand_calendar.days == 20 * 360
+    run_tick(state)
+    assert state.products["A"].last_sold > 2 * sold_before
+    assert not state.game_over and state.config.total_game_days == 7200
+
+    other = compile_config({
+        "COMPONENT_PRICES": {**config.COMPONENT_PRICES, 6: 1.0},
+    })
+    with pytest.raises(ValueError):
+        state.migrate_config(other)
+
+
+def test_reload_and_migrate_routes(tmp_path, monkeypatch, restore_config):
+    import server.app as server
+    from server.app import app, sessions
+
+    path = tmp_path / "balance.json"
+    path.write_text(json.dumps({"UPGRADE_BASE_COST": 10}))
+    monkeypatch.setattr(server, "CONFIG_PATH", str(path))
+
+    client = app.test_client()
+    game_id = client.post("/api/games").get_json()["game_id"]
+    try:
+        url = f"/api/state?game_id={game_id}"
+        old_version = client.get(url).get_json()["config_version"]
+        reloaded = client.post("/api/config/reload").get_json()
+        assert reloaded["success"] and reloaded["version"] > old_version
+        assert client.get("/api/config").get_json()["version"] == reloaded["version"]
+        assert client.get(url).get_json()["products"]["A"]["throughput_upgrade_cost"] == 1000
+
+        migrated = client.post(f"/api/games/{game_id}/migrate").get_json()
+        assert migrated["config_version"] == reloaded["version"]
+        state = client.get(url).get_json()
+        assert state["config_version"] == reloaded["version"]
+        assert state["products"]["A"]["throughput_upgrade_cost"] == 10
+
+        path.write_text("{")
+        assert client.post("/api/config/reload").status_code == 400
+    finally:
+        sessions.remove(game_id)
@@ -53,3 +53,111 @@ def test_growth_factor_increases_over_years():
 def test_calculate_demand_returns_positive():
     d = calculate_demand("A", 5.0, 1.0, 0)
     assert d > 0
+
+
+def test_demand_calendar_same_seed_same_values():
+    from engine.demand import DemandCalendar
+    a = DemandCalendar(7, ("A", "B"))
+    a.growth_factors(5)  # querying a later year first must not matter
+    b = DemandCalendar(7, ("A", "B"))
+    assert (a.multipliers == b.multipliers).all()
+    assert a.multiplier(400, "B") == b.multiplier(400, "B")
+
+
+def test_demand_calendar_constant_within_month():
+    from engine.demand import DemandCalendar
+    cal = DemandCalendar(1, ("A",))
+    month = [cal.multiplier(d, "A") for d in range(30, 60)]
+    assert len(set(month)) == 1
+    assert cal.multiplier(29, "A") != cal.multiplier(30, "A")
+
+
+def test_demand_calendar_matches_seasonal_times_growth():
+    from engine.demand import DemandCalendar
+    cal = DemandCalendar(3, ("A",))
+    params = config.PRODUCT_DEMAND["A"]
+    day = 2 * 360 + 4 * 30  # year 3, month 5
+    expected = seasonal_modifier(5, params) * cal.growth_factors(3)["A"]
+    assert abs(cal.multiplier(day, "A") - expected) < 1e-12
+
+
+def test_calculate_demand_uses_calendar():
+    from engine.demand import DemandCalendar
+    cal = DemandCalendar(3, ("A",))
+    base = price_quality_demand(5.0, 1.0, config.PRODUCT_DEMAND["A"])
+    assert calculate_demand("A", 5.0, 1.0, 500, calendar=cal) == base * cal.multiplier(500, "A")
+
+
+def test_elasticity_cache_hits_until_price_changes():
+    from engine.demand import ElasticityCache
+    cache = ElasticityCache()
+    params = config.PRODUCT_DEMAND["A"]
+    first = cache.get("A", 5.0, 1.0, params)
+    assert cache.get("A", 5.0, 1.0, params) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    changed = cache.get("A", 6.0, 1.0, params)
+    assert changed == price_quality_demand(6.0, 1.0, params)
+    assert cache.misses == 2
+
+
+def test_elasticity_cache_invalidate():
+    from engine.demand import ElasticityCache
+    cache = ElasticityCache()
+    params = config.PRODUCT_DEMAND["A"]
+    cache.get("A", 5.0, 1.0, params)
+    cache.invalidate("A")
+    cache.get("A", 5.0, 1.0, params)
+    assert cache.misses == 2
+    assert cache.stats()["hit_rate"] == 0.0
+
+
+def test_evaluate_grid_matches_scalar_demand():
+    import numpy as np
+    from engine.demand import evaluate_grid, DemandCalendar, calculate_demand
+
+    pids = ("A", "B", "C", "D", "E")
+    calendar = DemandCalendar.for_seed(5, pids)
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(0, 80, size=(200, 5))
+    qualities = rng.uniform(0.5, 3, size=(200, 5))
+    days = rng.integers(0, 4000, size=200)
+
+    for cal, growth in ((calendar, None), (None, {"A": 1.3, "D": 0.8})):
+        grid = evaluate_grid(pids, prices, qualities, days, calendar=cal, growth_factors=growth)
+        expected = [
+            [calculate_demand(pid, prices[i, j], qualities[i, j], int(days[i]), growth, cal)
+             for j, pid in enumerate(pids)]
+            for i in range(200)
+        ]
+        np.testing.assert_allclose(grid.demand, expected, rtol=1e-12)
+        np.testing.assert_array_equal(grid.revenue, grid.units * prices)
+
+
+def test_evaluate_grid_broadcasts_candidates_against_days():
+    import numpy as np
+    from engine.demand import evaluate_grid
+
+    prices = np.linspace(1, 60, 1000)[:, None, None]   # (K, 1, 1): same price for every product
+    grid = evaluate_grid(("A", "B"), prices, [1.0, 2.0], np.arange(0, 360, 30))
+    assert grid.demand.shape == (1000, 12, 2)
+    assert (np.diff(grid.demand[:, 0, 0]) < 0).all()   # demand falls as price rises
+
+
+def test_capacity_limited_revenue():
+    import numpy as np
+    from engine.demand import capacity_limited_revenue
+    from engine.game_state import GameState
+
+    state = GameState.new_game()
+    state.factories["A"].throughput_level = 1
+    state.factories["B"].throughput_level = 2
+    state.factories["B"].paused = True
+
+    candidates = np.random.default_rng(1).uniform(0, 50, size=(10**6, 5))
+    grid = capacity_limited_revenue(state, candidates)
+    assert grid.units.shape == (10**6, 5)
+    assert grid.units[:, 0].max() <= state.factory_capacity("A")
+    assert grid.units[:, 1:].max() == 0   # B paused, C-E have no factory
+    best = candidates[grid.revenue.sum(axis=1).argmax()]
+    assert 0 < best[0] < 50
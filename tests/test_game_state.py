@@ -1,7 +1,12 @@
 """Smoke tests for GameState and config wiring."""
 
-from engine.game_state import GameState, FactoryState
+import copy
+
+import pytest
+
+from engine.game_state import GameState
 from engine import config
+from engine.tick import run_tick
 
 
 def test_new_game_creates_all_products():
@@ -21,19 +26,20 @@ def test_starting_cash():
 
 
 def test_factory_capacity_scales_with_throughput():
-    f = FactoryState(throughput_level=3)
-    assert f.capacity == 3 * config.CAPACITY_PER_THROUGHPUT_LEVEL
+    state = GameState.new_game()
+    state.factories["A"].throughput_level = 3
+    assert state.factory_capacity("A") == 3 * config.CAPACITY_PER_THROUGHPUT_LEVEL
 
 
 def test_factory_efficiency_multiplier():
-    f = FactoryState(efficiency_level=0)
-    assert f.efficiency_multiplier == 1.0
+    state = GameState.new_game()
+    assert state.factory_efficiency("A") == 1.0
 
-    f = FactoryState(efficiency_level=1)
-    assert f.efficiency_multiplier == 0.8  # 20% reduction
+    state.factories["A"].efficiency_level = 1
+    assert state.factory_efficiency("A") == 0.8  # 20% reduction
 
-    f = FactoryState(efficiency_level=2)
-    assert abs(f.efficiency_multiplier - 0.64) < 1e-9
+    state.factories["A"].efficiency_level = 2
+    assert abs(state.factory_efficiency("A") - 0.64) < 1e-9
 
 
 def test_game_calendar():
@@ -64,3 +70,73 @@ def test_game_over():
     # First day of year 11
     state.game_day = 10 * 12 * 30
     assert state.game_over
+
+
+def test_touch_tracks_changed_sections():
+    state = GameState.new_game()
+    v0 = state.version
+    state.touch("products", "B")
+    state.touch()
+    assert state.version == v0 + 2
+    assert state.changed_since("products", v0) == ["B"]
+    assert state.changed_since("components", v0) == []
+
+
+def test_selling_from_stock_without_production_is_a_change():
+    state = GameState.new_game()
+    state.products["B"].inventory = 990  # factory B never built
+    run_tick(state)
+    for _ in range(3):
+        version, inventory = state.version, state.products["B"].inventory
+        run_tick(state)
+        assert state.products["B"].inventory < inventory
+        assert "B" in state.changed_since("products", version)
+
+
+def test_versions_continue_after_reset():
+    old = GameState.new_game()
+    old.touch("components", 1)
+    new = GameState.new_game()
+    new.start_versions_at(old.version + 1)
+    assert set(new.changed_since("products", old.version)) == set(new.products)
+    assert new.changed_since("products", new.version) == []
+
+
+def _busy(storage: str) -> GameState:
+    state = GameState.new_game(storage=storage)
+    state.factories["A"].throughput_level = 2
+    for comp in state.components.values():
+        comp.inventory = 500.0
+        comp.auto_purchase_unlocked = True
+    return state
+
+
+@pytest.mark.parametrize("storage", ["objects", "arrays"])
+def test_fork_plays_like_a_deep_copy(storage):
+    state = _busy(storage)
+    run_tick(state)
+    fork, deep = state.fork(), copy.deepcopy(state)
+    assert fork == state and fork.version == state.version
+
+    for game in (fork, deep):
+        game.products["A"].price = 7.0
+        game.elasticity_cache.invalidate("A")
+        for _ in range(40):
+            run_tick(game)
+    assert fork == deep
+    assert fork.cash == deep.cash
+    assert state.game_day == 1 and state.products["A"].price == 10.0
+
+
+def test_array_fork_copies_only_what_it_writes():
+    state = _busy("arrays")
+    fork = state.fork()
+    assert fork.arrays.product_floats is state.arrays.product_floats
+
+    fork.products["A"].price = 3.0
+    assert fork.arrays.product_floats is not state.arrays.product_floats
+    assert fork.arrays.component_floats is state.arrays.component_floats
+    assert state.products["A"].price == 10.0
+
+    state.components[1].inventory = 0.0  # the original copies on its own first write
+    assert fork.components[1].inventory == 500.0
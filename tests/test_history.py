@@ -0,0 +1,114 @@
+"""Tests for per-game history ring buffers and downsampled queries."""
+
+import numpy as np
+import pytest
+
+from engine.game_state import GameState
+from engine.history import History
+from engine.tick import run_tick, simulate_until
+
+
+def _game() -> GameState:
+    state = GameState.new_game()
+    state.products["A"].price = 2.0
+    for pid in ("A", "B"):
+        state.factories[pid].throughput_level = 1
+    for comp in state.components.values():
+        comp.inventory = 20_000.0
+    return state
+
+
+def _recorded(ticks: int, capacity: int | None = None) -> tuple[GameState, History, list]:
+    state = _game()
+    history = History.for_state(state, capacity)
+    rows = []
+    for _ in range(ticks):
+        result = run_tick(state)
+        history.record(state, result)
+        rows.append((state.cash, [s.units_sold for s in result.sales], [s.demand for s in result.sales]))
+    return state, history, rows
+
+
+def test_month_buckets_match_a_per_day_loop():
+    _, history, rows = _recorded(75)
+    out = history.query(10, 75, "month")
+    assert out["start"] == [0, 30, 60]
+    assert out["ticks"] == [20, 30, 15]
+
+    days = [range(10, 30), range(30, 60), range(60, 75)]
+    assert out["cash"] == [rows[d[-1]][0] for d in days]
+    assert out["products"]["A"]["sold"] == [sum(rows[i][1][0] for i in d) for d in days]
+    assert out["products"]["B"]["demand"] == pytest.approx([np.mean([rows[i][2][1] for i in d]) for d in days])
+
+
+def test_day_resolution_is_the_raw_series():
+    state, history, rows = _recorded(40)
+    out = history.query(0, 1000)
+    assert out["to"] == 40 and out["ticks"] == [1] * 40
+    assert out["cash"] == [r[0] for r in rows]
+    assert out["products"]["A"]["inventory"][-1] == state.products["A"].inventory
+    assert out["components"]["3"]["inventory"][-1] == state.components[3].inventory
+
+
+def test_ring_keeps_only_the_latest_capacity_days():
+    _, history, rows = _recorded(50, capacity=30)
+    out = history.query(0, 50)
+    assert out["from"] == 20 and len(out["cash"]) == 30
+    assert out["cash"][0] == rows[20][0]
+
+
+@pytest.mark.parametrize("analytic", [False, True])
+def test_fast_forward_records_every_day_like_ticking(analytic):
+    _, expected, _ = _recorded(200)
+    state, history, _ = _recorded(10)
+    summary = simulate_until(state, 200, analytic=analytic, history=history)
+    assert not analytic or summary.steps < summary.ticks  # segments were taken
+
+    out, want = history.query(0, 200, "month"), expected.query(0, 200, "month")
+    assert out["ticks"] == [30] * 6 + [20]
+    for pid in ("A", "B"):
+        for name in ("sold", "produced", "inventory", "throughput"):
+            assert out["products"][pid][name] == want["products"][pid][name], (pid, name)
+        assert out["products"][pid]["demand"] == pytest.approx(want["products"][pid]["demand"])
+    assert out["cash"] == pytest.approx(want["cash"])
+    assert out["components"]["3"]["inventory"] == pytest.approx(want["components"]["3"]["inventory"])
+
+
+def test_unrecorded_days_are_skipped_and_rollback_truncates():
+    state, history, _ = _recorded(10)
+    simulate_until(state, 40)  # no history passed
+    for _ in range(5):
+        history.record(state, run_tick(state))
+    assert history.query(0, 60, "month")["ticks"] == [10, 5]
+    assert history.query(12, 20)["ticks"] == []
+
+    history.truncate(42)
+    assert history.last_day == 41 and history.query(0, 60)["ticks"] == [1] * 12
+    with pytest.raises(ValueError):
+        history.query(0, 10, "week")
+
+
+def test_history_route():
+    from server.app import app, sessions
+
+    client = app.test_client()
+    game_id = client.post("/api/games").get_json()["game_id"]
+    try:
+        session = sessions.get(game_id)
+        session.advance(5)
+        client.post("/action/fast_forward", json={"game_id": game_id, "days": 40})
+        out = client.get(f"/api/history?game_id={game_id}&resolution=month").get_json()
+        assert out["ticks"] == [30, 15]
+        assert out["cash"][-1] == session.state.cash
+        assert client.get(f"/api/history?game_id={game_id}&resolution=week").status_code == 400
+
+        rolled_back = client.post("/action/batch", json={"game_id": game_id, "actions": [
+            {"action": "fast_forward", "days": 20},
+            {"action": "purchase_component", "component_id": 1, "quantity": 10 ** 9},
+        ]}).get_json()
+        assert rolled_back["rolled_back"] and session.history.last_day == session.state.game_day - 1 == 44
+
+        client.post("/action/new_game", json={"game_id": game_id})
+        assert client.get(f"/api/history?game_id={game_id}").get_json()["ticks"] == []
+    finally:
+        sessions.remove(game_id)
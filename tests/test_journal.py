@@ -0,0 +1,127 @@
+"""Tests for the binary journal and checkpointed replay."""
+
+import os
+import time
+
+from engine.actions import Command, apply_command
+from engine.game_state import GameState
+from engine.journal import Journal, CHECKPOINT_INTERVAL, encode_action, decode_action, replay
+from engine.savefile import dumps
+from engine.tick import run_tick
+from server.sessions import SessionRegistry
+
+
+def _script():
+    """(day, command) pairs: a small factory that grows over a few years."""
+    return [
+        (0, Command("upgrade_throughput", product_id="A")),
+        (0, Command("unlock_auto_purchase", component_id=1)),
+        (0, Command("unlock_auto_purchase", component_id=2)),
+        (5, Command("set_price", product_id="A", price=55.5)),
+        (45, Command("upgrade_efficiency", product_id="A")),
+        (60, Command("set_auto_purchase", component_id=1, quantity=300, max_inventory=900)),
+        (61, Command("fast_forward", days=200, period="month")),
+        (400, Command("toggle_pause", product_id="A")),
+        (401, Command("toggle_pause", product_id="A")),
+    ]
+
+
+def _play(journal, days):
+    """Run the script live, journaling like a session does."""
+    state = GameState.new_game()
+    script = _script()
+    snapshots = {}
+    while state.game_day < days:
+        while script and script[0][0] <= state.game_day:
+            _, cmd = script.pop(0)
+            day = state.game_day
+            apply_command(state, cmd)
+            journal.record(day, cmd)
+        snapshots[state.game_day] = dumps([state])
+        journal.checkpoint(state)
+        run_tick(state)
+    return state, snapshots
+
+
+def test_action_round_trip():
+    for _, cmd in _script() + [(0, Command("new_game", seed=7))]:
+        assert decode_action(encode_action(cmd)) == cmd
+
+
+def test_restore_matches_live_game(tmp_path):
+    journal = Journal.create(str(tmp_path / "g.journal"), seed=42)
+    final, snapshots = _play(journal, 500)
+
+    assert journal.checkpoint_days[0] == CHECKPOINT_INTERVAL
+    for day in (0, 3, 29, 30, 60, 261, 270, 400, 401, 499):
+        assert dumps([journal.restore(day)]) == snapshots[day], day
+    assert journal.restore(500) == final
+
+
+def test_reopen_rebuilds_index(tmp_path):
+    path = str(tmp_path / "g.journal")
+    journal = Journal.create(path, seed=42)
+    _, snapshots = _play(journal, 300)
+    journal.close()
+
+    reopened = Journal.open(path)
+    assert reopened.checkpoint_days == journal.checkpoint_days
+    assert dumps([replay(path, 275)]) == snapshots[275]
+    reopened.close()
+
+
+def test_replay_leaves_a_torn_tail_for_the_writer(tmp_path):
+    path = str(tmp_path / "g.journal")
+    journal = Journal.create(path, seed=42)
+    _, snapshots = _play(journal, 100)
+    with open(path, "ab") as f:
+        f.write(b"\x02\x00")  # a record the live writer has only half flushed
+    size = os.path.getsize(path)
+
+    assert dumps([replay(path, 50)]) == snapshots[50]
+    assert os.path.getsize(path) == size
+    journal.close()
+
+
+def test_late_restore_replays_only_the_tail(tmp_path):
+    journal = Journal.create(str(tmp_path / "g.journal"), seed=42)
+    _play(journal, 3100)
+
+    start = time.perf_counter()
+    state = journal.restore(3000)
+    elapsed = time.perf_counter() - start
+    assert state.game_day == 3000
+    assert elapsed < 0.05
+
+
+def test_session_journals_actions_and_new_games(tmp_path):
+    session = SessionRegistry(journal_dir=str(tmp_path)).create("j", seed=5)
+    session.actions.submit(Command("upgrade_throughput", product_id="B"))
+    for _ in range(CHECKPOINT_INTERVAL + 5):
+        session.tick()
+    assert session.journal.restore(session.state.game_day) == session.state
+
+    session.actions.submit(Command("new_game", seed=9))
+    session.tick()
+    assert session.journal.seed == 9
+    assert session.journal.checkpoint_days == []
+    assert session.journal.restore(1) == session.state
+
+
+def test_replay_route(tmp_path, monkeypatch):
+    from server.app import app, sessions
+
+    client = app.test_client()
+    plain = client.post("/api/games").get_json()["game_id"]  # BIZSIM_JOURNALS unset
+    monkeypatch.setattr(sessions, "journal_dir", str(tmp_path))
+    game_id = client.post("/api/games").get_json()["game_id"]
+    try:
+        assert client.get(f"/api/replay?game_id={plain}&day=0").status_code == 404
+        client.post("/action/set_price", json={"game_id": game_id, "product_id": "A", "price": 12})
+        body = client.get(f"/api/replay?game_id={game_id}&day=0").get_json()
+        assert body["game_day"] == 0
+        assert body["products"]["A"]["price"] == 12
+        assert client.get(f"/api/replay?game_id={game_id}").status_code == 400
+    finally:
+        sessions.remove(plain)
+        sessions.remove(game_id)
@@ -0,0 +1,53 @@
+"""Tests for tick instrumentation and the /metrics endpoint."""
+
+from engine.game_state import GameState
+from engine.tick import run_tick, set_phase_hook
+from server.metrics import Histogram, TickMetrics
+from server.sessions import SessionRegistry, TickScheduler
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram("x_seconds", "test", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        h.observe(value)
+    lines = h.render()
+    assert 'x_seconds_bucket{le="0.1"} 1' in lines
+    assert 'x_seconds_bucket{le="1.0"} 3' in lines
+    assert 'x_seconds_bucket{le="+Inf"} 4' in lines
+    assert "x_seconds_count 4" in lines
+
+
+def test_phase_hook_sees_every_phase_and_can_be_removed():
+    seen = []
+    previous = set_phase_hook(lambda phase, seconds: seen.append(phase))
+    try:
+        run_tick(GameState.new_game())
+        set_phase_hook(None)
+        run_tick(GameState.new_game())
+    finally:
+        set_phase_hook(previous)
+    assert seen == ["production", "sales", "auto_purchase", "clock"]
+
+
+def test_scheduler_records_lag_and_lock_wait():
+    metrics = TickMetrics()
+    registry = SessionRegistry()
+    scheduler = TickScheduler(registry, interval=1.0, metrics=metrics, max_catch_up=2)
+    registry.create("m")
+    scheduler.schedule("m", 0.0)
+    scheduler.run_due(5.0)
+    assert metrics.lag.count() == 1
+    assert metrics.lock_wait.count() == 1
+    assert metrics.ticks.value == 2
+    assert metrics.drift.value == 3.0  # due 0 + 2 ticks, 3 s of backlog dropped
+
+
+def test_metrics_endpoint():
+    from server.app import app
+
+    client = app.test_client()
+    client.get("/api/state")
+    body = client.get("/metrics").get_data(as_text=True)
+    assert "# TYPE bizsim_tick_phase_seconds histogram" in body
+    assert 'bizsim_http_request_seconds_count{route="/api/state"}' in body
+    assert "bizsim_sessions " in body
@@ -0,0 +1,75 @@
+"""Tests for the Monte Carlo strategy runner."""
+
+import pickle
+
+from engine import montecarlo
+from engine.actions import Command, apply_command
+from engine.compiled import compile_config
+from engine.game_state import GameState
+from engine.tick import simulate_until
+
+
+@montecarlo.register_strategy("test_cheap_a", interval=60)
+def cheap_a(state: GameState) -> list[Command]:
+    return montecarlo.expand(state) + [Command("set_price", product_id="A", price=20.0)]
+
+
+def test_results_do_not_depend_on_worker_count():
+    strategies = ["idle", "expand_priced", "test_cheap_a"]
+    inline = montecarlo.run(strategies, [1, 2, 3], workers=0, days=400)
+    pooled = montecarlo.run(strategies, [1, 2, 3], workers=2, days=400)
+    assert (inline == pooled).all()
+    assert inline["job"].tolist() == list(range(9))
+    assert inline["seed"].tolist() == [1, 2, 3] * 3
+
+
+def test_rows_match_a_direct_game():
+    state, totals = montecarlo.play(montecarlo.STRATEGIES["expand"], seed=4, days=200)
+    row = montecarlo.run(["expand"], [4], workers=0, days=200)[0]
+    assert row["cash"] == state.cash
+    assert row["revenue"] == totals["revenue"]
+    assert abs(row["product_revenue"].sum() - row["revenue"]) < 1e-6
+    assert row["days"] == 200
+
+
+def test_iter_run_streams_every_job():
+    rows = list(montecarlo.iter_run(["idle", "expand"], [5, 6], workers=2, days=60, chunk_size=1))
+    assert sorted(int(r["job"]) for r in rows) == [0, 1, 2, 3]
+    assert all(r["cash"] == GameState.new_game().cash for r in rows if r["job"] < 2)
+
+
+def test_workers_run_the_callers_config_not_their_own():
+    cfg = compile_config({"STARTING_CASH": 1234, "UPGRADE_BASE_COST": 100}, version=9)
+    assert pickle.loads(pickle.dumps(cfg)).upgrade_base_cost == 100
+    assert pickle.loads(pickle.dumps(cfg)) is pickle.loads(pickle.dumps(cfg))
+
+    inline = montecarlo.run(["idle", "expand"], [1, 2], workers=0, days=200, config=cfg)
+    pooled = montecarlo.run(["idle", "expand"], [1, 2], workers=2, days=200, config=cfg)
+    assert (inline == pooled).all()
+    assert inline["cash"][:2].tolist() == [1234, 1234]
+
+
+def test_branch_forks_without_touching_the_live_game():
+    state = GameState.new_game(seed=5)
+    state.cash = 20_000.0
+    for comp in state.components.values():
+        comp.inventory = 5_000.0
+    plans = [
+        [],
+        [Command("upgrade_throughput", product_id="A")],
+        [Command("upgrade_throughput", product_id="A"), Command("set_price", product_id="A", price=4.0)],
+    ]
+    before = state.fork()
+    rows = montecarlo.branch(state, plans, ticks=90)
+
+    assert state == before and state.game_day == 0
+    assert rows["job"].tolist() == [0, 1, 2]
+    assert (rows["days"] == 90).all()
+    assert rows["units_produced"][0] == 0 and rows["units_produced"][1] == 900
+    assert rows["units_sold"][2] > rows["units_sold"][1]
+
+    replay = state.fork()
+    for cmd in plans[2]:
+        apply_command(replay, cmd)
+    simulate_until(replay, 90)
+    assert rows["cash"][2] == replay.cash
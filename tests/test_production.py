@@ -86,3 +86,34 @@ def test_produce_resumes_after_unpause():
     state.factories["A"].paused = False
     result = produce(state, "A")
     assert result.units_produced > 0
+
+
+def test_vectorized_production_matches_sequential():
+    import copy
+    import numpy as np
+    from engine.production import produce_all_vectorized
+
+    rng = np.random.default_rng(3)
+    for _ in range(50):
+        state = GameState.new_game()
+        for f in state.factories.values():
+            f.throughput_level = int(rng.integers(0, 5))
+            f.efficiency_level = int(rng.integers(0, 3))
+            f.paused = bool(rng.random() < 0.15)
+        for comp in state.components.values():
+            comp.inventory = float(rng.uniform(0, 120))  # scarce: factories compete
+
+        expected_state = copy.deepcopy(state)
+        expected = [produce(expected_state, pid) for pid in expected_state.factories]
+        actual = produce_all_vectorized(state)
+
+        assert actual == expected
+        assert state == expected_state
+
+
+def test_compiled_bom_matches_config():
+    from engine.production import compile_bom
+    bom = compile_bom(("A", "B"), (1, 2, 3, 4, 5))
+    assert bom.units[0, 2] == 2.1
+    assert not bom.mask[0, 0]
+    assert bom.columns[1] == (3, 4)
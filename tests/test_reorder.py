@@ -0,0 +1,106 @@
+"""Tests for the auto-purchase reorder-point index."""
+
+import copy
+
+import numpy as np
+
+from engine.actions import Command, apply_command
+from engine.game_state import GameState
+from engine.purchasing import purchase_component
+from engine.tick import run_tick
+from benchmarks.catalog import scaled_catalog
+
+
+def _scan_purchase(state: GameState) -> None:
+    """The full-catalog scan the index replaces."""
+    for comp_id, comp in state.components.items():
+        if comp.auto_purchase_unlocked and comp.inventory < comp.auto_purchase_max_inventory:
+            purchase_component(state, comp_id, comp.auto_purchase_quantity)
+
+
+def _scan_tick(state: GameState) -> None:
+    from engine.production import produce_all
+    from engine.sales import sell_all
+
+    produce_all(state)
+    sell_all(state)
+    _scan_purchase(state)
+    state.game_day += 1
+
+
+def _random_game(rng) -> GameState:
+    state = GameState.new_game(seed=int(rng.integers(1000)))
+    state.cash = float(rng.uniform(0, 30_000))
+    for pid, factory in state.factories.items():
+        factory.throughput_level = int(rng.integers(0, 4))
+        state.products[pid].price = float(rng.uniform(1, 30))
+    for comp in state.components.values():
+        comp.inventory = float(rng.uniform(0, 3000))
+        comp.auto_purchase_unlocked = bool(rng.integers(2))
+        comp.auto_purchase_quantity = int(rng.integers(10, 500))
+        comp.auto_purchase_max_inventory = int(rng.integers(100, 2000))
+    return state
+
+
+def test_index_matches_full_scan_with_actions_mid_game():
+    rng = np.random.default_rng(3)
+    actions = [
+        Command("upgrade_throughput", product_id="B"),
+        Command("toggle_pause", product_id="C"),
+        Command("set_auto_purchase", component_id=2, quantity=700, max_inventory=2500),
+        Command("purchase_component", component_id=5, quantity=400),
+        Command("unlock_auto_purchase", component_id=1),
+        Command("upgrade_efficiency", product_id="E"),
+    ]
+    for _ in range(10):
+        indexed = _random_game(rng)
+        scanned = copy.deepcopy(indexed)
+        for day in range(240):
+            if day % 40 == 39:
+                cmd = actions[day // 40]
+                apply_command(indexed, cmd)
+                apply_command(scanned, cmd)
+            run_tick(indexed)
+            _scan_tick(scanned)
+        assert indexed == scanned
+
+
+def test_well_stocked_components_are_not_visited():
+    state = GameState.new_game()
+    state.factories["A"].throughput_level = 1  # uses 2.1 of #3 and 2.9 of #4 a tick
+    for comp in state.components.values():
+        comp.inventory = 10_000.0
+        comp.auto_purchase_unlocked = True
+    run_tick(state)  # first tick checks everything and predicts
+
+    index = state.reorder_index
+    visited = []
+    for _ in range(100):
+        visited.extend(index.pop_due(state))  # what the next purchase step would check
+        state.game_day += 1
+    assert visited == []
+    assert index.rebuilds == 1
+
+
+def test_settings_change_is_picked_up_next_tick():
+    state = GameState.new_game()
+    state.components[3].inventory = 800.0
+    apply_command(state, Command("unlock_auto_purchase", component_id=3))
+    apply_command(state, Command("set_auto_purchase", component_id=3, max_inventory=500))
+    run_tick(state)
+    assert state.components[3].inventory == 800.0
+
+    apply_command(state, Command("set_auto_purchase", component_id=3, quantity=100, max_inventory=900))
+    run_tick(state)
+    assert state.components[3].inventory == 900.0
+
+
+def test_index_on_large_catalog():
+    with scaled_catalog(60, 40):
+        rng = np.random.default_rng(5)
+        indexed = _random_game(rng)
+        scanned = copy.deepcopy(indexed)
+        for _ in range(120):
+            run_tick(indexed)
+            _scan_tick(scanned)
+        assert indexed == scanned
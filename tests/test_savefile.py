@@ -0,0 +1,71 @@
+"""Tests for the fixed-layout save format."""
+
+import numpy as np
+import pytest
+
+from engine import savefile
+from engine.batch import GameBatch
+from engine.game_state import GameState
+from engine.tick import run_tick
+
+
+def _states():
+    states = []
+    for seed in (1, 2, 2):
+        state = GameState.new_game(seed=seed)
+        state.factories["A"].throughput_level = seed
+        state.factories["B"].paused = True
+        state.components[3].auto_purchase_unlocked = True
+        for _ in range(35):
+            run_tick(state)
+        states.append(state)
+    return states
+
+
+def test_round_trip_preserves_state():
+    states = _states()
+    loaded = savefile.loads(savefile.dumps(states))
+    assert loaded == states
+    assert [s.version for s in loaded] == [s.version for s in states]
+    assert loaded[0].products["A"].last_revenue == states[0].products["A"].last_revenue
+    assert loaded[1].demand_calendar is loaded[2].demand_calendar
+
+
+def test_records_are_fixed_size():
+    header = savefile.parse_header(savefile.dumps(_states()))
+    assert header.data_offset % savefile.ALIGN == 0
+    assert header.dtype.itemsize == savefile.record_dtype(5, 5).itemsize
+    assert header.product_ids == ("A", "B", "C", "D", "E")
+
+
+def test_memmap_reads_columns_without_parsing(tmp_path):
+    path = str(tmp_path / "runs.bzs")
+    states = _states()
+    savefile.save(path, states)
+
+    header, records = savefile.open_records(path)
+    assert isinstance(records, np.memmap)
+    assert records["cash"].tolist() == [s.cash for s in states]
+    assert records["throughput_level"][:, 0].tolist() == [1, 2, 2]
+    assert savefile.load(path) == states
+
+
+def test_batch_from_records_matches_states(tmp_path):
+    path = str(tmp_path / "runs.bzs")
+    states = _states()
+    savefile.save(path, states)
+    header, records = savefile.open_records(path)
+
+    batch = GameBatch.from_records(records, header.product_ids, header.component_ids)
+    expected = GameBatch.from_states(states)
+    batch.tick()
+    expected.tick()
+    np.testing.assert_array_equal(batch.cash, expected.cash)
+    np.testing.assert_array_equal(batch.component_inventory, expected.component_inventory)
+
+
+def test_rejects_other_versions():
+    data = bytearray(savefile.dumps(_states()))
+    data[4] = 99
+    with pytest.raises(ValueError):
+        savefile.loads(bytes(data))
@@ -0,0 +1,125 @@
+"""Tests for analytic month-segment fast-forward."""
+
+import copy
+
+import numpy as np
+import pytest
+
+from engine.game_state import GameState
+from engine.segments import plan_segment, skip_ticks, MIN_SEGMENT_TICKS
+from engine.tick import run_tick, simulate_until
+from engine import config
+
+
+def _game(storage: str = "objects") -> GameState:
+    """Factories running on auto-purchased components that cycle around
+    their reorder thresholds."""
+    state = GameState.new_game(storage=storage)
+    state.cash = 50_000.0
+    for level, pid in enumerate(state.factories, start=1):
+        state.factories[pid].throughput_level = level
+    for comp in state.components.values():
+        comp.inventory = 2000.0
+        comp.auto_purchase_unlocked = True
+        comp.auto_purchase_quantity = 3000
+        comp.auto_purchase_max_inventory = 1000
+    return state
+
+
+def _assert_same(a: GameState, b: GameState) -> None:
+    assert a.game_day == b.game_day
+    assert a.cash == pytest.approx(b.cash, rel=1e-9)
+    for pid in a.products:
+        assert a.products[pid].inventory == b.products[pid].inventory
+        assert a.products[pid].last_sold == b.products[pid].last_sold
+    for cid in a.components:
+        assert a.components[cid].inventory == pytest.approx(b.components[cid].inventory, rel=1e-9, abs=1e-9)
+
+
+def _ticked(state: GameState, day: int) -> GameState:
+    state = copy.deepcopy(state)
+    while state.game_day < day and not state.game_over:
+        run_tick(state)
+    return state
+
+
+@pytest.mark.parametrize("storage", ["objects", "arrays"])
+def test_analytic_matches_run_tick(storage):
+    state = _game(storage)
+    expected = _ticked(state, 720)
+    summary = simulate_until(state, 720, analytic=True)
+    _assert_same(state, expected)
+    assert summary.ticks == 720
+    assert summary.steps < summary.ticks
+
+
+def test_analytic_totals_match_tick_by_tick():
+    a, b = _game(), _game()
+    exact = simulate_until(a, 400)
+    fast = simulate_until(b, 400, analytic=True)
+    assert fast.units_produced == exact.units_produced
+    assert fast.units_sold == exact.units_sold
+    assert [p.units_sold for p in fast.periods] == [p.units_sold for p in exact.periods]
+    assert fast.auto_purchase_spend == pytest.approx(exact.auto_purchase_spend, rel=1e-9)
+    assert sum(fast.revenue.values()) == pytest.approx(sum(exact.revenue.values()), rel=1e-9)
+
+
+def test_component_run_out_and_cash_limit_are_events():
+    state = GameState.new_game()
+    state.factories["A"].throughput_level = 2
+    state.components[3].inventory = 1000.0
+    state.components[4].inventory = 1000.0
+    assert plan_segment(state, 30).event == "component_4"  # 2.9 per widget runs out first
+
+    # A reorder blocked on cash lasts until sales pay for it
+    state.cash = 0.0
+    state.components[4].auto_purchase_unlocked = True
+    state.components[4].inventory = 0.0
+    state.components[4].auto_purchase_quantity = 1000
+    state.products["A"].inventory = 10_000
+    state.products["A"].price = 2.0
+    segment = plan_segment(state, 30)
+    assert segment.event == "cash" and segment.purchased == ()
+    expected = _ticked(state, segment.ticks + 1)
+    assert skip_ticks(state, 30) == segment.ticks
+    run_tick(state)
+    _assert_same(state, expected)
+    assert state.components[4].inventory > 0  # the reorder went through on the boundary tick
+
+
+def test_segments_stop_at_month_end():
+    state = GameState.new_game()
+    state.game_day = 25
+    segment = plan_segment(state, 100)
+    assert (segment.ticks, segment.event) == (5, "month")
+    assert skip_ticks(state, 100) == 5
+    assert state.game_day == 30
+
+
+def test_boundary_tick_is_left_to_run_tick():
+    state = _game()
+    state.components[3].inventory = 0.0  # A and E starve this tick, then get restocked
+    assert plan_segment(state, 30).ticks < MIN_SEGMENT_TICKS
+    assert skip_ticks(state, 30) == 0
+    assert state.game_day == 0
+
+
+def test_analytic_matches_run_tick_on_random_setups():
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        state = GameState.new_game(seed=int(rng.integers(1000)))
+        state.cash = float(rng.uniform(0, 20_000))
+        state.game_day = int(rng.integers(0, 300))
+        for pid in state.factories:
+            state.factories[pid].throughput_level = int(rng.integers(0, 4))
+            state.products[pid].price = float(rng.uniform(1, 60))
+        for comp in state.components.values():
+            comp.inventory = float(rng.uniform(0, 2000))
+            comp.auto_purchase_unlocked = bool(rng.integers(2))
+            comp.auto_purchase_quantity = int(rng.integers(10, 300))
+            comp.auto_purchase_max_inventory = int(rng.integers(100, 1500))
+        end = state.game_day + 200
+        expected = _ticked(state, end)
+        simulate_until(state, end, analytic=True)
+        _assert_same(state, expected)
+        assert state.game_day < config.DAYS_PER_MONTH * 12 * config.GAME_YEARS
@@ -0,0 +1,177 @@
+"""Tests for the session registry and tick scheduler."""
+
+import time
+
+import pytest
+
+from server.sessions import SessionRegistry, TickScheduler, MAX_SPEED
+
+
+def test_registry_creates_independent_games():
+    registry = SessionRegistry()
+    a = registry.create("a")
+    b = registry.create("b", seed=7)
+    a.state.cash = 1.0
+    assert b.state.cash != 1.0
+    assert b.state.seed == 7
+    assert sorted(registry.ids()) == ["a", "b"]
+
+
+def test_registry_rejects_duplicate_ids():
+    registry = SessionRegistry()
+    registry.create("a")
+    with pytest.raises(KeyError):
+        registry.create("a")
+
+
+def test_scheduler_ticks_only_due_sessions():
+    registry = SessionRegistry()
+    scheduler = TickScheduler(registry, interval=1.0)
+    now = time.monotonic()
+    for game_id, due in (("early", now - 0.5), ("late", now + 60)):
+        registry.create(game_id)
+        scheduler.schedule(game_id, due)
+
+    assert scheduler.run_due(now) == 1
+    assert registry.get("early").state.game_day == 1
+    assert registry.get("late").state.game_day == 0
+
+
+def test_scheduler_drops_removed_sessions():
+    registry = SessionRegistry()
+    scheduler = TickScheduler(registry, interval=1.0)
+    registry.create("gone")
+    scheduler.schedule("gone", 0.0)
+    registry.remove("gone")
+    assert scheduler.run_due(time.monotonic()) == 0
+
+
+def test_schedule_is_idempotent():
+    registry = SessionRegistry()
+    scheduler = TickScheduler(registry, interval=1.0)
+    registry.create("a")
+    scheduler.schedule("a", 0.0)
+    scheduler.schedule("a", 0.0)
+    assert scheduler.run_due(0.5) == 1
+
+
+def test_scheduler_keeps_deadlines_not_tick_end_times():
+    registry = SessionRegistry()
+    scheduler = TickScheduler(registry, interval=1.0)
+    registry.create("a")
+    scheduler.schedule("a", 10.0)
+    scheduler.run_due(10.4)  # late start, but the next tick is still due at 11.0
+    assert scheduler._heap[0][0] == 11.0
+
+
+def test_scheduler_catches_up_in_one_batch_with_cap():
+    registry = SessionRegistry()
+    scheduler = TickScheduler(registry, interval=1.0, max_catch_up=3)
+    session = registry.create("a")
+    scheduler.schedule("a", 0.0)
+    assert scheduler.run_due(2.5) == 3  # owed ticks for 0, 1 and 2
+    assert session.state.game_day == 3
+    assert scheduler._heap[0][0] == 3.0
+
+    scheduler.run_due(100.0)  # hopelessly behind: cap, then drop the backlog
+    assert session.state.game_day == 6
+    assert scheduler._heap[0][0] == 100.0
+
+
+def test_speed_sets_period_and_max_runs_a_batch_per_pass():
+    registry = SessionRegistry()
+    scheduler = TickScheduler(registry, interval=1.0, max_catch_up=5)
+    session = registry.create("a")
+    scheduler.schedule("a", 0.0)
+    scheduler.set_speed(session, 4.0)
+    assert scheduler.period(session) == 0.25
+
+    scheduler.set_speed(session, MAX_SPEED)
+    scheduler.run_due(time.monotonic() + 1)
+    assert session.state.game_day == 5
+
+
+def test_paused_game_applies_actions_without_ticking():
+    from engine.actions import Command
+
+    registry = SessionRegistry()
+    scheduler = TickScheduler(registry, interval=1.0)
+    session = registry.create("a")
+    scheduler.schedule("a", 0.0)
+    scheduler.pause(session)
+    assert not scheduler.is_scheduled("a")
+    assert scheduler.run_due(5.0) == 0
+
+    future = session.actions.submit(Command("set_price", product_id="A", price=33.0))
+    session.apply_queued()
+    assert future.result(timeout=0)["success"]
+    assert session.state.game_day == 0
+
+    scheduler.resume(session)
+    assert scheduler.run_due(time.monotonic() + 2.5) == 2
+
+
+def test_speed_and_pause_routes():
+    from server.app import app, sessions
+
+    client = app.test_client()
+    game_id = client.post("/api/games").get_json()["game_id"]
+    try:
+        assert client.post(f"/api/games/{game_id}/speed", json={"speed": "max"}).get_json()["speed"] == "max"
+        assert client.post(f"/api/games/{game_id}/speed", json={"speed": 0}).status_code == 400
+        assert client.post(f"/api/games/{game_id}/speed", json={"speed": "fast"}).status_code == 400
+        assert client.post(f"/api/games/{game_id}/pause").get_json()["paused"] is True
+        assert client.post("/action/set_price", json={"game_id": game_id, "product_id": "A", "price": 41}).get_json()["success"]
+        assert client.post(f"/api/games/{game_id}/resume").get_json()["paused"] is False
+        assert client.post("/api/games/nope/pause").status_code == 404
+    finally:
+        sessions.remove(game_id)
+
+
+def test_routes_target_session_by_game_id():
+    from server.app import app
+
+    client = app.test_client()
+    game_id = client.post("/api/games", json={"seed": 3}).get_json()["game_id"]
+
+    client.post("/action/set_price", json={"game_id": game_id, "product_id": "A", "price": 42})
+    mine = client.get(f"/api/state?game_id={game_id}").get_json()
+    default = client.get("/api/state").get_json()
+
+    assert mine["products"]["A"]["price"] == 42
+    assert default["products"]["A"]["price"] != 42
+    assert client.get("/api/state?game_id=nope").status_code == 404
+
+    for bad in ({"seed": "abc"}, {"seed": None}):
+        response = client.post("/api/games", json=bad)
+        assert response.status_code == 400 and response.get_json()["reason"] == "invalid_seed"
+
+
+def test_state_etag_and_delta():
+    from server.app import app, sessions, publish_tick
+
+    client = app.test_client()
+    game_id = client.post("/api/games").get_json()["game_id"]
+    url = f"/api/state?game_id={game_id}"
+
+    full = client.get(url)
+    etag = full.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    version = full.get_json()["version"]
+    client.post("/action/set_price", json={"game_id": game_id, "product_id": "C", "price": 9})
+    delta = client.get(f"{url}&since={version}").get_json()
+    assert delta["delta"] is True
+    assert list(delta["products"]) == ["C"]
+    assert delta["components"] == {}
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+    session = sessions.get(game_id)
+    session.tick()  # first tick records demand for every product
+    publish_tick(session)
+    version = session.state.version
+    session.tick()
+    publish_tick(session)
+    after_tick = client.get(f"{url}&since={version}").get_json()
+    assert after_tick["game_day"] == 2
+    assert after_tick["products"] == {}  # no factories, same month: nothing changed
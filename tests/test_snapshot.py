@@ -0,0 +1,76 @@
+"""Tests for pre-serialized state snapshots."""
+
+import json
+import threading
+import time
+
+from engine.game_state import GameState
+from server.snapshot import build_snapshot
+
+
+def test_snapshot_body_matches_sections():
+    snap = build_snapshot("g", GameState.new_game())
+    body = json.loads(snap.body)
+    assert body["products"] == snap.products
+    assert body["version"] == snap.version
+
+
+def test_unchanged_sections_are_reused():
+    state = GameState.new_game()
+    first = build_snapshot("g", state)
+    state.products["B"].price = 7.0
+    state.touch("products", "B")
+    second = build_snapshot("g", state, first)
+    assert second.products["A"] is first.products["A"]
+    assert second.products["B"]["price"] == 7.0
+    assert list(second.delta(first.version)["products"]) == ["B"]
+
+
+def test_pollers_do_not_take_the_game_lock():
+    from server.app import app, sessions
+
+    client = app.test_client()
+    session = sessions.get("default")
+    done = threading.Event()
+
+    def poll():
+        client.get("/api/state")
+        done.set()
+
+    with session.lock:  # simulate a long tick
+        t = threading.Thread(target=poll)
+        t.start()
+        assert done.wait(2.0), "/api/state blocked on the game lock"
+    t.join()
+
+
+def test_pollers_cannot_delay_ticks():
+    from server.app import app, add_session, publish_tick
+
+    client = app.test_client()
+    session = add_session()
+    stop = threading.Event()
+
+    def hammer():
+        while not stop.is_set():
+            client.get(f"/api/state?game_id={session.game_id}")
+
+    pollers = [threading.Thread(target=hammer) for _ in range(4)]
+    for t in pollers:
+        t.start()
+    try:
+        worst = 0.0
+        for _ in range(50):
+            start = time.perf_counter()
+            with session.lock:  # the lock a tick needs
+                pass
+            worst = max(worst, time.perf_counter() - start)
+            session.tick()
+            publish_tick(session)
+    finally:
+        stop.set()
+        for t in pollers:
+            t.join()
+
+    assert worst < 0.05
+    assert json.loads(client.get(f"/api/state?game_id={session.game_id}").data)["game_day"] == 50
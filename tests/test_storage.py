@@ -0,0 +1,59 @@
+"""Tests for the array-backed GameState storage."""
+
+import pytest
+
+from engine.game_state import GameState, ComponentState
+from engine.storage import ProductView
+from engine.tick import run_tick, simulate_until
+from engine.actions import Command, apply_command
+from engine import config
+
+
+def _play(storage):
+    state = GameState.new_game(seed=7, storage=storage)
+    for cmd in (
+        Command("upgrade_throughput", product_id="A"),
+        Command("upgrade_efficiency", product_id="A"),
+        Command("unlock_auto_purchase", component_id=3),
+        Command("set_auto_purchase", component_id=4, quantity=250, max_inventory=600),
+    ):
+        apply_command(state, cmd)
+    state.components[3].inventory = 500.0
+    state.components[4].inventory = 500.0
+    for _ in range(45):
+        run_tick(state)
+    simulate_until(state, 200)
+    return state
+
+
+def test_new_game_matches_object_layout():
+    arrays = GameState.new_game(storage="arrays")
+    objects = GameState.new_game()
+    assert arrays == objects
+    assert arrays.components[1].auto_purchase_quantity == ComponentState().auto_purchase_quantity
+    assert arrays.factories["A"].paused is False
+
+
+def test_views_read_and_write_through():
+    state = GameState.new_game(storage="arrays")
+    state.products["B"].inventory += 3
+    state.factories["B"].throughput_level = 2
+    assert state.products["B"].inventory == 3
+    assert state.factory_capacity("B") == 2 * config.CAPACITY_PER_THROUGHPUT_LEVEL
+    assert isinstance(state.products["B"], ProductView)
+    assert "Z" not in state.products
+    with pytest.raises(TypeError):
+        state.products["Z"] = None
+
+
+def test_simulation_identical_across_layouts():
+    arrays, objects = _play("arrays"), _play("objects")
+    assert arrays == objects
+    assert arrays.cash == objects.cash
+    assert arrays.products["A"].last_revenue == objects.products["A"].last_revenue
+    assert arrays.version == objects.version
+
+
+def test_unknown_storage_rejected():
+    with pytest.raises(ValueError):
+        GameState.new_game(storage="rows")
@@ -0,0 +1,51 @@
+"""Tests for SSE state streaming."""
+
+import json
+from server.streaming import Broadcaster, encode_event, SUBSCRIBER_BUFFER
+
+
+def test_publish_fans_out_same_frame():
+    b = Broadcaster()
+    q1, q2 = b.subscribe(), b.subscribe()
+    frame = encode_event({"cash": 1}, 5)
+    b.publish(frame)
+    assert q1.get_nowait() is frame
+    assert q2.get_nowait() is frame
+
+
+def test_slow_subscriber_keeps_latest_frames():
+    b = Broadcaster()
+    q = b.subscribe()
+    for i in range(SUBSCRIBER_BUFFER + 3):
+        b.publish(encode_event({"i": i}))
+    frames = [q.get_nowait() for _ in range(q.qsize())]
+    assert len(frames) == SUBSCRIBER_BUFFER
+    assert json.loads(frames[-1].split(b"data: ")[1]) == {"i": SUBSCRIBER_BUFFER + 2}
+
+
+def test_closing_stream_unsubscribes():
+    b = Broadcaster()
+    q = b.subscribe()
+    gen = b.stream(q, first=b"x")
+    assert next(gen) == b"x"
+    gen.close()
+    assert len(b) == 0
+
+
+def test_tick_pushes_update_to_stream():
+    from server.app import app, sessions, publish_tick
+
+    client = app.test_client()
+    game_id = client.post("/api/games").get_json()["game_id"]
+    resp = client.get(f"/api/stream?game_id={game_id}", buffered=False)
+    body = iter(resp.response)
+    first = json.loads(next(body).split(b"data: ")[1])
+    assert first["game_day"] == 0
+
+    session = sessions.get(game_id)
+    session.tick()
+    publish_tick(session)  # what the scheduler calls after each tick
+    update = json.loads(next(body).split(b"data: ")[1])
+    assert update["game_day"] == 1
+    resp.close()
+    assert len(session.broadcaster) == 0
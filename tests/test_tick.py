@@ -79,3 +79,52 @@ def test_auto_purchase_does_not_fire_above_max_inventory():
     result = run_tick(state)
     auto_for_3 = [a for a in result.auto_purchases if a.component_id == 3]
     assert len(auto_for_3) == 0
+
+
+def test_simulate_until_matches_run_tick():
+    import numpy as np
+    from engine.tick import simulate_until, precompute_growth_factors
+
+    a = _ready_state()
+    b = _ready_state()
+    for state in (a, b):
+        state.components[3].auto_purchase_unlocked = True
+        state.components[4].auto_purchase_unlocked = True
+
+    rng_a = np.random.default_rng(1)
+    growth = precompute_growth_factors(a, rng_a)
+    sold = 0
+    for _ in range(400):
+        year = a.game_year
+        sold += run_tick(a, growth).total_units_sold
+        if a.game_year != year:
+            growth = precompute_growth_factors(a, rng_a)
+
+    rng_b = np.random.default_rng(1)
+    summary = simulate_until(b, 400, lambda s: precompute_growth_factors(s, rng_b))
+
+    assert b.game_day == a.game_day == 400
+    assert b.cash == a.cash
+    assert b.components[3].inventory == a.components[3].inventory
+    assert sum(summary.units_sold.values()) == sold
+    assert summary.ticks == 400
+
+
+def test_simulate_until_period_totals():
+    from engine.tick import simulate_until
+
+    state = _ready_state()
+    summary = simulate_until(state, 95, period="month")
+    assert [p.period for p in summary.periods] == [0, 1, 2, 3]
+    assert sum(p.units_sold["A"] for p in summary.periods) == summary.units_sold["A"]
+    assert summary.limited_by["B"] == "no_factory"
+
+
+def test_simulate_until_stops_at_game_over():
+    from engine.tick import simulate_until
+    from engine.clock import total_game_days
+
+    state = GameState.new_game()
+    summary = simulate_until(state, 10 ** 9, period="year")
+    assert state.game_day == total_game_days()
+    assert len(summary.periods) == config.GAME_YEARS